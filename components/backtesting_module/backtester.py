@@ -1,16 +1,22 @@
 # components/backtesting_module/backtester.py
 
 import backtrader as bt
-from components.backtesting_module.strategy_adapters import StrategyAdapter
+from components.backtesting_module.strategy_adapter import StrategyAdapter
 from components.data_management_module.alpaca_api import AlpacaAPIClient
 from datetime import datetime
-import os
-import sqlite3
-import json
+import pandas as pd
 import logging
+from .benchmark_service import BenchmarkService, relative_metrics
+from .capture import CaptureAnalyzer
 from .config import BacktestConfig
-from .exceptions import BacktestError, DataError
+from .exceptions import BacktestCancelled, BacktestError, DataError
+from .feeds import NumpyData, cerebro_options
+from .monte_carlo import MonteCarloSimulator
+from .result_cache import ResultCache, data_fingerprint, result_key
+from .results_repository import ResultsRepository
+from .scheduler import ResourceScheduler
 from .utils import validate_backtest_data, calculate_statistics
+from .vectorized_engine import VectorizedBacktester
 
 logging.basicConfig(
     filename='logs/backtesting.log',
@@ -18,6 +24,24 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s:%(message)s'
 )
 
+class _Progress(bt.Analyzer):
+    """Reports ``(bar, bars, value)`` to ``callback`` on every bar; a False return stops the run"""
+
+    params = (('callback', None), ('bars', None))
+
+    def start(self):
+        self.stopped = False
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        bars = self.p.bars or self.data.buflen()
+        if self.p.callback(len(self.data), bars, self.strategy.broker.getvalue()) is False:
+            self.stopped = True
+            self.strategy.env.runstop()
+
+
 class Backtester:
     """
     Runs backtests using historical data and strategies.
@@ -32,7 +56,13 @@ class Backtester:
         self.data = None
         self.results = None
         self.final_value = None
+        self.metrics = None
+        self.equity = None
+        self.capture = None
+        self.result_key = None
+        self.result_cache = ResultCache() if BacktestConfig.RESULT_CACHE_ENABLED else None
         self.alpaca_client = AlpacaAPIClient()
+        self.benchmark_service = BenchmarkService.shared()
 
     def load_data(self):
         """
@@ -44,7 +74,7 @@ class Backtester:
                 self.ticker,
                 self.start_date,
                 self.end_date,
-                timeframe='1Day'  # Adjust timeframe as needed
+                timeframe=BacktestConfig.DEFAULT_TIMEFRAME
             )
             if self.data.empty:
                 raise ValueError(f"No data found for ticker {self.ticker} between {self.start_date} and {self.end_date}")
@@ -62,14 +92,75 @@ class Backtester:
             logging.error(f"Error fetching data: {e}")
             raise
 
-    # In components/backtesting_module/backtester.py
-    # Update the run_backtest method:
+    def _cache_key(self, engine, **settings):
+        """``(key, identity, fingerprint)`` of this run on the loaded data"""
+        fingerprint = data_fingerprint(self.data)
+        key, identity = result_key('backtest', self.strategy_name, self.strategy_params, self.ticker,
+                                   BacktestConfig.DEFAULT_TIMEFRAME, self.start_date, self.end_date,
+                                   fingerprint, engine, **settings)
+        return key, identity, fingerprint
+
+    def _cached_without_fetch(self, engine, **settings):
+        """
+        ``(key, result)`` for a run whose date range is already over, looked up
+        before any data is fetched, or None.
+
+        Bars of a closed range do not change, so the result stored for the
+        same strategy, parameters, instrument and range is served without a
+        round trip to Alpaca. Ranges that reach today are always fetched and
+        fingerprinted. Call ``result_cache.invalidate(ticker)`` after a
+        historical correction (e.g. a re-adjusted split).
+        """
+        if self.result_cache is None or self.data is not None:
+            return None
+        end = pd.Timestamp(self.end_date)
+        if end.tz is not None:
+            end = end.tz_convert(None)
+        if end.normalize() >= pd.Timestamp(datetime.now().date()):
+            return None
+        _, identity = result_key('backtest', self.strategy_name, self.strategy_params, self.ticker,
+                                 BacktestConfig.DEFAULT_TIMEFRAME, self.start_date, self.end_date,
+                                 None, engine, **settings)
+        return self.result_cache.latest(identity)
+
+    def run_backtest(self, cash=100000.0, commission=0.001, progress=None, preload=None, runonce=None,
+                     exactbars=None):
+        """
+        Run the strategy in Cerebro.
+
+        An identical earlier run on the same data is served from the result
+        cache, in which case ``results`` (the Cerebro strategies) and
+        ``capture`` stay None and only ``metrics`` and ``equity`` are set. For a date range that
+        is already over the data is not even fetched.
+
+        ``progress(bar, bars, value)`` is called after every bar with the
+        broker value; returning False stops the run and raises
+        ``BacktestCancelled`` without setting or caching any result.
 
-    def run_backtest(self, cash=100000.0, commission=0.001):
+        ``preload``, ``runonce`` and ``exactbars`` are passed to Cerebro
+        (see ``feeds.cerebro_options``); they change memory use and speed,
+        not results.
+        """
         try:
-            self.load_data()
-            cerebro = bt.Cerebro()
-            data_feed = bt.feeds.PandasData(dataname=self.data)
+            hit = self._cached_without_fetch('backtrader', cash=cash, commission=commission)
+            if hit is not None:
+                key, cached = hit
+            else:
+                self.load_data()
+                key, identity, fingerprint = self._cache_key('backtrader', cash=cash, commission=commission)
+                cached = self.result_cache.get(key) if self.result_cache is not None else None
+            self.result_key = key
+            if cached is not None:
+                self.results, self.capture = None, None
+                self.metrics, self.equity = cached['metrics'], cached['equity']
+                self.final_value = self.metrics['Final Portfolio Value']
+                logging.info(f"Loaded cached backtest for {self.strategy_name} on {self.ticker}. "
+                             f"Final portfolio value: {self.final_value}")
+                return
+
+            ResourceScheduler.shared().admit(name=f"{self.strategy_name} backtest")
+            cerebro = bt.Cerebro(**cerebro_options(preload, runonce, exactbars))
+            data_feed = NumpyData(dataname=self.data)
             cerebro.adddata(data_feed)
             
             # Get strategy class from adapter
@@ -81,120 +172,146 @@ class Backtester:
             cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
             cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
             cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+            cerebro.addanalyzer(bt.analyzers.TimeReturn, _name='time_return')
+            cerebro.addanalyzer(CaptureAnalyzer, _name='capture')
+            if progress is not None:
+                cerebro.addanalyzer(_Progress, _name='progress', callback=progress, bars=len(self.data))
             
             logging.info(f"Starting backtest for {self.strategy_name} on {self.ticker}")
-            self.results = cerebro.run()
+            results = cerebro.run()
+            if progress is not None and results[0].analyzers.progress.stopped:
+                raise BacktestCancelled(f"Backtest of {self.strategy_name} on {self.ticker} was stopped")
+            self.results = results
             self.final_value = cerebro.broker.getvalue()
+            analyzer = self.results[0].analyzers
+            self.metrics = {
+                'Final Portfolio Value': self.final_value,
+                'Total Return': analyzer.returns.get_analysis()['rtot'],
+                'Sharpe Ratio': analyzer.sharpe.get_analysis().get('sharperatio', None),
+                'Max Drawdown': analyzer.drawdown.get_analysis()['max']['drawdown']
+            }
+            self.capture = analyzer.capture.get_analysis()
+            returns = pd.Series(analyzer.time_return.get_analysis(), dtype=float)
+            self.equity = (cash * (1 + returns).cumprod()).rename('equity')
+            if self.result_cache is not None:
+                self.result_cache.put(key, identity, fingerprint, {'metrics': self.metrics, 'equity': self.equity},
+                                      self.strategy_name, self.ticker, 'backtrader')
             logging.info(f"Backtest completed. Final portfolio value: {self.final_value}")
+        except BacktestCancelled as e:
+            logging.info(str(e))
+            raise
         except Exception as e:
             logging.error(f"Error during backtest: {e}")
             raise
 
-    def save_results(self):
-        if not os.path.exists('components/backtesting_module/results'):
-            os.makedirs('components/backtesting_module/results')
-        conn = sqlite3.connect('components/backtesting_module/results/backtest_results.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS backtest_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                strategy_name TEXT,
-                strategy_params TEXT,
-                ticker TEXT,
-                start_date TEXT,
-                end_date TEXT,
-                final_value REAL,
-                total_return REAL,
-                sharpe_ratio REAL,
-                max_drawdown REAL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        analyzer = self.results[0].analyzers
-        total_return = analyzer.returns.get_analysis()['rtot']
-        sharpe_ratio = analyzer.sharpe.get_analysis().get('sharperatio', None)
-        max_drawdown = analyzer.drawdown.get_analysis()['max']['drawdown']
-
-        cursor.execute('''
-            INSERT INTO backtest_results (
-                strategy_name, strategy_params, ticker, start_date, end_date,
-                final_value, total_return, sharpe_ratio, max_drawdown
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            self.strategy_name,
-            json.dumps(self.strategy_params),
-            self.ticker,
-            self.start_date.strftime('%Y-%m-%d'),
-            self.end_date.strftime('%Y-%m-%d'),
-            self.final_value,
-            total_return,
-            sharpe_ratio,
-            max_drawdown
-        ))
-        conn.commit()
-        conn.close()
+    def run_vectorized_backtest(self, cash=100000.0, commission=0.001, percents=None):
+        """
+        Screening run on the NumPy engine instead of Cerebro.
+
+        Uses the StrategyBase signals for ``strategy_name`` and the same
+        execution rules as ``run_backtest``; returns the engine's result dict
+        (from the result cache when the same run was done on the same data).
+        """
+        try:
+            hit = self._cached_without_fetch('vectorized', cash=cash, commission=commission, percents=percents)
+            if hit is not None:
+                key, result = hit
+            else:
+                if self.data is None:
+                    self.load_data()
+                key, identity, fingerprint = self._cache_key('vectorized', cash=cash, commission=commission,
+                                                             percents=percents)
+                result = self.result_cache.get(key) if self.result_cache is not None else None
+            if result is not None:
+                self.final_value = result['metrics']['final_value']
+                logging.info(f"Loaded cached vectorized backtest for {self.strategy_name} on {self.ticker}")
+                return result
+
+            engine = VectorizedBacktester(self.data, cash=cash, commission=commission, percents=percents)
+            logging.info(f"Starting vectorized backtest for {self.strategy_name} on {self.ticker}")
+            result = engine.run(self.strategy_name, self.strategy_params)
+            if self.result_cache is not None:
+                self.result_cache.put(key, identity, fingerprint, result, self.strategy_name, self.ticker, 'vectorized')
+            self.final_value = result['metrics']['final_value']
+            logging.info(f"Vectorized backtest completed. Final portfolio value: {self.final_value}")
+            return result
+        except Exception as e:
+            logging.error(f"Error during vectorized backtest: {e}")
+            raise
+
+    def save_results(self, repository=None):
+        """
+        Record the run, with its equity curve and trade log when it was not
+        served from the cache; repeating an identical run on the same data
+        adds no new row
+        """
+        repository = repository or ResultsRepository.shared()
+        metrics = self.get_performance_metrics()
+        if self.capture is not None:
+            repository.save_capture(self.result_key, self.capture)
+        return repository.save({
+            'strategy_name': self.strategy_name,
+            'strategy_params': self.strategy_params,
+            'ticker': self.ticker,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'final_value': self.final_value,
+            'total_return': metrics['Total Return'],
+            'sharpe_ratio': metrics['Sharpe Ratio'],
+            'max_drawdown': metrics['Max Drawdown'],
+            'result_key': self.result_key
+        })
 
     def get_performance_metrics(self):
-        analyzer = self.results[0].analyzers
-        metrics = {
-            'Final Portfolio Value': self.final_value,
-            'Total Return': analyzer.returns.get_analysis()['rtot'],
-            'Sharpe Ratio': analyzer.sharpe.get_analysis().get('sharperatio', None),
-            'Max Drawdown': analyzer.drawdown.get_analysis()['max']['drawdown']
-        }
-        return metrics
+        if self.metrics is None:
+            raise BacktestError("Run the backtest before requesting its metrics")
+        return self.metrics
+
+    def run_monte_carlo(self, n_paths=10000, method='block', seed=None, trades=False, **kwargs):
+        """
+        Resample the daily returns of the finished run, or with ``trades`` its
+        closed trades, into ``n_paths`` paths.
+
+        Returns the ``MonteCarloSimulator.run`` dict with confidence bands for
+        terminal value, Sharpe ratio and max drawdown.
+        """
+        return MonteCarloSimulator.from_backtester(self, trades=trades).run(n_paths=n_paths, method=method, seed=seed,
+                                                                            **kwargs)
 
     def run_benchmark(self, benchmark_ticker, cash=100000.0, commission=0.001):
+        """
+        Metrics of a fully invested buy-and-hold of ``benchmark_ticker`` over
+        the backtest window, from the process-wide ``BenchmarkService`` so the
+        benchmark is fetched and computed once for all runs on that ticker.
+        """
         try:
-            logging.info(f"Fetching benchmark data for {benchmark_ticker}")
-            benchmark_data = self.alpaca_client.fetch_historical_data(
-                benchmark_ticker,
-                self.start_date,
-                self.end_date,
-                timeframe='1Day'
-            )
-            if benchmark_data.empty:
-                raise ValueError(f"No data found for benchmark ticker {benchmark_ticker} between {self.start_date} and {self.end_date}")
-            benchmark_data.rename(columns={
-                't': 'datetime',
-                'o': 'open',
-                'h': 'high',
-                'l': 'low',
-                'c': 'close',
-                'v': 'volume'
-            }, inplace=True)
-            benchmark_data.set_index('datetime', inplace=True)
-            benchmark_data.index = pd.to_datetime(benchmark_data.index)
-
-            cerebro = bt.Cerebro()
-            data_feed = bt.feeds.PandasData(dataname=benchmark_data)
-            cerebro.adddata(data_feed)
-            cerebro.addstrategy(BenchmarkStrategy)
-            cerebro.broker.setcash(cash)
-            cerebro.broker.setcommission(commission=commission)
-            cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
-            cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-            cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
-            benchmark_results = cerebro.run()
-            final_value = cerebro.broker.getvalue()
-            analyzer = benchmark_results[0].analyzers
-            metrics = {
-                'Final Portfolio Value': final_value,
-                'Total Return': analyzer.returns.get_analysis()['rtot'],
-                'Sharpe Ratio': analyzer.sharpe.get_analysis().get('sharperatio', None),
-                'Max Drawdown': analyzer.drawdown.get_analysis()['max']['drawdown']
-            }
-            return metrics
+            return self.benchmark_service.metrics(benchmark_ticker, self.start_date, self.end_date,
+                                                  cash=cash, commission=commission,
+                                                  timeframe=BacktestConfig.DEFAULT_TIMEFRAME)
         except Exception as e:
             logging.error(f"Error during benchmark backtest: {e}")
             raise
 
-    def compare_with_benchmark(self, benchmark_ticker='SPY'):
+    def compare_with_benchmark(self, benchmark_ticker='SPY', cash=100000.0, commission=0.001):
         strategy_metrics = self.get_performance_metrics()
-        benchmark_metrics = self.run_benchmark(benchmark_ticker)
+        benchmark_metrics = self.run_benchmark(benchmark_ticker, cash, commission)
 
         comparison = {
             'Strategy': strategy_metrics,
             'Benchmark': benchmark_metrics
         }
+        if self.equity is not None:
+            benchmark_equity = self.benchmark_service.equity_curve(
+                benchmark_ticker, self.start_date, self.end_date, cash, commission,
+                BacktestConfig.DEFAULT_TIMEFRAME
+            )
+            comparison['Relative'] = relative_metrics(_naive_daily(self.equity), _naive_daily(benchmark_equity))
         return comparison
+
+
+def _naive_daily(equity):
+    """Equity indexed by calendar date, so curves from different feeds align"""
+    index = pd.DatetimeIndex(equity.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return pd.Series(equity.to_numpy(), index=index.normalize())
@@ -0,0 +1,210 @@
+# components/backtesting_module/batch_backtester.py
+
+import logging
+import multiprocessing
+import os
+import uuid
+
+import backtrader as bt
+import pandas as pd
+
+from components.data_management_module.adjustments import apply_adjustments
+from components.data_management_module.config import config
+from components.data_management_module.data_access_layer import DatabaseManager
+from .config import BacktestConfig
+from .exceptions import BacktestError
+from .feeds import NumpyData, cerebro_options
+from .resource_monitor import ResourceMonitor
+from .result_cache import result_key
+from .results_repository import ResultsRepository
+from .scheduler import ResourceScheduler, lower_priority
+from .strategy_adapter import StrategyAdapter
+from .vectorized_engine import VectorizedBacktester
+
+ENGINES = ('backtrader', 'vectorized')
+
+SUMMARY_COLUMNS = ['ticker', 'bars', 'final_value', 'total_return', 'sharpe_ratio', 'max_drawdown', 'trades', 'error']
+
+# Per-process state set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(settings):
+    """Open one read-only view of the market database per worker process"""
+    lower_priority()
+    _worker['settings'] = settings
+    _worker['db'] = DatabaseManager(settings['database_path'], read_only=True)
+
+
+def _load_bars(db, ticker, start_date, end_date, adjustment):
+    df = db.get_historical_frame(ticker, start_date, end_date)
+    df.index.name = 'datetime'
+    if adjustment != 'raw' and not df.empty:
+        df = apply_adjustments(df, db.get_corporate_actions(ticker), mode=adjustment)
+    return df
+
+
+def _backtest_ticker(ticker, db, settings):
+    """Load one ticker from the local store, backtest it and return its summary row"""
+    row = dict.fromkeys(SUMMARY_COLUMNS)
+    row['ticker'] = ticker
+    try:
+        data = _load_bars(db, ticker, settings['start_date'], settings['end_date'], settings['adjustment'])
+        row['bars'] = len(data)
+        if data.empty:
+            raise BacktestError(f"No stored data for {ticker}")
+
+        if settings['engine'] == 'vectorized':
+            metrics = VectorizedBacktester(
+                data, cash=settings['cash'], commission=settings['commission']
+            ).run(settings['strategy_name'], settings['strategy_params'])['metrics']
+            row.update({key: metrics[key] for key in
+                        ('final_value', 'total_return', 'sharpe_ratio', 'max_drawdown', 'trades')})
+        else:
+            cerebro = bt.Cerebro(stdstats=False, **cerebro_options())
+            cerebro.adddata(NumpyData(dataname=data))
+            cerebro.addstrategy(StrategyAdapter.get_strategy(settings['strategy_name']), **settings['strategy_params'])
+            cerebro.broker.setcash(settings['cash'])
+            cerebro.broker.setcommission(commission=settings['commission'])
+            cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
+            cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+            cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+            cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+            analyzers = cerebro.run()[0].analyzers
+            row.update({
+                'final_value': cerebro.broker.getvalue(),
+                'total_return': analyzers.returns.get_analysis()['rtot'],
+                'sharpe_ratio': analyzers.sharpe.get_analysis().get('sharperatio', None),
+                'max_drawdown': analyzers.drawdown.get_analysis()['max']['drawdown'],
+                'trades': analyzers.trades.get_analysis().get('total', {}).get('total', 0)
+            })
+    except Exception as e:
+        row['error'] = str(e)
+    return row
+
+
+def _backtest_worker(ticker):
+    """Worker entry point"""
+    return _backtest_ticker(ticker, _worker['db'], _worker['settings'])
+
+
+def load_universe(tickers_file=None):
+    """Tickers tracked by the data manager, one symbol per line"""
+    tickers_file = tickers_file or config.get('DEFAULT', 'tickers_file')
+    if not os.path.exists(tickers_file):
+        raise BacktestError(f"Tickers file not found: {tickers_file}")
+    with open(tickers_file, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+class BatchBacktester:
+    """
+    Runs one strategy and parameter set over a universe of tickers.
+
+    Bars come from the local market database rather than the Alpaca API, and
+    tickers are spread over a worker pool sized by ``ResourceMonitor``; each
+    worker opens the database once. The output is one summary row per
+    ticker, collected into a DataFrame and saved in a single transaction
+    through ``ResultsRepository``.
+    """
+
+    def __init__(self, strategy_name, strategy_params, start_date, end_date, tickers=None,
+                 engine='vectorized', adjustment='raw', database_path=None):
+        if engine not in ENGINES:
+            raise BacktestError(f"Invalid engine '{engine}'. Expected one of {ENGINES}")
+        self.strategy_name = strategy_name
+        self.strategy_params = strategy_params or {}
+        self.start_date = start_date
+        self.end_date = end_date
+        self.tickers = tickers if tickers is not None else load_universe()
+        self.engine = engine
+        self.adjustment = adjustment
+        self.database_path = database_path or config.get('DEFAULT', 'database_path')
+        self.batch_id = None
+        self.summary = None
+        self._settings = None
+
+    def run(self, cash=BacktestConfig.INITIAL_CASH, commission=BacktestConfig.DEFAULT_COMMISSION,
+            max_workers=None, callback=None):
+        """
+        Backtest every ticker and return the summary table.
+
+        ``callback`` receives each ticker's row as soon as it finishes.
+        Tickers that fail (no stored data, strategy error) get a row with
+        ``error`` set instead of stopping the batch.
+        """
+        settings = {
+            'database_path': self.database_path,
+            'strategy_name': self.strategy_name,
+            'strategy_params': self.strategy_params,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'adjustment': self.adjustment,
+            'engine': self.engine,
+            'cash': cash,
+            'commission': commission
+        }
+        self._settings = settings
+        scheduler = ResourceScheduler.shared()
+        scheduler.admit(name=f"{self.strategy_name} batch backtest")
+        self.batch_id = uuid.uuid4().hex
+        rows = []
+        workers = min(ResourceMonitor.get_worker_count(max_workers), max(1, len(self.tickers)))
+        logging.info(f"Starting batch backtest {self.batch_id} of {self.strategy_name} "
+                     f"over {len(self.tickers)} tickers on {workers} worker(s)")
+
+        if workers == 1:
+            db = DatabaseManager(self.database_path, read_only=True)
+            try:
+                for ticker in self.tickers:
+                    rows.append(_backtest_ticker(ticker, db, settings))
+                    if callback:
+                        callback(rows[-1])
+            finally:
+                db.dispose()
+        else:
+            with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(settings,)) as pool:
+                for row in scheduler.imap_unordered(pool, _backtest_worker, self.tickers, workers):
+                    rows.append(row)
+                    if callback:
+                        callback(row)
+
+        self.summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values('ticker').reset_index(drop=True)
+        failed = self.summary['error'].notna().sum()
+        logging.info(f"Batch backtest {self.batch_id} completed: {len(rows) - failed} succeeded, {failed} failed")
+        return self.summary
+
+    def save_results(self, repository=None):
+        """
+        Store the batch's summary rows through the results repository.
+
+        Rows are written in one transaction; tickers that failed have no
+        metrics and are skipped. Each row is keyed by the batch, so saving the
+        same batch twice adds nothing.
+
+        Returns:
+            Number of rows inserted
+        """
+        if self.summary is None:
+            raise BacktestError("Run the batch before saving results")
+        repository = repository or ResultsRepository.shared()
+        settings = self._settings
+        succeeded = self.summary[self.summary['error'].isna()]
+        records = [{
+            'strategy_name': self.strategy_name,
+            'strategy_params': self.strategy_params,
+            'ticker': row.ticker,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'final_value': row.final_value,
+            'total_return': row.total_return,
+            'sharpe_ratio': row.sharpe_ratio,
+            'max_drawdown': row.max_drawdown,
+            'result_key': result_key('batch', self.strategy_name, self.strategy_params, row.ticker, None,
+                                     self.start_date, self.end_date, self.batch_id, self.engine,
+                                     cash=settings['cash'], commission=settings['commission'],
+                                     adjustment=self.adjustment)[0]
+        } for row in succeeded.astype(object).where(succeeded.notna(), None).itertuples(index=False)]
+        if len(records) < len(self.summary):
+            logging.info(f"Not saving {len(self.summary) - len(records)} failed tickers of batch {self.batch_id}")
+        return repository.save_many(records)
@@ -0,0 +1,153 @@
+# components/backtesting_module/benchmark_service.py
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .config import BacktestConfig
+from .exceptions import DataError
+
+
+def annual_sharpe_ratio(equity, initial_cash, riskfreerate=0.01):
+    """
+    Sharpe ratio of calendar-year returns, as Backtrader's ``SharpeRatio``
+    analyzer computes it with its defaults (population standard deviation,
+    no annualization), so benchmark and strategy ratios are comparable.
+
+    Returns None with fewer than two years, like the analyzer.
+    """
+    equity = pd.Series(equity, dtype=np.float64)
+    year_end = equity.groupby(equity.index.year).last()
+    previous = np.concatenate(([initial_cash], year_end.to_numpy()[:-1]))
+    excess = year_end.to_numpy() / previous - 1.0 - riskfreerate
+    if len(excess) < 2:
+        return None
+    mean = math.fsum(excess) / len(excess)
+    std = math.sqrt(math.fsum((excess - mean) ** 2) / len(excess))
+    return mean / std if std > 0 else None
+
+
+def relative_metrics(strategy_equity, benchmark_equity, periods_per_year=252):
+    """
+    Alpha, beta and tracking statistics of a strategy against a benchmark,
+    from their per-bar returns over the dates both curves cover.
+    """
+    returns = pd.concat([strategy_equity.pct_change(), benchmark_equity.pct_change()],
+                        axis=1, join='inner', keys=['strategy', 'benchmark']).dropna()
+    if len(returns) < 2:
+        raise DataError("Strategy and benchmark equity curves do not overlap")
+    strategy, benchmark = returns['strategy'].to_numpy(), returns['benchmark'].to_numpy()
+    benchmark_var = benchmark.var(ddof=1)
+    beta = float(np.cov(strategy, benchmark, ddof=1)[0, 1] / benchmark_var) if benchmark_var > 0 else None
+    active = strategy - benchmark
+    tracking_error = active.std(ddof=1) * np.sqrt(periods_per_year)
+    return {
+        'Alpha': float((strategy.mean() - (beta or 0.0) * benchmark.mean()) * periods_per_year),
+        'Beta': beta,
+        'Correlation': float(np.corrcoef(strategy, benchmark)[0, 1]) if benchmark_var > 0 else None,
+        'Tracking Error': float(tracking_error),
+        'Information Ratio': float(active.mean() * periods_per_year / tracking_error) if tracking_error > 0 else None
+    }
+
+
+class BenchmarkService:
+    """
+    Buy-and-hold benchmark curves computed once and answered by slicing.
+
+    Close prices are fetched once per (ticker, timeframe) and widened only
+    when a request falls outside the range already held. The growth curve
+    (close relative to the first close) is computed once per fetched range;
+    the equity curve of any window is that curve sliced and rebased to the
+    window's first bar. The whole of ``cash`` buys a position at the first
+    close of the window, commission included, and holds it to the end.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, fetch=None, max_series=BacktestConfig.BENCHMARK_CACHE_SIZE):
+        self._fetch = fetch
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Process-wide service, so every Backtester shares the same benchmark data"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _fetch_closes(self, ticker, start_date, end_date, timeframe):
+        if self._fetch is None:
+            from components.data_management_module.alpaca_api import AlpacaAPIClient
+            self._fetch = AlpacaAPIClient().fetch_historical_data
+        logging.info(f"Fetching benchmark data for {ticker} from {start_date} to {end_date}")
+        data = self._fetch(ticker, start_date, end_date, timeframe=timeframe)
+        if data is None or data.empty:
+            raise DataError(f"No data found for benchmark ticker {ticker} between {start_date} and {end_date}")
+        data = data.rename(columns={'t': 'datetime', 'c': 'close'})
+        if 'datetime' in data.columns:
+            data = data.set_index('datetime')
+        data.index = pd.to_datetime(data.index)
+        return data['close'].astype(np.float64).sort_index()
+
+    def growth_curve(self, ticker, start_date, end_date, timeframe=BacktestConfig.DEFAULT_TIMEFRAME):
+        """Close relative to the first close for ``[start_date, end_date]``"""
+        key = (ticker, timeframe)
+        start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        with self._lock:
+            entry = self._series.get(key)
+            if entry is not None and entry['start'] <= start_date and entry['end'] >= end_date:
+                self._series.move_to_end(key)
+            else:
+                start = min(start_date, entry['start']) if entry else start_date
+                end = max(end_date, entry['end']) if entry else end_date
+                closes = self._fetch_closes(ticker, start, end, timeframe)
+                entry = {'start': start, 'end': end, 'growth': closes / closes.iloc[0]}
+                self._series[key] = entry
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+        growth = entry['growth']
+        window = growth.loc[_bound(start_date, growth.index):_bound(end_date, growth.index)]
+        if window.empty:
+            raise DataError(f"No benchmark data for {ticker} between {start_date} and {end_date}")
+        return window
+
+    def equity_curve(self, ticker, start_date, end_date, cash=BacktestConfig.INITIAL_CASH,
+                     commission=BacktestConfig.DEFAULT_COMMISSION, timeframe=BacktestConfig.DEFAULT_TIMEFRAME):
+        """Buy-and-hold equity over the window"""
+        window = self.growth_curve(ticker, start_date, end_date, timeframe)
+        return (cash / (1.0 + commission) * window / window.iloc[0]).rename('equity')
+
+    def metrics(self, ticker, start_date, end_date, cash=BacktestConfig.INITIAL_CASH,
+                commission=BacktestConfig.DEFAULT_COMMISSION, timeframe=BacktestConfig.DEFAULT_TIMEFRAME):
+        """Benchmark metrics in the ``Backtester.get_performance_metrics`` format"""
+        equity = self.equity_curve(ticker, start_date, end_date, cash, commission, timeframe)
+        values = equity.to_numpy()
+        peaks = np.maximum.accumulate(np.concatenate(([cash], values)))[1:]
+        return {
+            'Final Portfolio Value': float(values[-1]),
+            'Total Return': float(np.log(values[-1] / cash)),
+            'Sharpe Ratio': annual_sharpe_ratio(equity, cash),
+            'Max Drawdown': float(((peaks - values) / peaks).max() * 100.0)
+        }
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _bound(timestamp, index):
+    """``timestamp`` in the time zone of ``index`` so it can slice it"""
+    timestamp = pd.Timestamp(timestamp)
+    if index.tz is not None and timestamp.tz is None:
+        return timestamp.tz_localize(index.tz)
+    if index.tz is None and timestamp.tz is not None:
+        return timestamp.tz_convert(None)
+    return timestamp
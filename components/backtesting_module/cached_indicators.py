@@ -0,0 +1,174 @@
+# components/backtesting_module/cached_indicators.py
+
+import math
+from array import array
+
+import backtrader as bt
+import numpy as np
+
+from components.strategy_management_module.indicator_cache import cached, indicator_cache
+
+# NumPy versions of the Backtrader indicators used by the adapter strategies.
+# They follow Backtrader's conventions (NaN until the indicator's minimum
+# period, EMAs seeded with the simple average of the first ``period`` values)
+# and are memoized in the process-wide indicator cache.
+
+
+def _empty(n):
+    return np.full(n, np.nan)
+
+
+def _first_valid(values):
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if len(valid) else len(values)
+
+
+def sma(values, period):
+    """Simple moving average, as ``bt.indicators.SMA``"""
+    def compute():
+        out = _empty(len(values))
+        if len(values) >= period:
+            windows = np.lib.stride_tricks.sliding_window_view(values, period)
+            out[period - 1:] = [math.fsum(window) / period for window in windows]
+        return out
+    return cached('bt_sma', values, (period,), compute)
+
+
+def _smoothing(values, period, alpha):
+    """Exponential smoothing seeded with the average of the first ``period`` valid values"""
+    out = _empty(len(values))
+    first = _first_valid(values)
+    seed = first + period - 1
+    if seed >= len(values):
+        return out
+    prev = out[seed] = math.fsum(values[first:seed + 1]) / period
+    alpha1 = 1.0 - alpha
+    for i in range(seed + 1, len(values)):
+        out[i] = prev = prev * alpha1 + values[i] * alpha
+    return out
+
+
+def ema(values, period):
+    """Exponential moving average, as ``bt.indicators.EMA``"""
+    return cached('bt_ema', values, (period,), lambda: _smoothing(values, period, 2.0 / (1.0 + period)))
+
+
+def smma(values, period):
+    """Wilder's smoothed moving average, as ``bt.indicators.SMMA``"""
+    return cached('bt_smma', values, (period,), lambda: _smoothing(values, period, 1.0 / period))
+
+
+def rsi(values, period):
+    """Relative strength index, as ``bt.indicators.RSI``"""
+    def compute():
+        delta = _empty(len(values))
+        delta[1:] = np.diff(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = smma(np.maximum(delta, 0.0), period) / smma(np.maximum(-delta, 0.0), period)
+            return 100.0 - 100.0 / (1.0 + rs)
+    return cached('bt_rsi', values, (period,), compute)
+
+
+def macd(values, fast_period, slow_period, signal_period):
+    """MACD and signal lines, as ``bt.indicators.MACD``"""
+    line = cached('bt_macd', values, (fast_period, slow_period),
+                  lambda: ema(values, fast_period) - ema(values, slow_period))
+    return line, ema(line, signal_period)
+
+
+def bollinger_bands(values, period, devfactor):
+    """Top and bottom bands, as ``bt.indicators.BollingerBands``"""
+    def compute():
+        mid = sma(values, period)
+        with np.errstate(invalid='ignore'):
+            stddev = np.sqrt(sma(values ** 2, period) - mid ** 2)
+        return np.stack([mid + devfactor * stddev, mid - devfactor * stddev])
+    bands = cached('bt_bollinger', values, (period, devfactor), compute)
+    return bands[0], bands[1]
+
+
+def momentum_oscillator(values, period):
+    """Momentum oscillator, as ``bt.indicators.MomentumOscillator``"""
+    def compute():
+        out = _empty(len(values))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[period:] = 100.0 * (values[period:] / values[:-period])
+        return out
+    return cached('bt_momentum_oscillator', values, (period,), compute)
+
+
+class CachedLine(bt.Indicator):
+    """
+    Indicator whose values were computed up front.
+
+    ``once`` copies the precomputed slice into the line buffer instead of
+    recalculating it bar by bar, so every strategy instance over the same data
+    reuses one cached array.
+    """
+
+    lines = ('value',)
+    params = (
+        ('values', None),
+        ('minperiod', 1),
+    )
+
+    def __init__(self):
+        self.addminperiod(self.p.minperiod)
+
+    def next(self):
+        self.lines.value[0] = self.p.values[len(self) - 1]
+
+    def once(self, start, end):
+        self.lines.value.array[start:end] = array('d', self.p.values[start:end])
+
+
+def is_preloaded(line):
+    """
+    Whether the whole history of ``line`` is already in memory.
+
+    Cached lines need every bar up front; without preloading (live feeds,
+    ``exactbars``) the strategies fall back to Backtrader's own indicators.
+    """
+    return indicator_cache.enabled and len(line.array) > 0
+
+
+def _values(line):
+    return np.array(line.array, dtype=np.float64)
+
+
+def sma_line(line, period):
+    if not is_preloaded(line):
+        return bt.indicators.SMA(line, period=period)
+    return CachedLine(line, values=sma(_values(line), period), minperiod=period)
+
+
+def rsi_line(line, period):
+    if not is_preloaded(line):
+        return bt.indicators.RSI(line, period=period)
+    return CachedLine(line, values=rsi(_values(line), period), minperiod=period + 1)
+
+
+def macd_lines(line, fast_period, slow_period, signal_period):
+    """Returns the ``(macd, signal)`` lines"""
+    if not is_preloaded(line):
+        indicator = bt.indicators.MACD(line, period_me1=fast_period, period_me2=slow_period,
+                                       period_signal=signal_period)
+        return indicator.lines.macd, indicator.lines.signal
+    macd_values, signal_values = macd(_values(line), fast_period, slow_period, signal_period)
+    return (CachedLine(line, values=macd_values, minperiod=slow_period),
+            CachedLine(line, values=signal_values, minperiod=slow_period + signal_period - 1))
+
+
+def bollinger_lines(line, period, devfactor):
+    """Returns the ``(top, bot)`` band lines"""
+    if not is_preloaded(line):
+        indicator = bt.indicators.BollingerBands(line, period=period, devfactor=devfactor)
+        return indicator.lines.top, indicator.lines.bot
+    top, bot = bollinger_bands(_values(line), period, devfactor)
+    return CachedLine(line, values=top, minperiod=period), CachedLine(line, values=bot, minperiod=period)
+
+
+def momentum_line(line, period):
+    if not is_preloaded(line):
+        return bt.indicators.MomentumOscillator(line, period=period)
+    return CachedLine(line, values=momentum_oscillator(_values(line), period), minperiod=period + 1)
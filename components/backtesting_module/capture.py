@@ -0,0 +1,187 @@
+# components/backtesting_module/capture.py
+
+import io
+import math
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from .config import BacktestConfig
+
+# backtrader dates are days since 0001-01-01 (day 1); this is 1970-01-01
+EPOCH_DAYS = 719163.0
+
+CURVE_COLUMNS = ('equity', 'cash', 'position')
+
+TRADE_DTYPES = {
+    'ref': np.int64,
+    'open_time': 'datetime64[us]',
+    'close_time': 'datetime64[us]',
+    'size': np.float64,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'pnl': np.float64,
+    'pnl_net': np.float64,
+    'commission': np.float64,
+    'bars': np.int32
+}
+
+
+def to_datetime64(values):
+    """
+    backtrader date numbers as ``datetime64[us]``, rounded to the millisecond:
+    a float day count only resolves about 10 microseconds
+    """
+    millis = np.round((np.asarray(values, dtype=np.float64) - EPOCH_DAYS) * 86400e3)
+    return (millis.astype(np.int64) * 1000).astype('datetime64[us]')
+
+
+def pack(arrays):
+    """Compressed ``.npz`` bytes of a dict of arrays"""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def unpack(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+class RunCapture:
+    """
+    Equity curve and trade log of one run, as NumPy arrays.
+
+    ``curve`` holds ``time`` and the ``CURVE_COLUMNS`` per recorded bar;
+    ``stride`` is the number of bars between recorded points (1 unless the
+    run was downsampled to fit ``BacktestConfig.CAPTURE_MAX_POINTS``). The
+    final bar is always recorded. ``trades`` holds one array per
+    ``TRADE_DTYPES`` field, one entry per closed trade.
+    """
+
+    def __init__(self, curve, trades, stride=1):
+        self.curve = curve
+        self.trades = trades
+        self.stride = stride
+
+    @property
+    def trade_count(self):
+        return len(self.trades['ref'])
+
+    @property
+    def equity(self):
+        """Equity, cash and position by bar"""
+        return pd.DataFrame({column: self.curve[column] for column in CURVE_COLUMNS},
+                            index=pd.DatetimeIndex(self.curve['time'], name='datetime'))
+
+    def trades_frame(self, offset=0, limit=None):
+        end = self.trade_count if limit is None else offset + limit
+        return pd.DataFrame({field: values[offset:end] for field, values in self.trades.items()})
+
+    def trade_pages(self, page_size=BacktestConfig.TRADE_PAGE_SIZE):
+        """The trade log as compressed pages of ``page_size`` trades"""
+        return [pack({field: values[start:start + page_size] for field, values in self.trades.items()})
+                for start in range(0, self.trade_count, page_size)]
+
+
+class CaptureAnalyzer(bt.Analyzer):
+    """
+    Records broker value, cash and position on every bar, and every closed
+    trade, into preallocated arrays; ``get_analysis()`` returns a ``RunCapture``.
+
+    With a preloaded feed the number of bars is known up front and the
+    arrays are sized once. Otherwise they double as needed. Either way at
+    most ``max_points`` bars are kept: a longer run records every
+    ``stride``-th bar, and when the arrays fill every other point is dropped
+    and the stride doubles, so a multi-year minute run stays bounded.
+    """
+
+    params = (('max_points', BacktestConfig.CAPTURE_MAX_POINTS),)
+
+    INITIAL_CAPACITY = 1024
+
+    def start(self):
+        self._max_points = max(2, self.p.max_points)
+        bars = self.data.buflen()
+        if bars > 0:
+            self._stride = math.ceil(bars / (self._max_points - 1))
+            capacity = bars // self._stride + 2
+        else:
+            self._stride = 1
+            capacity = self.INITIAL_CAPACITY
+        self._curve = {name: np.empty(min(capacity, self._max_points)) for name in ('time',) + CURVE_COLUMNS}
+        self._points = 0
+        self._bar = -1
+        self._last = None
+        self._trades = {field: np.empty(16, dtype=dtype) for field, dtype in TRADE_DTYPES.items()}
+        self._trade_count = 0
+        self._sizes = {}
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        self._bar += 1
+        broker = self.strategy.broker
+        self._last = (self.data.datetime[0], broker.getvalue(), broker.getcash(),
+                      self.strategy.getposition(self.data).size)
+        if self._bar % self._stride == 0:
+            self._record(self._last)
+            self._last = None
+
+    def _record(self, row):
+        if self._points == len(self._curve['time']):
+            if self._points < self._max_points:
+                size = min(2 * self._points, self._max_points)
+                for name, values in self._curve.items():
+                    self._curve[name] = np.resize(values, size)
+            else:
+                for name, values in self._curve.items():
+                    kept = values[:self._points:2]
+                    values[:len(kept)] = kept
+                self._points = (self._points + 1) // 2
+                self._stride *= 2
+                if self._bar % self._stride:
+                    return
+        for name, value in zip(('time',) + CURVE_COLUMNS, row):
+            self._curve[name][self._points] = value
+        self._points += 1
+
+    def stop(self):
+        if self._last is not None:
+            # The final bar is always kept, in place of the last point when full
+            if self._points == self._max_points:
+                self._points -= 1
+            self._record(self._last)
+
+    def notify_trade(self, trade):
+        if trade.size:
+            self._sizes[trade.ref] = trade.size
+        if not trade.isclosed:
+            return
+        size = self._sizes.pop(trade.ref, 0.0)
+        if self._trade_count == len(self._trades['ref']):
+            for field, values in self._trades.items():
+                self._trades[field] = np.resize(values, 2 * self._trade_count)
+        row = {
+            'ref': trade.ref,
+            'open_time': to_datetime64(trade.dtopen),
+            'close_time': to_datetime64(trade.dtclose),
+            'size': size,
+            'entry_price': trade.price,
+            'exit_price': trade.price + trade.pnl / size if size else np.nan,
+            'pnl': trade.pnl,
+            'pnl_net': trade.pnlcomm,
+            'commission': trade.commission,
+            'bars': trade.barlen
+        }
+        for field, value in row.items():
+            self._trades[field][self._trade_count] = value
+        self._trade_count += 1
+
+    def get_analysis(self):
+        curve = {name: values[:self._points].copy() for name, values in self._curve.items()}
+        curve['time'] = to_datetime64(curve['time'])
+        trades = {field: values[:self._trade_count].copy() for field, values in self._trades.items()}
+        return RunCapture(curve, trades, self._stride)
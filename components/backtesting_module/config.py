@@ -18,4 +18,49 @@ class BacktestConfig:
     # Resource limits
     MAX_OPTIMIZATION_COMBINATIONS = 100
     CPU_THRESHOLD = 80
-    MEMORY_THRESHOLD = 80
\ No newline at end of file
+    MEMORY_THRESHOLD = 80
+
+    # Backtrader engine
+    CEREBRO_PRELOAD = True       # Load every bar before running (needed by runonce)
+    CEREBRO_RUNONCE = True       # Calculate indicators over whole arrays instead of bar by bar
+    CEREBRO_EXACTBARS = 0        # 1 keeps only the bars indicators need; -1/-2 trim less
+
+    # Parallel optimization
+    MAX_WORKERS = None          # None = sized by ResourceMonitor
+    WORKER_MEMORY_MB = 200      # Expected footprint of one optimizer worker
+    TASKS_PER_WORKER = 4        # Chunks handed to each worker over a run
+    CPU_SAMPLE_INTERVAL = 0.1   # Seconds of CPU load sampled when sizing the pool
+    OPTIMIZATION_BATCH_SIZE = 1024  # Combinations looked up in the result cache at a time
+    RESULT_BATCH_SIZE = 256     # Results written per transaction while a sweep streams
+
+    # Resource scheduling
+    ADMISSION_TIMEOUT = 600      # Seconds research work waits for headroom before giving up
+    ADMISSION_POLL_INTERVAL = 1.0
+    WORKER_NICE = 10             # Niceness of worker processes, below the live trading processes
+
+    # Result cache
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_PATH = 'data/result_cache.db'
+
+    # Run capture
+    CAPTURE_MAX_POINTS = 250000  # Equity points kept per run; longer runs are downsampled
+    TRADE_PAGE_SIZE = 1000       # Trades per compressed page in the results database
+
+    # Backtest jobs
+    JOB_WORKERS = 2              # Jobs the job service runs at once
+    JOB_PROGRESS_EVENTS = 100    # Progress events published over one job
+    JOB_HISTORY_SIZE = 200       # Finished jobs kept in memory; their artifacts stay on disk
+    JOB_ARTIFACT_DIR = 'data/backtest_jobs'
+
+    # Monte Carlo simulation
+    MONTE_CARLO_MAX_MEMORY_MB = 256  # Working memory for one chunk of simulated paths
+
+    # Benchmark comparison
+    BENCHMARK_CACHE_SIZE = 16  # Benchmark price series kept in memory per process
+
+    # Throughput benchmarks
+    THROUGHPUT_BARS = 20000
+    THROUGHPUT_RESULTS_PATH = 'reports/throughput.json'
+    THROUGHPUT_BASELINE_PATH = 'data/throughput_baseline.json'
+    THROUGHPUT_TOLERANCE = 0.25        # Allowed relative slowdown or memory growth
+    THROUGHPUT_MIN_MEMORY_MB = 1.0     # Memory growth below this is noise
@@ -0,0 +1,114 @@
+# components/backtesting_module/early_stopping.py
+
+import backtrader as bt
+import numpy as np
+
+from .exceptions import OptimizationError
+
+RULES = ('max_drawdown', 'equity_floor', 'no_trade_bars')
+
+
+class EarlyStopping:
+    """
+    Rules that end a hopeless run before the end of its history.
+
+    ``max_drawdown`` is a percentage from the running peak of the equity
+    (the convention of the ``max_drawdown`` metric), ``equity_floor`` a
+    fraction of the starting cash, and ``no_trade_bars`` the number of bars
+    after which a run that has not opened a position is given up. A rule
+    left as None is not checked.
+
+    A run that trips a rule is reported with the metrics of the bars it ran
+    and ``pruned`` set: see ``EarlyStoppingAnalyzer`` for Cerebro runs and
+    ``scan`` for equity curves from the vectorized engine. Both stop at the
+    same bar for the same run.
+    """
+
+    def __init__(self, max_drawdown=None, equity_floor=None, no_trade_bars=None):
+        if max_drawdown is not None and not 0 < max_drawdown <= 100:
+            raise OptimizationError(f"max_drawdown must be a percentage in (0, 100], got {max_drawdown}")
+        if equity_floor is not None and equity_floor < 0:
+            raise OptimizationError(f"equity_floor must be a non-negative fraction of cash, got {equity_floor}")
+        if no_trade_bars is not None and no_trade_bars < 1:
+            raise OptimizationError(f"no_trade_bars must be at least 1, got {no_trade_bars}")
+        self.max_drawdown = max_drawdown
+        self.equity_floor = equity_floor
+        self.no_trade_bars = no_trade_bars
+
+    @property
+    def enabled(self):
+        return any(value is not None for value in self.settings().values())
+
+    def settings(self):
+        """The rules as a dict; part of the result cache key of pruned runs"""
+        return {rule: getattr(self, rule) for rule in RULES}
+
+    def check(self, bar, value, peak, cash, traded):
+        """
+        The rule tripped at ``bar`` (1-based) with broker ``value``, running
+        ``peak`` and starting ``cash``, or None. A few comparisons, so it
+        can run on every bar.
+        """
+        if self.max_drawdown is not None and (peak - value) / peak * 100.0 >= self.max_drawdown:
+            return 'max_drawdown'
+        if self.equity_floor is not None and value < self.equity_floor * cash:
+            return 'equity_floor'
+        if self.no_trade_bars is not None and not traded and bar >= self.no_trade_bars:
+            return 'no_trade_bars'
+        return None
+
+    def scan(self, equity, position, cash):
+        """
+        First ``(rule, bar)`` at which a rule trips over a whole equity curve
+        and position series, or None; ``check`` applied to every bar at once.
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        trips = []
+        if self.max_drawdown is not None:
+            peaks = np.maximum.accumulate(np.maximum(equity, cash))
+            trips.append(('max_drawdown', (peaks - equity) / peaks * 100.0 >= self.max_drawdown))
+        if self.equity_floor is not None:
+            trips.append(('equity_floor', equity < self.equity_floor * cash))
+        if self.no_trade_bars is not None:
+            traded = np.maximum.accumulate(np.asarray(position) != 0)
+            trips.append(('no_trade_bars', ~traded & (np.arange(1, len(equity) + 1) >= self.no_trade_bars)))
+        first = None
+        for rule, tripped in trips:
+            index = int(np.argmax(tripped)) if tripped.any() else None
+            if index is not None and (first is None or index < first[1] - 1):
+                first = (rule, index + 1)
+        return first
+
+
+class EarlyStoppingAnalyzer(bt.Analyzer):
+    """
+    Checks ``EarlyStopping`` rules after every bar and stops the run at the
+    first one tripped; ``get_analysis()`` returns ``(rule, bar)`` or None.
+    """
+
+    params = (('rules', None),)
+
+    def start(self):
+        self._cash = self.strategy.broker.startingcash
+        self._peak = self._cash
+        self._traded = False
+        self.tripped = None
+
+    def notify_trade(self, trade):
+        self._traded = True
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        value = self.strategy.broker.getvalue()
+        if value > self._peak:
+            self._peak = value
+        bar = len(self.data)
+        rule = self.p.rules.check(bar, value, self._peak, self._cash, self._traded)
+        if rule is not None:
+            self.tripped = (rule, bar)
+            self.strategy.env.runstop()
+
+    def get_analysis(self):
+        return self.tripped
@@ -15,3 +15,7 @@ class StrategyError(BacktestError):
 class OptimizationError(BacktestError):
     """Exception for optimization-related errors"""
     pass
+
+class BacktestCancelled(BacktestError):
+    """Exception for a run stopped before it finished"""
+    pass
@@ -0,0 +1,87 @@
+# components/backtesting_module/feeds.py
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from .capture import EPOCH_DAYS
+from .config import BacktestConfig
+
+PRICE_LINES = ('open', 'high', 'low', 'close', 'volume', 'openinterest')
+
+
+def date_numbers(index):
+    """A datetime index as backtrader date numbers (UTC for a tz-aware index, as PandasData does)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.values.astype('datetime64[ns]').view(np.int64) / 86400e9 + EPOCH_DAYS
+
+
+def cerebro_options(preload=None, runonce=None, exactbars=None):
+    """
+    ``bt.Cerebro`` keyword arguments for the memory and speed settings,
+    each defaulting to ``BacktestConfig``.
+
+    ``exactbars=1`` keeps only the bars the indicators look back over, which
+    turns preload and runonce off; -1 and -2 trim fewer buffers but keep them.
+    """
+    return {
+        'preload': BacktestConfig.CEREBRO_PRELOAD if preload is None else preload,
+        'runonce': BacktestConfig.CEREBRO_RUNONCE if runonce is None else runonce,
+        'exactbars': BacktestConfig.CEREBRO_EXACTBARS if exactbars is None else exactbars
+    }
+
+
+class NumpyData(bt.feed.DataBase):
+    """
+    Data feed over contiguous float64 arrays.
+
+    ``dataname`` is an OHLCV DataFrame with lower-case columns and a datetime
+    index (as ``PandasData`` takes), or a dict of arrays with ``datetime``
+    (backtrader date numbers) and the price lines; a missing ``openinterest``
+    is zero. A DataFrame's columns are taken as arrays without copying when
+    they are already float64, so a ``SharedFrame`` stays in shared memory.
+
+    Preloading copies each column into its line buffer in one call rather
+    than loading the frame bar by bar. Without preload (``exactbars=1`` or
+    ``preload=False``) bars are read one at a time from the same arrays.
+    ``fromdate``/``todate`` are applied to the arrays; a feed with filters or
+    ``tzinput`` preloads bar by bar.
+    """
+
+    def start(self):
+        super().start()
+        source = self.p.dataname
+        if isinstance(source, pd.DataFrame):
+            columns = {'datetime': date_numbers(source.index)}
+            for name in PRICE_LINES:
+                if name in source.columns:
+                    columns[name] = source[name].to_numpy(dtype=np.float64)
+        else:
+            columns = dict(source)
+        n = len(columns['datetime'])
+        self._columns = {name: np.ascontiguousarray(columns.get(name, np.zeros(n)), dtype=np.float64)
+                         for name in ('datetime',) + PRICE_LINES}
+        self._cursor = 0
+
+    def preload(self):
+        if self._filters or self._ffilters or self.p.tzinput is not None:
+            return super().preload()
+        dates = self._columns['datetime']
+        first = np.searchsorted(dates, self.fromdate, side='left')
+        last = np.searchsorted(dates, self.todate, side='right')
+        for name, values in self._columns.items():
+            getattr(self.lines, name).array.frombytes(values[first:last].tobytes())
+        # The line buffers now hold every bar; the arrays are no longer needed
+        self._columns = None
+        self._last()
+        self.home()
+
+    def _load(self):
+        if self._columns is None or self._cursor >= len(self._columns['datetime']):
+            return False
+        for name, values in self._columns.items():
+            getattr(self.lines, name)[0] = values[self._cursor]
+        self._cursor += 1
+        return True
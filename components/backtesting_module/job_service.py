@@ -0,0 +1,299 @@
+# components/backtesting_module/job_service.py
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .backtester import Backtester
+from .config import BacktestConfig
+from .exceptions import BacktestCancelled, BacktestError, StrategyError
+from .results_repository import ResultsRepository
+from .strategy_adapter import StrategyAdapter
+
+FINISHED_STATES = ('completed', 'failed', 'cancelled')
+
+
+class BacktestJob:
+    """
+    One submitted backtest: its settings, state and event log.
+
+    Events are dicts with a sequence number ``seq``, a ``type`` (``status``,
+    ``progress``) and the event's fields. The log is kept for the life of the
+    job so a client that connects late, or reconnects, replays it from any
+    sequence number.
+    """
+
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.spec = spec
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.metrics = None
+        self.future = None
+        self._events = []
+        self._condition = threading.Condition()
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def publish(self, event_type, **fields):
+        with self._condition:
+            self._events.append({'seq': len(self._events), 'type': event_type, 'time': time.time(), **fields})
+            self._condition.notify_all()
+
+    def set_status(self, status, **fields):
+        with self._condition:
+            self.status = status
+            if status == 'running':
+                self.started_at = time.time()
+            elif status in FINISHED_STATES:
+                self.finished_at = time.time()
+            self.publish('status', status=status, **fields)
+
+    def events(self, since=0, timeout=None):
+        """
+        Events from sequence number ``since`` on, waiting for new ones until
+        the job has finished.
+
+        Yields None whenever ``timeout`` seconds pass without an event, so a
+        stream can send a keep-alive and notice a closed connection.
+        """
+        position = max(0, since)
+        while True:
+            with self._condition:
+                if position >= len(self._events) and not self.finished:
+                    self._condition.wait(timeout)
+                new = self._events[position:]
+                finished = self.finished
+            if not new:
+                if finished:
+                    return
+                yield None
+                continue
+            yield from new
+            position += len(new)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'spec': self.spec,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+            'metrics': self.metrics
+        }
+
+
+class BacktestJobService:
+    """
+    Runs backtests in the background for the UI.
+
+    ``submit`` returns a job ID at once and a pool of ``max_workers`` threads
+    runs the jobs through ``Backtester.run_backtest``, which waits for
+    resources on the shared ``ResourceScheduler``. While a job runs it
+    publishes up to ``BacktestConfig.JOB_PROGRESS_EVENTS`` progress events
+    with the percent of bars done and the partial return and drawdown.
+    ``cancel`` is cooperative: a queued job never starts and a running one
+    stops at its next bar. A completed job's metrics, equity curve and trade
+    log are saved to the results repository and its metrics and equity curve
+    to ``<artifact_dir>/<job id>.json``, so they outlive the job and the
+    process; ``trades`` pages through the trade log.
+    ``shared()`` hands out one service per process.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers=BacktestConfig.JOB_WORKERS, artifact_dir=BacktestConfig.JOB_ARTIFACT_DIR,
+                 repository=None, history_size=BacktestConfig.JOB_HISTORY_SIZE):
+        self.artifact_dir = artifact_dir
+        self.repository = repository
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='backtest-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """The process-wide job service"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def submit(self, strategy_name, ticker, start_date, end_date, strategy_params=None,
+               cash=BacktestConfig.INITIAL_CASH, commission=BacktestConfig.DEFAULT_COMMISSION):
+        """
+        Queue a backtest and return its job ID.
+
+        Raises:
+            StrategyError: Unknown strategy
+            BacktestError: Missing ticker or an empty date range
+        """
+        if strategy_name not in StrategyAdapter.STRATEGIES:
+            raise StrategyError(f"Unknown strategy '{strategy_name}'. "
+                                f"Expected one of {list(StrategyAdapter.STRATEGIES)}")
+        if not ticker:
+            raise BacktestError("A backtest job needs a ticker")
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        if start >= end:
+            raise BacktestError(f"Start date {start.date()} is not before end date {end.date()}")
+
+        spec = {
+            'strategy_name': strategy_name,
+            'strategy_params': dict(strategy_params or {}),
+            'ticker': ticker.upper(),
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'cash': float(cash),
+            'commission': float(commission)
+        }
+        job = BacktestJob(uuid.uuid4().hex, spec)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        job.publish('status', status='queued')
+        job.future = self._executor.submit(self._run, job)
+        logging.info(f"Queued backtest job {job.id}: {strategy_name} on {spec['ticker']}")
+        return job.id
+
+    def _evict(self):
+        """Forget the oldest finished jobs beyond ``history_size``"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """Jobs held in memory, oldest first"""
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def describe(self, job_id):
+        """State of a job, from its artifacts once it is no longer in memory; None for an unknown ID"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        artifacts = self.artifacts(job_id)
+        return artifacts['job'] if artifacts else None
+
+    def cancel(self, job_id):
+        """
+        Ask a job to stop. Returns False for an unknown or finished job.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job.set_status('cancelled')
+        logging.info(f"Cancellation requested for backtest job {job_id}")
+        return True
+
+    def _run(self, job):
+        spec = job.spec
+        job.set_status('running')
+        backtester = Backtester(spec['strategy_name'], spec['strategy_params'], spec['ticker'],
+                                pd.Timestamp(spec['start_date']).to_pydatetime(),
+                                pd.Timestamp(spec['end_date']).to_pydatetime())
+        cash = spec['cash']
+        state = {'peak': cash, 'max_drawdown': 0.0, 'step': None}
+
+        def progress(bar, bars, value):
+            if job.cancel_requested:
+                return False
+            state['peak'] = max(state['peak'], value)
+            state['max_drawdown'] = max(state['max_drawdown'], (1 - value / state['peak']) * 100)
+            if state['step'] is None:
+                state['step'] = max(1, bars // BacktestConfig.JOB_PROGRESS_EVENTS)
+            if bar % state['step'] == 0 or bar == bars:
+                job.publish('progress', percent=100.0 * bar / bars, bar=bar, bars=bars, value=value,
+                            total_return=value / cash - 1, max_drawdown=state['max_drawdown'])
+
+        try:
+            backtester.run_backtest(cash, spec['commission'], progress=progress)
+            job.metrics = backtester.get_performance_metrics()
+            self._save_artifacts(job, backtester.equity, backtester.result_key)
+            backtester.save_results(self.repository)
+            job.set_status('completed', metrics=job.metrics)
+        except BacktestCancelled:
+            job.set_status('cancelled')
+        except Exception as e:
+            logging.error(f"Backtest job {job.id} failed: {e}")
+            job.error = str(e)
+            job.set_status('failed', error=job.error)
+
+    def _path(self, job_id):
+        return os.path.join(self.artifact_dir, f"{job_id}.json")
+
+    def _save_artifacts(self, job, equity, result_key):
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        document = {
+            'job': {**job.to_dict(), 'status': 'completed', 'finished_at': time.time()},
+            'result_key': result_key,
+            'metrics': job.metrics,
+            'equity': {
+                'index': [timestamp.isoformat() for timestamp in pd.DatetimeIndex(equity.index)],
+                'values': equity.astype(float).tolist()
+            }
+        }
+        path = self._path(job.id)
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(document, f, default=str)
+        os.replace(f"{path}.tmp", path)
+
+    def artifacts(self, job_id):
+        """Metrics and equity curve of a completed job, or None"""
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def trades(self, job_id, offset=0, limit=100):
+        """
+        A page of a completed job's trades, from the trade log saved with its
+        result; None when the job has no saved trade log
+        """
+        artifacts = self.artifacts(job_id)
+        if artifacts is None:
+            return None
+        repository = self.repository or ResultsRepository.shared()
+        page = repository.get_trades(artifacts['result_key'], offset, limit)
+        if page is None:
+            return None
+        trades, total = page
+        return {
+            'total': total,
+            'offset': offset,
+            'trades': json.loads(trades.to_json(orient='records', date_format='iso'))
+        }
+
+    def shutdown(self, wait=False):
+        """Cancel every unfinished job and stop the worker threads"""
+        with self._lock:
+            job_ids = list(self._jobs)
+        for job_id in job_ids:
+            self.cancel(job_id)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
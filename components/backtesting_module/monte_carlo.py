@@ -0,0 +1,174 @@
+# components/backtesting_module/monte_carlo.py
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from .config import BacktestConfig
+from .exceptions import BacktestError
+
+METHODS = ('bootstrap', 'block', 'shuffle')
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def trade_returns(trades, initial_cash):
+    """
+    Per-trade returns on account equity from a trade log.
+
+    ``trades`` is either a fills log with ``size``, ``price`` and
+    ``commission`` columns (the vectorized engine's ``trades`` frame), whose
+    fills are grouped into round trips from flat to flat, or a closed-trade
+    log with ``pnl_net`` (a ``RunCapture`` trade log from a Backtrader run),
+    one trade per row. Each trade's net P&L is divided by the equity before
+    it was opened. A position still open at the end is ignored.
+    """
+    if 'pnl_net' in trades:
+        pnls = np.asarray(trades['pnl_net'], dtype=np.float64)
+    else:
+        sizes = np.asarray(trades['size'], dtype=np.float64)
+        cash_flows = (-sizes * np.asarray(trades['price'], dtype=np.float64)
+                      - np.asarray(trades['commission'], dtype=np.float64))
+        flat = np.flatnonzero(np.isclose(np.cumsum(sizes), 0.0))
+        pnls = np.array([flow.sum() for flow in np.split(cash_flows, flat + 1)[:len(flat)]], dtype=np.float64)
+    equity = float(initial_cash) + np.concatenate(([0.0], np.cumsum(pnls)[:-1]))
+    return pnls / equity
+
+
+class MonteCarloSimulator:
+    """
+    Distribution of outcomes from resampled return sequences.
+
+    The input is one sequence of returns on equity, either per bar (from an
+    equity curve) or per trade. Each simulated path is a resampling of it:
+
+    - ``bootstrap``: draw returns independently with replacement
+    - ``block``: circular block bootstrap, which keeps ``block_size`` consecutive
+      returns together to preserve volatility clustering
+    - ``shuffle``: a random permutation (same terminal value, different path)
+
+    Paths are generated as N x T NumPy matrices in chunks sized to
+    ``max_memory_mb``, so only the per-path statistics are kept.
+    """
+
+    def __init__(self, returns, initial_cash=BacktestConfig.INITIAL_CASH, periods_per_year=252,
+                 max_memory_mb=BacktestConfig.MONTE_CARLO_MAX_MEMORY_MB):
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[~np.isnan(returns)]
+        if len(returns) < 2:
+            raise BacktestError("At least two returns are needed for a Monte Carlo simulation")
+        self.returns = returns
+        self.initial_cash = float(initial_cash)
+        self.periods_per_year = periods_per_year
+        self.max_memory_mb = max_memory_mb
+
+    @classmethod
+    def from_equity(cls, equity, **kwargs):
+        """Simulate per-bar returns of an equity curve"""
+        equity = pd.Series(equity, dtype=np.float64)
+        kwargs.setdefault('initial_cash', float(equity.iloc[0]))
+        return cls(equity.pct_change().to_numpy()[1:], **kwargs)
+
+    @classmethod
+    def from_backtester(cls, backtester, trades=False, **kwargs):
+        """
+        Simulate the daily returns of a finished ``Backtester`` run (fresh or
+        cached), or with ``trades`` the net P&L of each trade in its
+        ``RunCapture`` trade log, which only a fresh run has
+        """
+        if backtester.equity is None:
+            raise BacktestError("Run the backtest before simulating it")
+        if not trades:
+            return cls.from_equity(backtester.equity, **kwargs)
+        if backtester.capture is None:
+            raise BacktestError("No trade log for this run; a run served from the result cache has none")
+        # Orders fill on the bar after the signal, so the first bar's equity is the starting cash
+        kwargs.setdefault('initial_cash', float(backtester.capture.curve['equity'][0]))
+        return cls.from_trades(backtester.capture.trades, **kwargs)
+
+    @classmethod
+    def from_trades(cls, trades, initial_cash=BacktestConfig.INITIAL_CASH, **kwargs):
+        """
+        Simulate sequences of trades: round trips of a fills log or closed
+        trades of a ``RunCapture`` trade log (see ``trade_returns``).
+
+        Sharpe is annualized with the observed number of trades per year
+        unless ``periods_per_year`` is given.
+        """
+        returns = trade_returns(trades, initial_cash)
+        times = next((np.asarray(trades[column]) for column in ('datetime', 'close_time') if column in trades), None)
+        if 'periods_per_year' not in kwargs and times is not None and len(times) > 1:
+            span = pd.Timestamp(times[-1]) - pd.Timestamp(times[0])
+            years = span / pd.Timedelta(days=365.25)
+            if years > 0:
+                kwargs['periods_per_year'] = len(returns) / years
+        return cls(returns, initial_cash=initial_cash, **kwargs)
+
+    def run(self, n_paths=10000, horizon=None, method='block', block_size=20, seed=None,
+            quantiles=DEFAULT_QUANTILES):
+        """
+        Simulate ``n_paths`` paths of ``horizon`` returns (default: as many as observed).
+
+        Returns:
+            Dict with per-path ``terminal_value``, ``sharpe_ratio`` and
+            ``max_drawdown`` arrays, their quantile ``bands`` (DataFrame indexed
+            by quantile), ``probability_of_loss`` and the run settings
+        """
+        if method not in METHODS:
+            raise BacktestError(f"Invalid Monte Carlo method '{method}'. Expected one of {METHODS}")
+        horizon = horizon or len(self.returns)
+        if method == 'shuffle' and horizon != len(self.returns):
+            raise BacktestError("A shuffle simulation uses the observed number of returns as its horizon")
+
+        rng = np.random.default_rng(seed)
+        terminal = np.empty(n_paths)
+        sharpe = np.empty(n_paths)
+        drawdown = np.empty(n_paths)
+        # Index, return, equity and running-peak matrices are alive at once
+        rows_per_chunk = max(1, int(self.max_memory_mb * 1024 * 1024 // (horizon * 8 * 4)))
+
+        for start in range(0, n_paths, rows_per_chunk):
+            stop = min(n_paths, start + rows_per_chunk)
+            paths = self._sample(rng, stop - start, horizon, method, block_size)
+            terminal[start:stop], sharpe[start:stop], drawdown[start:stop] = self._statistics(paths)
+
+        metrics = {'terminal_value': terminal, 'sharpe_ratio': sharpe, 'max_drawdown': drawdown}
+        bands = pd.DataFrame({name: np.nanquantile(values, quantiles) for name, values in metrics.items()},
+                             index=pd.Index(quantiles, name='quantile'))
+        logging.info(f"Monte Carlo ({method}): {n_paths} paths x {horizon} returns, "
+                     f"median terminal value {bands.loc[bands.index[len(bands) // 2], 'terminal_value']:.2f}")
+        return {
+            **metrics,
+            'bands': bands,
+            'probability_of_loss': float((terminal < self.initial_cash).mean()),
+            'n_paths': n_paths,
+            'horizon': horizon,
+            'method': method,
+            'seed': seed
+        }
+
+    def _sample(self, rng, rows, horizon, method, block_size):
+        """A rows x horizon matrix of resampled returns"""
+        n = len(self.returns)
+        if method == 'bootstrap':
+            return self.returns[rng.integers(0, n, size=(rows, horizon))]
+        if method == 'shuffle':
+            return rng.permuted(np.broadcast_to(self.returns, (rows, n)), axis=1)
+        block_size = max(1, min(block_size, n))
+        blocks = math.ceil(horizon / block_size)
+        starts = rng.integers(0, n, size=(rows, blocks, 1))
+        index = (starts + np.arange(block_size)) % n
+        return self.returns[index.reshape(rows, blocks * block_size)[:, :horizon]]
+
+    def _statistics(self, paths):
+        """Terminal value, annualized Sharpe and max drawdown (%) of each path"""
+        equity = self.initial_cash * np.cumprod(1.0 + paths, axis=1)
+        peaks = np.maximum(np.maximum.accumulate(equity, axis=1), self.initial_cash)
+        drawdown = ((peaks - equity) / peaks).max(axis=1) * 100.0
+
+        std = paths.std(axis=1, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, paths.mean(axis=1) / std * np.sqrt(self.periods_per_year), np.nan)
+        return equity[:, -1], sharpe, drawdown
@@ -1,12 +1,27 @@
 # components/backtesting_module/optimizer.py
 
 import backtrader as bt
-from components.backtesting_module.strategy_adapters import StrategyAdapter
+from components.backtesting_module.strategy_adapter import StrategyAdapter
 from components.data_management_module.alpaca_api import AlpacaAPIClient
 from datetime import datetime
+import multiprocessing
 import pandas as pd
 import logging
-from itertools import product
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from .config import BacktestConfig
+from .early_stopping import EarlyStoppingAnalyzer
+from .exceptions import OptimizationError
+from .feeds import NumpyData, cerebro_options
+from .resource_monitor import ResourceMonitor
+from .result_cache import ResultCache, data_fingerprint, result_key
+from .results_repository import ResultsRepository
+from .scheduler import ResourceScheduler, lower_priority
+from .parameter_space import ParameterSpace
+from .parameter_validator import ParameterValidator
+from .search import SearchBudget, get_search_strategy, score
+from .shared_data import SharedFrame
+from .vectorized_engine import VectorizedBacktester, compute_metrics
 
 logging.basicConfig(
     filename='logs/optimizer.log',
@@ -14,9 +29,133 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s:%(message)s'
 )
 
+ENGINES = ('backtrader', 'vectorized')
+
+# Per-process state set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(data_spec, strategy_name, cash, commission, engine, engine_options, early_stopping):
+    """Attach to the shared data once per worker process"""
+    lower_priority()
+    shm, data = SharedFrame.attach(data_spec)
+    _worker.update({
+        'shm': shm,
+        'data': data,
+        'strategy_name': strategy_name,
+        'cash': cash,
+        'commission': commission,
+        'engine': engine,
+        'engine_options': engine_options,
+        'early_stopping': early_stopping
+    })
+
+
+def _evaluate(params, data, strategy_name, cash, commission, engine, engine_options=None, early_stopping=None):
+    """
+    Run one backtest and return its optimization result; ``engine_options`` go
+    to ``bt.Cerebro``. A run that trips an ``early_stopping`` rule returns
+    the metrics of the bars it ran with ``pruned``, ``pruned_rule`` and
+    ``pruned_bar`` set.
+    """
+    if early_stopping is not None and not early_stopping.enabled:
+        early_stopping = None
+    if engine == 'vectorized':
+        backtester = VectorizedBacktester(data, cash=cash, commission=commission)
+        run = backtester.run(strategy_name, params)
+        metrics, tripped = run['metrics'], None
+        if early_stopping is not None:
+            tripped = early_stopping.scan(run['equity'], run['position'], cash)
+            if tripped is not None:
+                metrics = compute_metrics(run['equity'].to_numpy()[:tripped[1]], cash, backtester.periods_per_year)
+        result = {
+            'params': params,
+            'sharpe_ratio': metrics['sharpe_ratio'],
+            'max_drawdown': metrics['max_drawdown'],
+            'total_return': metrics['total_return'],
+            'final_value': metrics['final_value']
+        }
+        return _mark_pruned(result, tripped)
+
+    cerebro = bt.Cerebro(stdstats=False, **(engine_options or {}))
+    cerebro.adddata(NumpyData(dataname=data))
+    cerebro.addstrategy(StrategyAdapter.get_strategy(strategy_name), **params)
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=commission)
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+    if early_stopping is not None:
+        cerebro.addanalyzer(EarlyStoppingAnalyzer, _name='early_stopping', rules=early_stopping)
+    strategy = cerebro.run()[0]
+    result = _strategy_metrics(strategy)
+    result['params'] = params
+    result['final_value'] = cerebro.broker.getvalue()
+    return _mark_pruned(result, strategy.analyzers.early_stopping.get_analysis() if early_stopping else None)
+
+
+def _mark_pruned(result, tripped):
+    if tripped is not None:
+        result.update(pruned=True, pruned_rule=tripped[0], pruned_bar=tripped[1])
+    return result
+
+
+def _strategy_metrics(strategy):
+    return {
+        'sharpe_ratio': strategy.analyzers.sharpe.get_analysis().get('sharperatio', None),
+        'max_drawdown': strategy.analyzers.drawdown.get_analysis()['max']['drawdown'],
+        'total_return': strategy.analyzers.returns.get_analysis()['rtot']
+    }
+
+
+def _evaluate_safely(params, *args):
+    """``_evaluate`` that reports a failing combination instead of raising"""
+    try:
+        return _evaluate(params, *args)
+    except Exception as e:
+        return {'params': params, 'error': str(e)}
+
+
+def _evaluate_chunk(chunk):
+    """
+    Worker entry point: evaluate a chunk of ``(key, params, start, stop)``
+    tasks, each on the ``iloc[start:stop]`` window of the shared data
+    """
+    data = _worker['data']
+    return [
+        (key, _evaluate_safely(params, data.iloc[start:stop], _worker['strategy_name'],
+                               _worker['cash'], _worker['commission'], _worker['engine'],
+                               _worker['engine_options'], _worker['early_stopping']))
+        for key, params, start, stop in chunk
+    ]
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class Optimizer:
     """
     Performs parameter optimization (grid search).
+
+    Combinations are evaluated in a process pool sized by ``ResourceMonitor``;
+    ``scheduler`` admits each sweep once there is headroom and adjusts how
+    many tasks are in flight while it runs, and workers run at low priority.
+    The price data is published once in shared memory and every worker maps
+    it on start-up, so tasks carry only parameter dicts. Work is handed out in
+    chunks and results are yielded as soon as each chunk completes.
+
+    Combinations already evaluated on the same data are served from
+    ``result_cache`` (set it to None to always recompute). ``engine_options``
+    holds the Cerebro ``preload``/``runonce``/``exactbars`` settings of
+    backtrader runs (see ``feeds.cerebro_options``). Set ``early_stopping``
+    to an ``EarlyStopping`` to cut hopeless runs short; they are returned
+    with ``pruned`` set and are neither saved nor picked as the best.
     """
 
     def __init__(self, strategy_name, ticker, start_date, end_date):
@@ -25,6 +164,10 @@ class Optimizer:
         self.start_date = start_date
         self.end_date = end_date
         self.data = None
+        self.result_cache = ResultCache() if BacktestConfig.RESULT_CACHE_ENABLED else None
+        self.scheduler = ResourceScheduler.shared()
+        self.engine_options = cerebro_options()
+        self.early_stopping = None
         self.alpaca_client = AlpacaAPIClient()
 
     def load_data(self):
@@ -37,7 +180,7 @@ class Optimizer:
                 self.ticker,
                 self.start_date,
                 self.end_date,
-                timeframe='1Day'
+                timeframe=BacktestConfig.DEFAULT_TIMEFRAME
             )
             if self.data.empty:
                 raise ValueError(f"No data found for ticker {self.ticker} between {self.start_date} and {self.end_date}")
@@ -55,57 +198,364 @@ class Optimizer:
             logging.error(f"Error fetching data: {e}")
             raise
 
-    def run_optimization(self, param_ranges, cash=100000.0, commission=0.001, max_combinations=100):
-        self.load_data()
-        cerebro = bt.Cerebro(optreturn=False)
-        data_feed = bt.feeds.PandasData(dataname=self.data)
-        cerebro.adddata(data_feed)
-
-        # Generate parameter combinations
-        param_names = list(param_ranges.keys())
-        param_values = list(param_ranges.values())
-        combinations = list(product(*param_values))
-
-        # Limit combinations to prevent overload
-        if len(combinations) > max_combinations:
-            logging.warning(f"Limiting combinations to first {max_combinations} due to resource constraints.")
-            combinations = combinations[:max_combinations]
-
-        cerebro.optstrategy(
-            StrategyAdapter,
-            strategy_name=self.strategy_name,
-            strategy_params=[
-                dict(zip(param_names, combination)) for combination in combinations
-            ]
-        )
-        cerebro.broker.setcash(cash)
-        cerebro.broker.setcommission(commission=commission)
-        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-        cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
-        logging.info(f"Starting optimization for {self.strategy_name} on {self.ticker}")
-        optimized_runs = cerebro.run(maxcpus=1)
+    def parameter_space(self, param_ranges):
+        """
+        ``param_ranges`` as a ``ParameterSpace``. A plain dict gets the
+        strategy's ``ParameterValidator`` constraints over the parameters it
+        sweeps; a space is used as is, with its own constraints.
+        """
+        if isinstance(param_ranges, ParameterSpace):
+            return param_ranges
+        return ParameterSpace(param_ranges, ParameterValidator.constraints(self.strategy_name, param_ranges))
+
+    def generate_combinations(self, param_ranges, max_combinations=None):
+        """
+        Expand ``param_ranges`` into parameter dicts (lazily, in grid order).
+        Only the combinations the constraints of ``parameter_space`` allow are yielded.
+        """
+        combinations = self.parameter_space(param_ranges).iter_valid()
+        if max_combinations is not None:
+            combinations = islice(combinations, max_combinations)
+        return combinations
+
+    def iter_optimization(self, param_ranges, cash=100000.0, commission=0.001, max_combinations=None,
+                          engine='backtrader', max_workers=None, chunksize=None):
+        """
+        Evaluate every combination and yield each result as soon as it is ready.
+
+        Results arrive in completion order, not grid order. A combination that
+        raises is yielded as ``{'params': ..., 'error': ...}`` instead of
+        aborting the sweep. Combinations are drawn lazily from the grid and
+        only the tasks in flight are held, so memory does not grow with the
+        size of the sweep.
+
+        Args:
+            param_ranges: Dict of parameter name to the values to try, or a ``ParameterSpace``
+            cash: Starting cash for every run
+            commission: Broker commission for every run
+            max_combinations: Optional cap on the number of combinations
+            engine: 'backtrader' or 'vectorized'
+            max_workers: Upper bound on worker processes; ResourceMonitor decides below it
+            chunksize: Combinations per task; defaults to an even split of
+                ``BacktestConfig.TASKS_PER_WORKER`` tasks per worker
+        """
+        if self.data is None:
+            self.load_data()
+        space = self.parameter_space(param_ranges)
+        total = space.size
+        if max_combinations is not None:
+            total = min(total, max_combinations)
+        pruned = f" ({space.full_size - space.size} ruled out by constraints)" if space.constraints else ""
+        logging.info(f"Starting optimization for {self.strategy_name} on {self.ticker}: "
+                     f"{total} combinations{pruned}")
+        yield from self.iter_evaluations(self.generate_combinations(space, max_combinations), cash,
+                                         commission, engine, max_workers, chunksize, total=total)
         logging.info("Optimization completed.")
-        return self.collect_results(optimized_runs)
+
+    def iter_evaluations(self, combinations, cash=100000.0, commission=0.001, engine='backtrader',
+                         max_workers=None, chunksize=None, data=None, total=None):
+        """
+        Evaluate an iterable of parameter dicts, in a process pool when more
+        than one worker is available, yielding results in completion order.
+
+        ``data`` defaults to the full loaded history; ``total`` is the number
+        of combinations when ``combinations`` is a generator.
+        """
+        tasks = ((None, params, None, None) for params in combinations)
+        if total is None and hasattr(combinations, '__len__'):
+            total = len(combinations)
+        for _, result in self.iter_window_evaluations(tasks, cash, commission, engine, max_workers, chunksize,
+                                                      data, total):
+            yield result
+
+    def iter_window_evaluations(self, tasks, cash=100000.0, commission=0.001, engine='backtrader',
+                                max_workers=None, chunksize=None, data=None, total=None):
+        """
+        Evaluate ``(key, params, start, stop)`` tasks, each on the
+        ``data.iloc[start:stop]`` window, and yield ``(key, result)`` pairs in
+        completion order. The data is shared with the workers once, however
+        many windows the tasks cover.
+
+        ``tasks`` may be a generator; it is consumed as workers free up.
+        Cached results are looked up ``BacktestConfig.OPTIMIZATION_BATCH_SIZE``
+        tasks at a time and yielded as they are found; only the remaining
+        tasks are run, and their successful results are added to the cache.
+        """
+        if engine not in ENGINES:
+            raise OptimizationError(f"Invalid engine '{engine}'. Expected one of {ENGINES}")
+        if data is None:
+            if self.data is None:
+                self.load_data()
+            data = self.data
+        if total is None and hasattr(tasks, '__len__'):
+            total = len(tasks)
+        if self.result_cache is None:
+            with self._task_runner(data, cash, commission, engine, max_workers, chunksize, total) as run:
+                yield from run(tasks)
+            return
+
+        counts = {'tasks': 0, 'hits': 0}
+        entries = []
+        with ExitStack() as stack:
+            run = None
+            try:
+                for block in _chunked(tasks, BacktestConfig.OPTIMIZATION_BATCH_SIZE):
+                    cache_keys = self._cache_keys(block, data, cash, commission, engine)
+                    hits = self.result_cache.get_many([key for key, _, _ in cache_keys])
+                    counts['tasks'] += len(block)
+                    counts['hits'] += len(hits)
+                    pending = []
+                    for task, cache_key in zip(block, cache_keys):
+                        if cache_key[0] in hits:
+                            yield task[0], dict(hits[cache_key[0]], params=task[1])
+                        else:
+                            pending.append((cache_key, task))
+                    if not pending:
+                        continue
+                    if run is None:
+                        remaining = None if total is None else max(1, total - counts['hits'])
+                        run = stack.enter_context(self._task_runner(data, cash, commission, engine, max_workers,
+                                                                    chunksize, remaining))
+                    block_tasks = [((index, task[0]),) + tuple(task[1:]) for index, (_, task) in enumerate(pending)]
+                    for (index, key), result in run(block_tasks):
+                        if 'error' not in result:
+                            entries.append(pending[index][0] + (dict(result), self.strategy_name, self.ticker,
+                                                                engine))
+                            if len(entries) >= BacktestConfig.RESULT_BATCH_SIZE:
+                                self.result_cache.put_many(entries)
+                                entries = []
+                        yield key, result
+            finally:
+                self.result_cache.put_many(entries)
+        if counts['hits']:
+            logging.info(f"Result cache: {counts['hits']} of {counts['tasks']} evaluations reused")
+
+    def _cache_keys(self, tasks, data, cash, commission, engine):
+        """``(key, identity, fingerprint)`` for each task, fingerprinting each window once"""
+        windows = {}
+        keys = []
+        # Pruned results depend on the rules, so they are part of the key when set
+        stopping = {}
+        if self.early_stopping is not None and self.early_stopping.enabled:
+            stopping['early_stopping'] = self.early_stopping.settings()
+        for _, params, start, stop in tasks:
+            if (start, stop) not in windows:
+                window = data.iloc[start:stop]
+                bounds = (window.index[0], window.index[-1]) if len(window) else (None, None)
+                windows[(start, stop)] = (data_fingerprint(window),) + bounds
+            fingerprint, first, last = windows[(start, stop)]
+            key, identity = result_key('optimization', self.strategy_name, params, self.ticker,
+                                       BacktestConfig.DEFAULT_TIMEFRAME, first, last, fingerprint, engine,
+                                       cash=cash, commission=commission, **stopping)
+            keys.append((key, identity, fingerprint))
+        return keys
+
+    @contextmanager
+    def _task_runner(self, data, cash, commission, engine, max_workers, chunksize, total=None):
+        """
+        A function that evaluates an iterable of tasks, serially or on one
+        process pool kept for the life of the context, yielding ``(key, result)``
+        pairs. Tasks are pulled as workers free up. ``total`` (when known)
+        caps the pool size and sets the default chunk size.
+        """
+        self.scheduler.admit(name=f"{self.strategy_name} optimization")
+        workers = ResourceMonitor.get_worker_count(max_workers)
+        if total is not None:
+            workers = min(workers, max(1, total))
+
+        if workers == 1:
+            def run(tasks):
+                for key, params, start, stop in tasks:
+                    yield key, _evaluate_safely(params, data.iloc[start:stop], self.strategy_name, cash, commission,
+                                                engine, self.engine_options, self.early_stopping)
+            yield run
+            return
+
+        if chunksize is None:
+            chunksize = max(1, total // (workers * BacktestConfig.TASKS_PER_WORKER)) if total else 1
+        with SharedFrame(data) as shared:
+            with multiprocessing.Pool(
+                processes=workers,
+                initializer=_init_worker,
+                initargs=(shared.spec, self.strategy_name, cash, commission, engine, self.engine_options,
+                          self.early_stopping)
+            ) as pool:
+                def run(tasks):
+                    for chunk_results in self.scheduler.imap_unordered(pool, _evaluate_chunk,
+                                                                       _chunked(tasks, chunksize), workers):
+                        yield from chunk_results
+                yield run
+
+    def evaluate(self, combinations, fidelity=1.0, **kwargs):
+        """
+        Evaluate parameter dicts on the most recent ``fidelity`` fraction of the
+        history (1.0 = all of it). This is the evaluation API the adaptive
+        searches in ``search.py`` share.
+
+        Returns:
+            List of result dicts, each tagged with its ``fidelity``
+        """
+        if self.data is None:
+            self.load_data()
+        bars = max(1, int(round(len(self.data) * fidelity)))
+        results = list(self.iter_evaluations(combinations, data=self.data.iloc[-bars:], **kwargs))
+        for result in results:
+            result['fidelity'] = fidelity
+        return results
+
+    def run_optimization(self, param_ranges, cash=100000.0, commission=0.001, max_combinations=None,
+                         engine='backtrader', max_workers=None, callback=None):
+        """
+        Run a full grid search in parallel and return every result.
+
+        ``callback`` is called with each result as it arrives, e.g. to report
+        progress. The results are all held in memory; ``stream_optimization``
+        keeps memory flat for large sweeps.
+        """
+        optimization_results = []
+        for result in self.iter_optimization(param_ranges, cash, commission, max_combinations,
+                                             engine=engine, max_workers=max_workers):
+            optimization_results.append(result)
+            if callback:
+                callback(result)
+        return optimization_results
+
+    def stream_optimization(self, param_ranges, cash=100000.0, commission=0.001, max_combinations=None,
+                            engine='backtrader', max_workers=None, metric='sharpe_ratio', repository=None,
+                            batch_size=BacktestConfig.RESULT_BATCH_SIZE, callback=None):
+        """
+        Grid search whose memory does not grow with the sweep.
+
+        Each result is appended to the results store as it arrives, in
+        transactions of ``batch_size`` records, and only the best result by
+        ``metric`` is kept. Results that arrived before an error or an
+        interruption are still stored.
+
+        Returns:
+            Dict with ``evaluated``, ``failed``, ``pruned``, ``saved`` (rows
+            inserted), ``best_params`` and ``best_result``
+        """
+        repository = repository or ResultsRepository.shared()
+        summary = {'evaluated': 0, 'failed': 0, 'pruned': 0, 'saved': 0}
+        best, batch = None, []
+        try:
+            for result in self.iter_optimization(param_ranges, cash, commission, max_combinations,
+                                                 engine=engine, max_workers=max_workers):
+                summary['evaluated'] += 1
+                if callback:
+                    callback(result)
+                if 'error' in result:
+                    summary['failed'] += 1
+                    continue
+                if result.get('pruned'):
+                    summary['pruned'] += 1
+                    continue
+                if score(result, metric) > float('-inf') and (best is None or score(result, metric) > score(best, metric)):
+                    best = result
+                batch.append(result)
+                if len(batch) >= batch_size:
+                    summary['saved'] += self.save_results(batch, cash, commission, engine, repository)
+                    batch = []
+        finally:
+            if batch:
+                summary['saved'] += self.save_results(batch, cash, commission, engine, repository)
+        summary.update(best_params=best['params'] if best else None, best_result=best)
+        logging.info(f"Streamed {summary['evaluated']} results for {self.strategy_name} on {self.ticker}: "
+                     f"{summary['saved']} saved, {summary['failed']} failed, {summary['pruned']} pruned")
+        return summary
+
+    def run_search(self, param_ranges, method='random', metric='sharpe_ratio', max_evaluations=None,
+                   max_seconds=None, cash=100000.0, commission=0.001, engine='backtrader',
+                   max_workers=None, **search_options):
+        """
+        Adaptive alternative to the full grid in ``run_optimization``.
+
+        Args:
+            param_ranges: Dict of parameter name to the values to try, or a ``ParameterSpace``
+            method: 'random', 'halving', 'hyperband' or 'tpe'
+            metric: Result key to optimize; 'max_drawdown' is minimized
+            max_evaluations: Maximum number of backtests (any fidelity)
+            max_seconds: Wall-clock limit; the batch running when it expires completes
+            search_options: Passed to the search strategy (e.g. ``seed``, ``eta``)
+
+        Returns:
+            Dict with ``best_params``, ``best_result`` (full-history results
+            only), every ``results`` entry, ``evaluations`` and ``elapsed``
+        """
+        if max_evaluations is None and max_seconds is None:
+            raise OptimizationError("An adaptive search needs max_evaluations or max_seconds")
+        if self.data is None:
+            self.load_data()
+
+        space = self.parameter_space(param_ranges)
+        budget = SearchBudget(max_evaluations, max_seconds)
+        strategy = get_search_strategy(method, **search_options)
+
+        def evaluate(combinations, fidelity):
+            return self.evaluate(combinations, fidelity, cash=cash, commission=commission,
+                                 engine=engine, max_workers=max_workers)
+
+        logging.info(f"Starting {method} search for {self.strategy_name} on {self.ticker} "
+                     f"over {space.size} combinations")
+        results = strategy.search(evaluate, space, budget, metric)
+
+        full = [r for r in results if r.get('fidelity', 1.0) >= 1.0 and score(r, metric) > float('-inf')]
+        best = max(full, key=lambda r: score(r, metric)) if full else None
+        logging.info(f"{method} search completed: {budget.evaluations} evaluations in {budget.elapsed:.1f}s")
+        return {
+            'best_params': best['params'] if best else None,
+            'best_result': best,
+            'results': results,
+            'evaluations': budget.evaluations,
+            'elapsed': budget.elapsed
+        }
+
+    def save_results(self, optimization_results, cash=100000.0, commission=0.001, engine='backtrader',
+                     repository=None):
+        """
+        Store the full-history results of a sweep in one transaction.
+
+        ``cash``, ``commission`` and ``engine`` are the settings the results
+        were produced with; together with the data they identify each run, so
+        saving the same sweep twice adds no duplicate rows. Failed, pruned
+        and short-window (``fidelity`` < 1) results are skipped.
+
+        Returns:
+            Number of rows inserted
+        """
+        if self.data is None:
+            raise OptimizationError("No data loaded for the results being saved")
+        results = [r for r in optimization_results
+                   if 'error' not in r and not r.get('pruned') and r.get('fidelity', 1.0) >= 1.0]
+        keys = self._cache_keys([(None, r['params'], None, None) for r in results], self.data, cash, commission, engine)
+        records = [{
+            'strategy_name': self.strategy_name,
+            'strategy_params': result['params'],
+            'ticker': self.ticker,
+            'start_date': self.data.index[0],
+            'end_date': self.data.index[-1],
+            'final_value': result.get('final_value'),
+            'total_return': result.get('total_return'),
+            'sharpe_ratio': result.get('sharpe_ratio'),
+            'max_drawdown': result.get('max_drawdown'),
+            'result_key': key
+        } for result, (key, _, _) in zip(results, keys)]
+        return (repository or ResultsRepository.shared()).save_many(records)
 
     def collect_results(self, optimized_runs):
+        """Convert the strategies returned by ``cerebro.run()`` into result dicts"""
         optimization_results = []
         for run in optimized_runs:
             for strategy in run:
-                params = strategy.params.strategy_params
-                sharpe = strategy.analyzers.sharpe.get_analysis().get('sharperatio', None)
-                drawdown = strategy.analyzers.drawdown.get_analysis()['max']['drawdown']
-                total_return = strategy.analyzers.returns.get_analysis()['rtot']
-                optimization_results.append({
-                    'params': params,
-                    'sharpe_ratio': sharpe,
-                    'max_drawdown': drawdown,
-                    'total_return': total_return
-                })
+                result = _strategy_metrics(strategy)
+                result['params'] = dict(strategy.params._getkwargs())
+                optimization_results.append(result)
         return optimization_results
 
     def get_best_params(self, optimization_results, metric='sharpe_ratio'):
         df = pd.DataFrame(optimization_results)
+        if 'pruned' in df:
+            df = df[df['pruned'].isna()]
         df = df.dropna(subset=[metric])
         if df.empty:
             raise ValueError("No valid optimization results to select best parameters.")
@@ -0,0 +1,288 @@
+# components/backtesting_module/parameter_space.py
+
+import math
+import numbers
+import operator
+import re
+from bisect import bisect_left, bisect_right
+from itertools import product
+
+import numpy as np
+
+from .exceptions import OptimizationError
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+# The operator read from the other side, for constraints on ``right``
+_FLIPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+
+_CONSTRAINT_PATTERN = re.compile(r'^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$')
+
+
+def _number(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return None
+
+
+class IntRange:
+    """Integers from ``low`` to ``high`` inclusive, ``step`` apart"""
+
+    def __init__(self, low, high, step=1):
+        if step <= 0 or low > high:
+            raise OptimizationError(f"Invalid integer range {low}..{high} step {step}")
+        self.values = list(range(int(low), int(high) + 1, int(step)))
+
+
+class FloatRange:
+    """
+    Floats from ``low`` to ``high`` inclusive, ``step`` apart. Each value is
+    computed from its index and rounded, so ``2, 2.5, 3`` comes out exactly
+    rather than accumulating the step's rounding error.
+    """
+
+    def __init__(self, low, high, step):
+        if step <= 0 or low > high:
+            raise OptimizationError(f"Invalid float range {low}..{high} step {step}")
+        count = math.floor((high - low) / step + 1e-9) + 1
+        self.values = [round(low + i * step, 10) for i in range(count)]
+
+
+class LogRange:
+    """``num`` values from ``low`` to ``high`` spaced evenly on a log scale; rounded and de-duplicated when ``integer``"""
+
+    def __init__(self, low, high, num, integer=False):
+        if low <= 0 or low > high or num < 1:
+            raise OptimizationError(f"Invalid log range {low}..{high} over {num} values")
+        points = np.geomspace(low, high, num)
+        if integer:
+            self.values = sorted({int(round(value)) for value in points})
+        else:
+            self.values = [float(f'{value:.10g}') for value in points]
+
+
+class Categorical:
+    """An ordered list of values of any type"""
+
+    def __init__(self, choices):
+        self.values = list(choices)
+
+
+def dimension_from_spec(spec):
+    """
+    A dimension from a ``ParameterValidator`` range spec: ``{'values': [...]}``
+    is categorical, ``{'min', 'max', 'num', 'scale': 'log'}`` a log range, and
+    ``{'min', 'max', 'step'}`` an integer range when all three are integers
+    and a float range otherwise.
+    """
+    if 'values' in spec:
+        return Categorical(spec['values'])
+    if spec.get('scale') == 'log':
+        return LogRange(spec['min'], spec['max'], spec['num'], integer=spec.get('integer', False))
+    step = spec.get('step', 1)
+    if all(isinstance(value, int) for value in (spec['min'], spec['max'], step)):
+        return IntRange(spec['min'], spec['max'], step)
+    return FloatRange(spec['min'], spec['max'], step)
+
+
+class Constraint:
+    """
+    A relation between a parameter and another parameter or a constant,
+    declared as ``Constraint('short_window', '<', 'long_window')`` or parsed
+    from ``'short_window < long_window'``.
+    """
+
+    def __init__(self, left, op, right):
+        if op not in OPERATORS:
+            raise OptimizationError(f"Unknown constraint operator '{op}'. Expected one of {list(OPERATORS)}")
+        self.left = left
+        self.op = op
+        self.right = right
+
+    @classmethod
+    def parse(cls, text):
+        if isinstance(text, Constraint):
+            return text
+        match = _CONSTRAINT_PATTERN.match(text)
+        if not match:
+            raise OptimizationError(f"Cannot parse constraint '{text}'; expected '<name> <op> <name or number>'")
+        left, op, right = match.groups()
+        number = _number(right)
+        return cls(left, op, right if number is None else number)
+
+    @property
+    def names(self):
+        """Parameters the constraint relates"""
+        return (self.left, self.right) if isinstance(self.right, str) else (self.left,)
+
+    def holds(self, params):
+        right = params[self.right] if isinstance(self.right, str) else self.right
+        return OPERATORS[self.op](params[self.left], right)
+
+    def __repr__(self):
+        return f"{self.left} {self.op} {self.right}"
+
+
+class ParameterSpace:
+    """
+    Discrete parameter space with cross-parameter constraints.
+
+    ``dimensions`` maps each parameter to an ``IntRange``, ``FloatRange``,
+    ``LogRange``, ``Categorical`` or a plain list of values. Only
+    combinations satisfying every constraint are enumerated or sampled:
+    enumeration is a lazy depth-first walk in grid order that drops a branch
+    as soon as a constraint over its assigned parameters fails, so the
+    invalid part of the grid is never built. ``size`` is the number of
+    valid combinations and ``full_size`` that of the unconstrained grid.
+    """
+
+    def __init__(self, dimensions, constraints=()):
+        if not dimensions:
+            raise OptimizationError("Parameter space is empty")
+        self.names = list(dimensions.keys())
+        self.values = {name: list(getattr(dimension, 'values', dimension)) for name, dimension in dimensions.items()}
+        for name, values in self.values.items():
+            if not values:
+                raise OptimizationError(f"No values given for parameter '{name}'")
+
+        self.constraints = []
+        for constraint in map(Constraint.parse, constraints):
+            unknown = [name for name in constraint.names if name not in self.values]
+            if unknown:
+                raise OptimizationError(f"Constraint '{constraint}' refers to unknown parameters {unknown}")
+            if len(constraint.names) == 1:
+                # A bound on a single parameter just narrows its values
+                name = constraint.left
+                self.values[name] = [value for value in self.values[name] if constraint.holds({name: value})]
+                if not self.values[name]:
+                    raise OptimizationError(f"No values of '{name}' satisfy '{constraint}'")
+            else:
+                self.constraints.append(constraint)
+        self._size = None
+
+    @classmethod
+    def of(cls, param_ranges, constraints=()):
+        """``param_ranges`` as a space; a space is returned as is"""
+        if isinstance(param_ranges, ParameterSpace):
+            return param_ranges
+        return cls(param_ranges, constraints)
+
+    @property
+    def full_size(self):
+        return math.prod(len(values) for values in self.values.values())
+
+    @property
+    def size(self):
+        """Number of valid combinations, counted once over the constrained parameters only"""
+        if self._size is None:
+            constrained = [name for name in self.names if any(name in c.names for c in self.constraints)]
+            free = math.prod(len(self.values[name]) for name in self.names if name not in constrained)
+            self._size = self._count(constrained) * free if constrained else free
+        return self._size
+
+    def _count(self, names):
+        """
+        Number of valid assignments of ``names``. The last parameter is not
+        walked: its values satisfying order constraints form one slice of
+        its sorted values, found by bisection for each assignment of the rest.
+        """
+        *outer, last = names
+        checks = [constraint for constraint in self.constraints
+                  if last in constraint.names and all(name in names for name in constraint.names)]
+        values = self.values[last]
+        bounds = []
+        for constraint in checks:
+            if constraint.left == last and constraint.right != last:
+                bounds.append((constraint.op, constraint.right))
+            elif constraint.right == last and constraint.left != last:
+                bounds.append((_FLIPPED[constraint.op], constraint.left))
+        if (len(bounds) < len(checks) or any(op in ('==', '!=') for op, _ in bounds)
+                or not all(isinstance(value, numbers.Real) for value in values)):
+            return sum(1 for _ in self._walk(names))
+
+        ordered = sorted(values)
+        count = 0
+        for params in (self._walk(outer) if outer else [{}]):
+            low, high = 0, len(ordered)
+            for op, other in bounds:
+                bound = params[other] if isinstance(other, str) else other
+                if op == '<':
+                    high = min(high, bisect_left(ordered, bound))
+                elif op == '<=':
+                    high = min(high, bisect_right(ordered, bound))
+                elif op == '>':
+                    low = max(low, bisect_right(ordered, bound))
+                else:
+                    low = max(low, bisect_left(ordered, bound))
+            count += max(0, high - low)
+        return count
+
+    def is_valid(self, params):
+        return all(constraint.holds(params) for constraint in self.constraints)
+
+    def _walk(self, names):
+        """Valid assignments of ``names``, depth first in grid order"""
+        position = {name: depth for depth, name in enumerate(names)}
+        checks = [[] for _ in names]
+        for constraint in self.constraints:
+            if all(name in position for name in constraint.names):
+                checks[max(position[name] for name in constraint.names)].append(constraint)
+
+        params = {}
+
+        def walk(depth):
+            if depth == len(names):
+                yield dict(params)
+                return
+            name = names[depth]
+            for value in self.values[name]:
+                params[name] = value
+                if all(constraint.holds(params) for constraint in checks[depth]):
+                    yield from walk(depth + 1)
+            del params[name]
+
+        return walk(0)
+
+    def iter_valid(self):
+        """Valid combinations, lazily and in grid order"""
+        if not self.constraints:
+            return (dict(zip(self.names, values)) for values in product(*(self.values[n] for n in self.names)))
+        return self._walk(self.names)
+
+    __iter__ = iter_valid
+
+    def grid(self):
+        return list(self.iter_valid())
+
+    def sample(self, rng, count, exclude=()):
+        """Up to ``count`` distinct random valid points not in ``exclude``"""
+        seen = {self.key(params) for params in exclude}
+        available = self.size - len(seen)
+        count = min(count, max(0, available))
+        # Rejection sampling needs about full_size / size draws per point;
+        # enumerate instead when what is left is small or mostly invalid
+        if count and (available <= count * 4 or self.size * 64 < self.full_size):
+            remaining = [params for params in self.iter_valid() if self.key(params) not in seen]
+            return rng.sample(remaining, count)
+
+        points = []
+        while len(points) < count:
+            params = {name: rng.choice(values) for name, values in self.values.items()}
+            key = self.key(params)
+            if key not in seen and self.is_valid(params):
+                seen.add(key)
+                points.append(params)
+        return points
+
+    def key(self, params):
+        return tuple(params[name] for name in self.names)
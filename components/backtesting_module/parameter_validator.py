@@ -3,39 +3,74 @@
 import logging
 from typing import Dict, Any, List
 
+from .parameter_space import Constraint, ParameterSpace, dimension_from_spec
+
 # components/backtesting_module/parameter_validator.py
 
 class ParameterValidator:
     """
     Validates strategy parameters and enforces optimization limits
     """
-    # Default parameter ranges aligned with documentation
+    # Default parameter ranges aligned with documentation, keyed by StrategyAdapter name
     DEFAULT_RANGES = {
         'MovingAverageCrossover': {
             'short_window': {'min': 5, 'max': 15, 'step': 1},  # Documentation specifies smaller range
             'long_window': {'min': 10, 'max': 20, 'step': 1}   # Documentation specifies smaller range
         },
-        'RSIStrategy': {
+        'RSI': {
             'rsi_period': {'min': 5, 'max': 30, 'step': 5},
             'oversold': {'min': 20, 'max': 40, 'step': 5},
             'overbought': {'min': 60, 'max': 80, 'step': 5}
         },
-        'MACDStrategy': {
+        'MACD': {
             'fast_period': {'min': 12, 'max': 16, 'step': 1},
             'slow_period': {'min': 26, 'max': 30, 'step': 1},
             'signal_period': {'min': 9, 'max': 12, 'step': 1}
         },
-        'BollingerBandsStrategy': {
+        'BollingerBands': {
             'window': {'min': 20, 'max': 30, 'step': 5},
             'num_std': {'min': 2, 'max': 3, 'step': 0.5}
         }
     }
+
+    # Cross-parameter rules; combinations breaking them are never generated
+    DEFAULT_CONSTRAINTS = {
+        'MovingAverageCrossover': ['short_window < long_window'],
+        'RSI': ['oversold < overbought'],
+        'MACD': ['fast_period < slow_period']
+    }
+
+    # Strategy class names (as in StrategyManager) accepted for the adapter names above
+    ALIASES = {
+        'RSIStrategy': 'RSI',
+        'MACDStrategy': 'MACD',
+        'BollingerBandsStrategy': 'BollingerBands'
+    }
+
+    @staticmethod
+    def resolve(strategy_name: str) -> str:
+        """
+        The name the default tables are keyed by
+        """
+        return ParameterValidator.ALIASES.get(strategy_name, strategy_name)
+
+    @staticmethod
+    def constraints(strategy_name: str, names: List[str] = None) -> List[Constraint]:
+        """
+        Default constraints of a strategy; only those relating ``names`` alone when given
+        """
+        constraints = map(Constraint.parse,
+                          ParameterValidator.DEFAULT_CONSTRAINTS.get(ParameterValidator.resolve(strategy_name), []))
+        if names is None:
+            return list(constraints)
+        return [constraint for constraint in constraints if all(name in names for name in constraint.names)]
        
     @staticmethod
     def validate_parameters(strategy_name: str, params: Dict[str, Any]) -> bool:
         """
         Validates that parameters are within acceptable ranges
         """
+        strategy_name = ParameterValidator.resolve(strategy_name)
         if strategy_name not in ParameterValidator.DEFAULT_RANGES:
             logging.warning(f"No validation rules for strategy: {strategy_name}")
             return True
@@ -48,25 +83,46 @@ class ParameterValidator:
                         f"Parameter {param} value {value} outside valid range "
                         f"({ranges[param]['min']}-{ranges[param]['max']})"
                     )
+        for constraint in ParameterValidator.constraints(strategy_name, params):
+            if not constraint.holds(params):
+                raise ValueError(f"Parameters {params} violate constraint '{constraint}'")
         return True
 
     @staticmethod
     def generate_grid_parameters(strategy_name: str) -> Dict[str, List[float]]:
         """
-        Generates parameter combinations for grid search within safe limits
+        Generates the candidate values of each parameter for grid search within safe limits
         """
+        strategy_name = ParameterValidator.resolve(strategy_name)
         if strategy_name not in ParameterValidator.DEFAULT_RANGES:
             raise ValueError(f"No grid search parameters defined for {strategy_name}")
-            
+
         ranges = ParameterValidator.DEFAULT_RANGES[strategy_name]
-        grid_params = {}
-        
-        for param, range_info in ranges.items():
-            values = list(range(
-                range_info['min'],
-                range_info['max'] + range_info['step'],
-                range_info['step']
-            ))
-            grid_params[param] = values
-            
-        return grid_params
+        return {param: dimension_from_spec(range_info).values for param, range_info in ranges.items()}
+
+    @staticmethod
+    def parameter_space(strategy_name: str, ranges: Dict[str, Any] = None,
+                        constraints: List[Any] = None) -> ParameterSpace:
+        """
+        Parameter space of a strategy with its cross-parameter constraints.
+
+        ``ranges`` and ``constraints`` default to DEFAULT_RANGES and
+        DEFAULT_CONSTRAINTS. A range is a spec dict (``min``/``max``/``step``,
+        ``min``/``max``/``num`` with ``'scale': 'log'``, or ``values``) or a
+        dimension. The space enumerates and samples only valid combinations;
+        its ``size`` is logged here, before any run.
+        """
+        strategy_name = ParameterValidator.resolve(strategy_name)
+        if ranges is None:
+            if strategy_name not in ParameterValidator.DEFAULT_RANGES:
+                raise ValueError(f"No grid search parameters defined for {strategy_name}")
+            ranges = ParameterValidator.DEFAULT_RANGES[strategy_name]
+        if constraints is None:
+            constraints = ParameterValidator.constraints(strategy_name)
+
+        dimensions = {param: dimension_from_spec(spec) if isinstance(spec, dict) else spec
+                      for param, spec in ranges.items()}
+        space = ParameterSpace(dimensions, constraints)
+        logging.info(f"Parameter space for {strategy_name}: {space.size} valid combinations "
+                     f"of {space.full_size}")
+        return space
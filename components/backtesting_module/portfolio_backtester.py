@@ -0,0 +1,248 @@
+# components/backtesting_module/portfolio_backtester.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from components.data_management_module.alpaca_api import AlpacaAPIClient
+from components.portfolio_management_module.portfolio_manager import PortfolioManager
+from .config import BacktestConfig
+from .exceptions import BacktestError, DataError
+from .vectorized_engine import (
+    EVENT_SIGNAL_STRATEGIES, build_strategy, compute_metrics, periods_per_year, signals_to_target
+)
+
+
+class SimulatedPortfolioManager(PortfolioManager):
+    """``PortfolioManager`` whose total capital is the cash of a backtest instead of the live account"""
+
+    def __init__(self, total_capital):
+        super().__init__()
+        self.total_capital = total_capital
+
+    def get_total_capital(self):
+        return self.total_capital
+
+
+class PortfolioBacktester:
+    """
+    Runs several strategies over several tickers against one cash pool.
+
+    ``strategies`` maps a strategy ID to ``{'strategy_name', 'params',
+    'tickers'}``; each (strategy, ticker) pair is a sleeve trading the
+    strategy's vectorized signals on that ticker. Capital is split with the
+    live rules: ``manager.allocate_capital_to_strategies`` sets each
+    strategy's allocation (``allocations`` then overrides it through
+    ``adjust_allocations_based_on_risk``), ``calculate_order_quantity``
+    sizes every order and ``update_allocation_after_trade`` moves the
+    allocation as positions open and close. Orders are also bounded by the
+    shared cash; an entry neither can cover waits for a later bar while its
+    signal stays long.
+
+    Every ticker is aligned on the union of their bars. Execution follows
+    the vectorized engine: a signal on one bar fills at the ticker's next
+    open, exits before entries on the same bar. Signals are computed once
+    per sleeve and only bars where an order is due are visited; positions
+    and equity then come from cumulative sums over the aligned arrays, so
+    one pass replaces a Cerebro per strategy and ticker.
+    """
+
+    def __init__(self, strategies, start_date=None, end_date=None, cash=BacktestConfig.INITIAL_CASH,
+                 commission=BacktestConfig.DEFAULT_COMMISSION, data=None, manager=None, allocations=None):
+        if not strategies:
+            raise BacktestError("A portfolio backtest needs at least one strategy")
+        self.strategies = {}
+        for strategy_id, spec in strategies.items():
+            if not spec.get('tickers'):
+                raise BacktestError(f"Strategy '{strategy_id}' has no tickers")
+            self.strategies[strategy_id] = {
+                'strategy_name': spec['strategy_name'],
+                'params': dict(spec.get('params') or {}),
+                'tickers': list(spec['tickers'])
+            }
+        self.start_date = start_date
+        self.end_date = end_date
+        self.cash = float(cash)
+        self.commission = float(commission)
+        self.data = dict(data or {})
+        self.manager = manager or SimulatedPortfolioManager(self.cash)
+        self.allocations = allocations
+        self.results = None
+        self.alpaca_client = AlpacaAPIClient()
+
+    @property
+    def tickers(self):
+        """Every ticker traded, in order of first appearance"""
+        return list(dict.fromkeys(ticker for spec in self.strategies.values() for ticker in spec['tickers']))
+
+    def load_data(self):
+        """
+        Fetches historical data from the Alpaca API for tickers without data.
+        """
+        for ticker in self.tickers:
+            if ticker in self.data:
+                continue
+            logging.info(f"Fetching data for {ticker} from {self.start_date} to {self.end_date}")
+            data = self.alpaca_client.fetch_historical_data(ticker, self.start_date, self.end_date,
+                                                            timeframe=BacktestConfig.DEFAULT_TIMEFRAME)
+            if data.empty:
+                raise DataError(f"No data found for ticker {ticker} between {self.start_date} and {self.end_date}")
+            data = data.rename(columns={'t': 'datetime', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close',
+                                        'v': 'volume'}).set_index('datetime')
+            data.index = pd.to_datetime(data.index)
+            self.data[ticker] = data
+
+    def run(self):
+        """
+        Run the portfolio.
+
+        Returns:
+            Dict with the combined ``equity`` Series, ``strategy_equity``
+            (one column per strategy, its allocation plus its profit and
+            loss), ``positions`` (one column per strategy and ticker), the
+            ``trades`` DataFrame, the starting ``allocations`` and
+            ``metrics`` for the ``portfolio`` and each of the ``strategies``
+        """
+        if any(ticker not in self.data for ticker in self.tickers):
+            self.load_data()
+        for ticker in self.tickers:
+            missing_columns = [col for col in ('open', 'close') if col not in self.data[ticker].columns]
+            if missing_columns:
+                raise DataError(f"Missing required columns for {ticker}: {missing_columns}")
+
+        timeline = self.data[self.tickers[0]].index
+        for ticker in self.tickers[1:]:
+            timeline = timeline.union(self.data[ticker].index)
+        n = len(timeline)
+        opens, closes = {}, {}
+        for ticker in self.tickers:
+            aligned = self.data[ticker][['open', 'close']].reindex(timeline)
+            # NaN marks a bar the ticker does not trade on
+            opens[ticker] = aligned['open'].to_numpy(dtype=np.float64)
+            closes[ticker] = aligned['close'].ffill().fillna(0.0).to_numpy(dtype=np.float64)
+
+        sleeves = [(strategy_id, ticker) for strategy_id, spec in self.strategies.items() for ticker in spec['tickers']]
+        desired = np.zeros((len(sleeves), n))
+        for index, (strategy_id, ticker) in enumerate(sleeves):
+            spec = self.strategies[strategy_id]
+            signals = build_strategy(spec['strategy_name'], spec['params']).generate_signals(self.data[ticker])
+            signal_mode = 'event' if spec['strategy_name'] in EVENT_SIGNAL_STRATEGIES else 'state'
+            target = pd.Series(signals_to_target(signals['signal'], signal_mode), index=self.data[ticker].index)
+            desired[index, 1:] = target.reindex(timeline).ffill().fillna(0.0).to_numpy()[:-1]
+
+        self.manager.allocate_capital_to_strategies(list(self.strategies))
+        if self.allocations:
+            self.manager.adjust_allocations_based_on_risk(self.allocations)
+        allocations = {strategy_id: self.manager.get_strategy_allocation(strategy_id) for strategy_id in self.strategies}
+
+        logging.info(f"Starting portfolio backtest of {len(self.strategies)} strategies on "
+                     f"{len(self.tickers)} tickers over {n} bars")
+        fills = self._simulate(sleeves, desired, opens, closes)
+
+        position_delta = np.zeros((len(sleeves), n))
+        cash_flow = np.zeros((len(sleeves), n))
+        for bar, sleeve, size, price, commission in fills:
+            position_delta[sleeve, bar] += size
+            cash_flow[sleeve, bar] -= size * price + commission
+        positions = np.cumsum(position_delta, axis=1)
+        pnl = np.cumsum(cash_flow, axis=1) + positions * np.array([closes[ticker] for _, ticker in sleeves])
+
+        owners = np.array([strategy_id for strategy_id, _ in sleeves])
+        strategy_equity = pd.DataFrame({
+            strategy_id: allocation + pnl[owners == strategy_id].sum(axis=0)
+            for strategy_id, allocation in allocations.items()
+        }, index=timeline)
+        equity = pd.Series(self.cash + pnl.sum(axis=0), index=timeline, name='equity')
+        trades = pd.DataFrame({
+            'datetime': timeline[[fill[0] for fill in fills]],
+            'strategy_id': [sleeves[fill[1]][0] for fill in fills],
+            'ticker': [sleeves[fill[1]][1] for fill in fills],
+            'size': [fill[2] for fill in fills],
+            'price': [fill[3] for fill in fills],
+            'commission': [fill[4] for fill in fills]
+        })
+
+        bars_per_year = periods_per_year(timeline)
+        portfolio_metrics = compute_metrics(equity.to_numpy(), self.cash, bars_per_year)
+        portfolio_metrics['trades'] = len(trades)
+        strategy_metrics = {}
+        for strategy_id, allocation in allocations.items():
+            metrics = {}
+            if allocation > 0:
+                metrics = compute_metrics(strategy_equity[strategy_id].to_numpy(), allocation, bars_per_year)
+            metrics['trades'] = int((trades['strategy_id'] == strategy_id).sum())
+            strategy_metrics[strategy_id] = metrics
+
+        self.results = {
+            'equity': equity,
+            'strategy_equity': strategy_equity,
+            'positions': pd.DataFrame(positions.T, index=timeline, columns=pd.MultiIndex.from_tuples(sleeves)),
+            'trades': trades,
+            'allocations': allocations,
+            'metrics': {'portfolio': portfolio_metrics, 'strategies': strategy_metrics}
+        }
+        logging.info(f"Portfolio backtest completed. Final portfolio value: {portfolio_metrics['final_value']}")
+        return self.results
+
+    def _simulate(self, sleeves, desired, opens, closes):
+        """
+        Fills ``(bar, sleeve, size, price, commission)`` for the per-sleeve
+        targets in ``desired``, visiting only bars where a target changes or
+        an order is still waiting
+        """
+        n = desired.shape[1]
+        changes = np.diff(desired, axis=1, prepend=0.0) != 0
+        change_bars = iter(np.flatnonzero(changes.any(axis=0)))
+        next_change = next(change_bars, n)
+        held = [0] * len(sleeves)
+        pending = {}  # sleeve -> True to enter, False to exit
+        cash = self.cash
+        fills = []
+
+        bar = next_change
+        while bar < n:
+            if bar == next_change:
+                for sleeve in np.flatnonzero(changes[:, bar]):
+                    long = bool(desired[sleeve, bar] > 0)
+                    if long == (held[sleeve] > 0):
+                        pending.pop(sleeve, None)
+                    else:
+                        pending[sleeve] = long
+                next_change = next(change_bars, n)
+
+            # Exits first, so their proceeds can fund entries on the same bar
+            for sleeve, long in sorted(pending.items(), key=lambda item: (item[1], item[0])):
+                strategy_id, ticker = sleeves[sleeve]
+                price = opens[ticker][bar]
+                if np.isnan(price):
+                    continue
+                # Allocations move by the net cash of each trade, commission included,
+                # so a strategy's allocation is the cash it has left to trade with
+                if long:
+                    size = self.manager.calculate_order_quantity(
+                        strategy_id, closes[ticker][bar - 1] * (1 + self.commission), 'BUY')
+                    commission = size * price * self.commission
+                    if size <= 0 or size * price + commission > cash:
+                        continue
+                    cash -= size * price + commission
+                    self.manager.update_allocation_after_trade(strategy_id, 'BUY', price * (1 + self.commission), size)
+                    held[sleeve] = size
+                else:
+                    size = -self.manager.calculate_order_quantity(strategy_id, price, 'SELL',
+                                                                  existing_position=held[sleeve])
+                    commission = -size * price * self.commission
+                    cash += -size * price - commission
+                    self.manager.update_allocation_after_trade(strategy_id, 'SELL', price * (1 - self.commission), -size)
+                    held[sleeve] = 0
+                self.manager.record_trade(strategy_id, ticker, size, price)
+                fills.append((bar, sleeve, size, price, commission))
+                del pending[sleeve]
+
+            bar = bar + 1 if pending else next_change
+        return fills
+
+    def get_performance_metrics(self):
+        if self.results is None:
+            raise BacktestError("Run the portfolio backtest before requesting its metrics")
+        return self.results['metrics']
@@ -1,7 +1,10 @@
 # components/backtesting_module/resource_monitor.py
 
+import os
 import psutil
 import logging
+from .config import BacktestConfig
+from .scheduler import ResourceScheduler
 
 class ResourceMonitor:
     """
@@ -9,17 +12,16 @@ class ResourceMonitor:
     """
     
     @staticmethod
-    def check_resources():
+    def check_resources(timeout=None):
         """
-        Checks if system has enough resources for backtesting.
+        Waits until the system has headroom for backtesting.
+
+        Load from other processes must be under ``BacktestConfig.CPU_THRESHOLD``
+        and memory under ``MEMORY_THRESHOLD``; see ``ResourceScheduler.admit``.
+        Raises ``ResourceWarning`` if there is still no headroom after
+        ``timeout`` seconds (default ``BacktestConfig.ADMISSION_TIMEOUT``).
         """
-        cpu_percent = psutil.cpu_percent()
-        memory_percent = psutil.virtual_memory().percent
-        
-        if cpu_percent > 80 or memory_percent > 80:
-            logging.warning(f"System resources stressed: CPU {cpu_percent}%, Memory {memory_percent}%")
-            raise ResourceWarning("System resources are too constrained for backtesting")
-            
+        ResourceScheduler.shared().admit(timeout)
         return True
 
     @staticmethod
@@ -31,4 +33,29 @@ class ResourceMonitor:
             'cpu_percent': psutil.cpu_percent(),
             'memory_percent': psutil.virtual_memory().percent,
             'disk_percent': psutil.disk_usage('/').percent
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def get_worker_count(max_workers=None, worker_memory_mb=None):
+        """
+        Number of worker processes the machine can take right now.
+
+        Starts from the CPUs left idle under ``BacktestConfig.CPU_THRESHOLD``
+        and caps the result by the available memory divided by the expected
+        footprint of one worker. Always at least 1. CPU load is sampled over
+        ``BacktestConfig.CPU_SAMPLE_INTERVAL`` seconds; without an interval
+        psutil reports 0.0 on the first call in a process.
+        """
+        cpu_count = os.cpu_count() or 1
+        worker_memory_mb = worker_memory_mb or BacktestConfig.WORKER_MEMORY_MB
+        max_workers = max_workers or BacktestConfig.MAX_WORKERS or cpu_count
+
+        cpu_percent = psutil.cpu_percent(interval=BacktestConfig.CPU_SAMPLE_INTERVAL)
+        cpu_headroom = max(0.0, BacktestConfig.CPU_THRESHOLD - cpu_percent) / 100
+        by_cpu = max(1, round(cpu_count * cpu_headroom))
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+        by_memory = max(1, int(available_mb // worker_memory_mb))
+
+        workers = max(1, min(max_workers, cpu_count, by_cpu, by_memory))
+        logging.info(f"Using {workers} worker(s): {cpu_count} CPUs at {cpu_percent}%, {available_mb:.0f} MB available")
+        return workers
@@ -0,0 +1,205 @@
+# components/backtesting_module/result_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from .config import BacktestConfig
+
+# Bump when the fill, metric or result-format rules of either engine change,
+# so results computed by older code are never served
+ENGINE_VERSION = 1
+
+# SQLite limit on bound variables per statement, kept well below the maximum
+_MAX_VARIABLES = 500
+
+
+def data_fingerprint(data):
+    """Content hash of an OHLCV DataFrame: index, column names and values"""
+    index = pd.DatetimeIndex(data.index)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(data.columns), str(index.tz))).encode())
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    digest.update(np.ascontiguousarray(index.values.astype('datetime64[ns]').view(np.int64)).tobytes())
+    digest.update(np.ascontiguousarray(data.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def normalize_params(params):
+    """Parameters in a canonical form: sorted keys, plain Python numbers, 2.0 == 2"""
+    normalized = {}
+    for name, value in sorted((params or {}).items()):
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        normalized[name] = value
+    return normalized
+
+
+def engine_version(engine):
+    if engine == 'backtrader':
+        return f"backtrader-{bt.__version__}-{ENGINE_VERSION}"
+    return f"{engine}-{ENGINE_VERSION}"
+
+
+def result_key(kind, strategy_name, params, ticker, timeframe, start_date, end_date, fingerprint, engine,
+               **settings):
+    """
+    Cache key for one run.
+
+    Returns:
+        Tuple ``(key, identity)``. ``identity`` covers everything except the
+        data fingerprint, so entries for the same run on older data can be
+        found and dropped.
+    """
+    identity = {
+        'kind': kind,
+        'strategy_name': strategy_name,
+        'params': normalize_params(params),
+        'ticker': ticker,
+        'timeframe': timeframe,
+        'start_date': str(start_date),
+        'end_date': str(end_date),
+        'engine': engine_version(engine),
+        'settings': normalize_params(settings)
+    }
+    identity_hash = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+    key = hashlib.sha256(f"{identity_hash}:{fingerprint}".encode()).hexdigest()
+    return key, identity_hash
+
+
+class ResultCache:
+    """
+    Content-addressed store of backtest results.
+
+    Entries are keyed by a hash of the strategy, its normalized parameters,
+    the instrument, timeframe and date range, a fingerprint of the price data
+    and the engine version. Changed data produces a different key, and
+    storing the new result removes the entries it supersedes.
+    """
+
+    def __init__(self, db_path=BacktestConfig.RESULT_CACHE_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS result_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        identity TEXT NOT NULL,
+                        data_fingerprint TEXT NOT NULL,
+                        strategy_name TEXT,
+                        ticker TEXT,
+                        engine TEXT,
+                        created_at TEXT NOT NULL,
+                        result BLOB NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_result_cache_identity ON result_cache (identity)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_result_cache_ticker ON result_cache (ticker)')
+            self._initialized = True
+        return conn
+
+    def get(self, key):
+        """Cached result for ``key``, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Dict of key to cached result for the keys that are present"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if not keys:
+            return found
+        conn = self._connect()
+        try:
+            for offset in range(0, len(keys), _MAX_VARIABLES):
+                batch = keys[offset:offset + _MAX_VARIABLES]
+                rows = conn.execute(
+                    f"SELECT cache_key, result FROM result_cache WHERE cache_key IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for key, blob in rows:
+                    found[key] = pickle.loads(blob)
+        finally:
+            conn.close()
+        return found
+
+    def latest(self, identity):
+        """
+        ``(key, result)`` of the newest entry for a run identity on any data,
+        or None. Storing a result drops the entries for the same identity on
+        other data, so this is the result on the data seen most recently.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT cache_key, result FROM result_cache WHERE identity = ? ORDER BY created_at DESC LIMIT 1',
+                (identity,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row[0], pickle.loads(row[1])) if row else None
+
+    def put(self, key, identity, fingerprint, result, strategy_name=None, ticker=None, engine=None):
+        self.put_many([(key, identity, fingerprint, result, strategy_name, ticker, engine)])
+
+    def put_many(self, entries):
+        """
+        Store ``(key, identity, fingerprint, result, strategy_name, ticker, engine)``
+        entries in one transaction, replacing entries for the same run on other data.
+        """
+        if not entries:
+            return
+        created_at = datetime.utcnow().isoformat()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'DELETE FROM result_cache WHERE identity = ? AND data_fingerprint != ?',
+                    [(identity, fingerprint) for _, identity, fingerprint, *_ in entries]
+                )
+                conn.executemany('''
+                    INSERT OR REPLACE INTO result_cache (
+                        cache_key, identity, data_fingerprint, strategy_name, ticker, engine, created_at, result
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (key, identity, fingerprint, strategy_name, ticker, engine, created_at,
+                     pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+                    for key, identity, fingerprint, result, strategy_name, ticker, engine in entries
+                ])
+        finally:
+            conn.close()
+
+    def invalidate(self, ticker=None, strategy_name=None):
+        """Drop cached results for a ticker and/or strategy (everything when neither is given)"""
+        clauses, args = [], []
+        if ticker is not None:
+            clauses.append('ticker = ?')
+            args.append(ticker)
+        if strategy_name is not None:
+            clauses.append('strategy_name = ?')
+            args.append(strategy_name)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        conn = self._connect()
+        try:
+            with conn:
+                removed = conn.execute(f"DELETE FROM result_cache{where}", args).rowcount
+        finally:
+            conn.close()
+        logging.info(f"Invalidated {removed} cached backtest results")
+        return removed
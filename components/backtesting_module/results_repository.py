@@ -0,0 +1,256 @@
+# components/backtesting_module/results_repository.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .capture import TRADE_DTYPES, RunCapture, pack, unpack
+from .config import BacktestConfig
+from .exceptions import BacktestError
+from .search import MINIMIZE_METRICS
+
+METRIC_COLUMNS = ('final_value', 'total_return', 'sharpe_ratio', 'max_drawdown')
+
+RECORD_COLUMNS = ('strategy_name', 'strategy_params', 'ticker', 'start_date', 'end_date') + METRIC_COLUMNS + ('result_key',)
+
+
+class ResultsRepository:
+    """
+    Backtest results table behind one long-lived connection.
+
+    Every writer and reader of ``backtest_results`` goes through this class:
+    the schema and indexes are created once per process, writes are batched
+    into a single transaction, and top-N queries are sorted and limited by
+    SQLite rather than in pandas. ``shared()`` hands out one repository per
+    database file so callers do not open their own connections.
+
+    A run's ``RunCapture`` is stored next to its row under the same
+    ``result_key``: the equity curve as one compressed blob and the trade
+    log as compressed pages, so a page of trades is read without loading
+    the whole log.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path=BacktestConfig.DB_PATH):
+        self.db_path = db_path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls, db_path=BacktestConfig.DB_PATH):
+        """The process-wide repository for ``db_path``"""
+        with cls._instances_lock:
+            if db_path not in cls._instances:
+                cls._instances[db_path] = cls(db_path)
+            return cls._instances[db_path]
+
+    def _connection(self):
+        # A connection must not be used across fork(); reopen in a child process
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._create_schema(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _create_schema(conn):
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS backtest_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    strategy_name TEXT,
+                    strategy_params TEXT,
+                    ticker TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    final_value REAL,
+                    total_return REAL,
+                    sharpe_ratio REAL,
+                    max_drawdown REAL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    result_key TEXT
+                )
+            ''')
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(backtest_results)')]
+            if 'result_key' not in columns:
+                conn.execute('ALTER TABLE backtest_results ADD COLUMN result_key TEXT')
+            conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_backtest_results_key ON backtest_results (result_key)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_backtest_results_strategy_ticker_time '
+                         'ON backtest_results (strategy_name, ticker, timestamp)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_backtest_results_timestamp ON backtest_results (timestamp)')
+            for metric in METRIC_COLUMNS:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS idx_backtest_results_{metric} ON backtest_results ({metric})')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS backtest_curves (
+                    result_key TEXT PRIMARY KEY,
+                    points INTEGER,
+                    stride INTEGER,
+                    trade_count INTEGER,
+                    page_size INTEGER,
+                    curve BLOB
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS backtest_trade_pages (
+                    result_key TEXT,
+                    page INTEGER,
+                    trades BLOB,
+                    PRIMARY KEY (result_key, page)
+                )
+            ''')
+
+    def save(self, record):
+        """Store one result record; returns the number of rows inserted (0 for a known ``result_key``)"""
+        return self.save_many([record])
+
+    def save_many(self, records):
+        """
+        Store result records in one transaction.
+
+        Each record is a dict with the ``RECORD_COLUMNS`` keys; ``strategy_params``
+        may be a dict. Records whose ``result_key`` is already stored are skipped.
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = [self._row(record) for record in records]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            before = conn.total_changes
+            with conn:
+                conn.executemany(f'''
+                    INSERT OR IGNORE INTO backtest_results ({', '.join(RECORD_COLUMNS)})
+                    VALUES ({', '.join('?' * len(RECORD_COLUMNS))})
+                ''', rows)
+            inserted = conn.total_changes - before
+        logging.info(f"Saved {inserted} of {len(rows)} backtest results to {self.db_path}")
+        return inserted
+
+    def save_capture(self, result_key, capture, page_size=BacktestConfig.TRADE_PAGE_SIZE):
+        """
+        Store the equity curve and trade log of the run saved under ``result_key``.
+
+        Returns:
+            False when a capture is already stored for the key
+        """
+        pages = capture.trade_pages(page_size)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                inserted = conn.execute(
+                    'INSERT OR IGNORE INTO backtest_curves VALUES (?, ?, ?, ?, ?, ?)',
+                    (result_key, len(capture.curve['time']), capture.stride, capture.trade_count, page_size,
+                     pack(capture.curve))
+                ).rowcount
+                if inserted:
+                    conn.executemany('INSERT OR REPLACE INTO backtest_trade_pages VALUES (?, ?, ?)',
+                                     [(result_key, page, blob) for page, blob in enumerate(pages)])
+        return bool(inserted)
+
+    def get_equity(self, result_key):
+        """Equity, cash and position by bar for ``result_key``, or None"""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT curve, stride FROM backtest_curves WHERE result_key = ?', (result_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return RunCapture(unpack(row[0]), {}, row[1]).equity
+
+    def get_trades(self, result_key, offset=0, limit=100):
+        """
+        ``limit`` closed trades of ``result_key`` from ``offset`` on, reading
+        only the pages they are stored in.
+
+        Returns:
+            Tuple of a DataFrame of trades and the total number of trades,
+            or None for a key without a capture
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute('SELECT trade_count, page_size FROM backtest_curves WHERE result_key = ?',
+                               (result_key,)).fetchone()
+            if row is None:
+                return None
+            total, page_size = row
+            end = min(offset + limit, total)
+            blobs = []
+            if end > offset:
+                blobs = conn.execute(
+                    'SELECT trades FROM backtest_trade_pages WHERE result_key = ? AND page BETWEEN ? AND ? '
+                    'ORDER BY page', (result_key, offset // page_size, (end - 1) // page_size)
+                ).fetchall()
+        pages = [unpack(blob) for (blob,) in blobs]
+        trades = {field: np.concatenate([page[field] for page in pages]) if pages else np.empty(0, dtype=dtype)
+                  for field, dtype in TRADE_DTYPES.items()}
+        first = offset % page_size
+        return RunCapture({}, trades).trades_frame(first, max(0, end - offset)), total
+
+    @staticmethod
+    def _row(record):
+        row = []
+        for column in RECORD_COLUMNS:
+            value = record.get(column)
+            if column == 'strategy_params' and not isinstance(value, str):
+                value = json.dumps(value or {}, sort_keys=True, default=str)
+            elif column in ('start_date', 'end_date') and value is not None:
+                value = value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value)
+            elif column in METRIC_COLUMNS and value is not None:
+                value = float(value)
+            row.append(value)
+        return row
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            results = pd.read_sql_query(sql, self._connection(), params=params)
+        if not results.empty:
+            results['strategy_params'] = results['strategy_params'].apply(json.loads)
+        return results
+
+    def recent(self, limit=10):
+        """Most recently stored results"""
+        return self._query('SELECT * FROM backtest_results ORDER BY timestamp DESC, id DESC LIMIT ?', (limit,))
+
+    def get(self, backtest_id):
+        return self._query('SELECT * FROM backtest_results WHERE id = ?', (backtest_id,))
+
+    def top(self, metric='sharpe_ratio', n=10, strategy_name=None, ticker=None):
+        """
+        Best ``n`` results by ``metric``, sorted and limited in SQLite.
+
+        ``max_drawdown`` ranks lowest first, every other metric highest
+        first; rows without a value for the metric are left out.
+        """
+        if metric not in METRIC_COLUMNS:
+            raise BacktestError(f"Unknown metric '{metric}'. Expected one of {METRIC_COLUMNS}")
+        clauses, params = [f'{metric} IS NOT NULL'], []
+        if strategy_name is not None:
+            clauses.append('strategy_name = ?')
+            params.append(strategy_name)
+        if ticker is not None:
+            clauses.append('ticker = ?')
+            params.append(ticker)
+        order = 'ASC' if metric in MINIMIZE_METRICS else 'DESC'
+        return self._query(
+            f"SELECT * FROM backtest_results WHERE {' AND '.join(clauses)} ORDER BY {metric} {order} LIMIT ?",
+            params + [n]
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
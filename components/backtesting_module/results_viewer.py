@@ -1,44 +1,31 @@
 # components/backtesting_module/results_viewer.py
 
-import pandas as pd
-import sqlite3
-import json
-from datetime import datetime
+from .config import BacktestConfig
+from .results_repository import ResultsRepository
 
 class ResultsViewer:
     """
     Handles retrieval and visualization of backtest results.
     """
-    
-    def __init__(self):
-        self.db_path = 'components/backtesting_module/results/backtest_results.db'
-    
+
+    def __init__(self, db_path=BacktestConfig.DB_PATH):
+        self.db_path = db_path
+        self.repository = ResultsRepository.shared(db_path)
+
     def get_results(self, limit=10):
         """
         Retrieves the most recent backtest results.
         """
-        conn = sqlite3.connect(self.db_path)
-        query = """
-            SELECT * FROM backtest_results 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        """
-        results = pd.read_sql_query(query, conn, params=(limit,))
-        conn.close()
-        
-        # Parse strategy parameters from JSON
-        results['strategy_params'] = results['strategy_params'].apply(json.loads)
-        return results
+        return self.repository.recent(limit)
 
     def get_specific_result(self, backtest_id):
         """
         Retrieves a specific backtest result.
         """
-        conn = sqlite3.connect(self.db_path)
-        query = "SELECT * FROM backtest_results WHERE id = ?"
-        result = pd.read_sql_query(query, conn, params=(backtest_id,))
-        conn.close()
-        
-        if not result.empty:
-            result['strategy_params'] = result['strategy_params'].apply(json.loads)
-        return result
\ No newline at end of file
+        return self.repository.get(backtest_id)
+
+    def get_top_results(self, metric='sharpe_ratio', n=10, strategy_name=None, ticker=None):
+        """
+        Retrieves the best results by a metric (lowest first for max_drawdown).
+        """
+        return self.repository.top(metric, n, strategy_name, ticker)
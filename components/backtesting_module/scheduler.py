@@ -0,0 +1,244 @@
+# components/backtesting_module/scheduler.py
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import psutil
+
+from .config import BacktestConfig
+
+_DONE = object()
+
+
+def lower_priority(niceness=None):
+    """
+    Give the calling process a lower CPU and I/O priority than the live data
+    and execution processes, so research work yields to trading under load.
+    Worker pools call this in their initializer. A platform or permission
+    that does not allow it leaves the priority unchanged.
+    """
+    niceness = BacktestConfig.WORKER_NICE if niceness is None else niceness
+    process = psutil.Process()
+    try:
+        if process.nice() < niceness:
+            process.nice(niceness)
+        if hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+            process.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except (psutil.Error, OSError, ValueError) as e:
+        logging.debug(f"Could not lower the priority of process {process.pid}: {e}")
+
+
+class ResourceScheduler:
+    """
+    Admission and concurrency control for backtests and optimizations.
+
+    Load is sampled as CPU use by everything except this process and its
+    workers, plus system memory. New work is admitted once that load is under
+    ``BacktestConfig.CPU_THRESHOLD``/``MEMORY_THRESHOLD`` instead of being
+    refused, and while a pool runs the number of tasks in flight shrinks when
+    other processes (the live trading stack) need the CPU or memory and grows
+    back when they do not. ``shared()`` hands out one scheduler per process.
+    """
+
+    HISTORY_SIZE = 100
+    MAX_SAMPLE_AGE = 5.0  # seconds
+    SAMPLE_REFRESH = 1.0  # seconds a sample is reused while a pool runs
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cpu_threshold=None, memory_threshold=None, worker_memory_mb=None,
+                 sample_interval=None, poll_interval=None):
+        self.cpu_threshold = cpu_threshold or BacktestConfig.CPU_THRESHOLD
+        self.memory_threshold = memory_threshold or BacktestConfig.MEMORY_THRESHOLD
+        self.worker_memory_mb = worker_memory_mb or BacktestConfig.WORKER_MEMORY_MB
+        self.sample_interval = sample_interval or BacktestConfig.CPU_SAMPLE_INTERVAL
+        self.poll_interval = poll_interval or BacktestConfig.ADMISSION_POLL_INTERVAL
+        self.cpu_count = os.cpu_count() or 1
+        self.process = psutil.Process()
+        self._processes = {}
+        self._sampled_at = float('-inf')
+        self._last_sample = None
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=self.HISTORY_SIZE)
+
+    @classmethod
+    def shared(cls):
+        """The process-wide scheduler"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _own_processes(self):
+        """This process and its workers, keeping each ``Process`` so its CPU counter persists"""
+        try:
+            current = [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            current = [self.process]
+        processes = {}
+        for process in current:
+            processes[process.pid] = self._processes.get(process.pid, process)
+        self._processes = processes
+        return list(processes.values())
+
+    def sample(self, wait=True):
+        """
+        Current load.
+
+        With ``wait`` False the CPU counters are read at once, covering the
+        time since the previous sample, instead of sleeping for a fresh
+        reading; the first sample always waits.
+
+        Returns:
+            Dict with ``cpu_percent`` (whole machine), ``own_cpu_percent``
+            (this process tree), ``external_cpu_percent`` (everything else),
+            ``memory_percent``, ``available_mb`` and ``rss_mb`` (this process tree)
+        """
+        with self._lock:
+            processes = self._own_processes()
+            # CPU counters report usage since their previous reading: restart them
+            # when that reading is missing or old, and make every reading span at
+            # least sample_interval so it is not dominated by noise
+            age = time.monotonic() - self._sampled_at
+            if age > self.MAX_SAMPLE_AGE and (wait or self._last_sample is None):
+                for process in processes:
+                    try:
+                        process.cpu_percent(None)
+                    except psutil.Error:
+                        pass
+                psutil.cpu_percent(None)
+                time.sleep(self.sample_interval)
+            elif wait:
+                time.sleep(max(0.0, self.sample_interval - age))
+            system_cpu = psutil.cpu_percent(None)
+            own_cpu, rss = 0.0, 0
+            for process in processes:
+                try:
+                    own_cpu += process.cpu_percent(None)
+                    rss += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            self._sampled_at = time.monotonic()
+        own_cpu = min(own_cpu / self.cpu_count, system_cpu)
+        memory = psutil.virtual_memory()
+        sample = {
+            'cpu_percent': system_cpu,
+            'own_cpu_percent': own_cpu,
+            'external_cpu_percent': system_cpu - own_cpu,
+            'memory_percent': memory.percent,
+            'available_mb': memory.available / (1024 * 1024),
+            'total_mb': memory.total / (1024 * 1024),
+            'rss_mb': rss / (1024 * 1024)
+        }
+        with self._lock:
+            self._last_sample = sample
+        return sample
+
+    def recent_sample(self, max_age=None):
+        """
+        The last sample while it is younger than ``max_age`` seconds
+        (``SAMPLE_REFRESH``), otherwise a new one taken without sleeping
+        """
+        max_age = self.SAMPLE_REFRESH if max_age is None else max_age
+        with self._lock:
+            last, sampled_at = self._last_sample, self._sampled_at
+        if last is not None and time.monotonic() - sampled_at < max_age:
+            return last
+        return self.sample(wait=False)
+
+    def has_headroom(self, sample=None):
+        sample = sample or self.sample()
+        return (sample['external_cpu_percent'] <= self.cpu_threshold
+                and sample['memory_percent'] <= self.memory_threshold)
+
+    def admit(self, timeout=None, name='task'):
+        """
+        Wait until there is headroom for new research work.
+
+        Returns:
+            The admitting sample
+
+        Raises:
+            ResourceWarning: Still no headroom after ``timeout`` seconds
+        """
+        timeout = BacktestConfig.ADMISSION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            sample = self.sample()
+            if self.has_headroom(sample):
+                if waited:
+                    logging.info(f"Admitted {name} after waiting for resources")
+                return sample
+            if time.monotonic() >= deadline:
+                logging.warning(f"No resources for {name}: CPU {sample['external_cpu_percent']:.0f}% used by "
+                                f"other processes, memory {sample['memory_percent']:.0f}%")
+                raise ResourceWarning("System resources are too constrained for backtesting")
+            if not waited:
+                logging.info(f"Waiting for resources before starting {name}")
+                waited = True
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+    def target_workers(self, active, limit, sample=None):
+        """
+        Tasks to keep in flight given ``active`` running ones, between 1 and ``limit``.
+
+        CPU: the CPUs left under the threshold by other processes. Memory:
+        the running tasks plus as many more as fit, at ``worker_memory_mb``
+        each, in the memory left under the threshold (fewer when over it).
+        Without a ``sample`` the cached one from ``recent_sample`` is used,
+        so calling this after every task costs no sampling delay.
+        """
+        sample = sample or self.recent_sample()
+        cpu_free = (self.cpu_threshold - sample['external_cpu_percent']) / 100 * self.cpu_count
+        by_cpu = int(cpu_free + 0.5)
+        reserve_mb = sample['total_mb'] * (100 - self.memory_threshold) / 100
+        by_memory = active + int((sample['available_mb'] - reserve_mb) // self.worker_memory_mb)
+        return max(1, min(limit, by_cpu, by_memory))
+
+    def imap_unordered(self, pool, func, items, limit):
+        """
+        ``pool.imap_unordered`` whose number of tasks in flight follows
+        ``target_workers``, re-evaluated whenever a task completes.
+
+        ``limit`` is the pool size. Results are yielded in completion order;
+        an exception raised by ``func`` is re-raised here.
+        """
+        results = queue.Queue()
+        items = iter(items)
+        in_flight, target, exhausted, peak = 0, limit, False, 0
+        while True:
+            while not exhausted and in_flight < target:
+                item = next(items, _DONE)
+                if item is _DONE:
+                    exhausted = True
+                    break
+                pool.apply_async(func, (item,), callback=lambda result: results.put((True, result)),
+                                 error_callback=lambda error: results.put((False, error)))
+                in_flight += 1
+                peak = max(peak, in_flight)
+            if in_flight == 0:
+                break
+            ok, value = results.get()
+            in_flight -= 1
+            if not ok:
+                raise value
+            if not exhausted:
+                new_target = self.target_workers(in_flight + 1, limit)
+                if new_target != target:
+                    logging.info(f"Adjusting concurrency from {target} to {new_target} task(s)")
+                    with self._lock:
+                        self._history.append({'time': time.time(), 'from': target, 'to': new_target})
+                    target = new_target
+            yield value
+        logging.debug(f"Pool run finished with at most {peak} task(s) in flight")
+
+    def get_history(self):
+        """Recent concurrency changes, oldest first"""
+        with self._lock:
+            return list(self._history)
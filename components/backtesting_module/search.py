@@ -0,0 +1,285 @@
+# components/backtesting_module/search.py
+
+import logging
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+
+from .exceptions import OptimizationError
+from .parameter_space import ParameterSpace
+
+# Metrics where a lower value is better
+MINIMIZE_METRICS = ('max_drawdown',)
+
+
+class SearchBudget:
+    """
+    Evaluation and wall-clock limits shared by every search strategy.
+
+    One evaluation is one backtest, whatever its fidelity.
+    """
+
+    def __init__(self, max_evaluations=None, max_seconds=None):
+        self.max_evaluations = max_evaluations
+        self.max_seconds = max_seconds
+        self.evaluations = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        """Evaluations still allowed (None when only time is limited)"""
+        if self.max_evaluations is None:
+            return None
+        return max(0, self.max_evaluations - self.evaluations)
+
+    def exhausted(self):
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return True
+        return self.max_seconds is not None and self.elapsed >= self.max_seconds
+
+    def take(self, count):
+        """Number of evaluations out of ``count`` that may run now"""
+        if self.exhausted():
+            return 0
+        remaining = self.remaining()
+        return count if remaining is None else min(count, remaining)
+
+
+# The adaptive strategies search a ParameterSpace; constraints are honoured by its sample()
+SearchSpace = ParameterSpace
+
+
+def score(result, metric):
+    """Comparable score for a result: higher is better, failures and pruned runs rank last"""
+    value = result.get(metric)
+    if 'error' in result or result.get('pruned') or value is None or (isinstance(value, float) and math.isnan(value)):
+        return float('-inf')
+    return -value if metric in MINIMIZE_METRICS else value
+
+
+class SearchStrategy(ABC):
+    """
+    Base class for parameter search strategies.
+
+    ``evaluate(params_list, fidelity)`` is the only way a strategy runs
+    backtests; ``Optimizer.evaluate`` provides it. Fidelity is the fraction of
+    the history used, so strategies can screen on short windows first.
+    """
+
+    name = None
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    @abstractmethod
+    def search(self, evaluate, space, budget, metric):
+        """Run the search and return every result it produced"""
+        pass
+
+    def _evaluate(self, evaluate, params_list, fidelity, budget):
+        params_list = params_list[:budget.take(len(params_list))]
+        if not params_list:
+            return []
+        results = evaluate(params_list, fidelity)
+        budget.evaluations += len(params_list)
+        return results
+
+
+class RandomSearch(SearchStrategy):
+    """Uniform random sampling without replacement, in batches"""
+
+    name = 'random'
+
+    def __init__(self, seed=None, batch_size=16):
+        super().__init__(seed)
+        self.batch_size = batch_size
+
+    def search(self, evaluate, space, budget, metric):
+        results = []
+        while not budget.exhausted():
+            batch = space.sample(self.rng, budget.take(self.batch_size), exclude=[r['params'] for r in results])
+            if not batch:
+                break
+            results.extend(self._evaluate(evaluate, batch, 1.0, budget))
+        return results
+
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Screen many configurations on a short window, keep the best ``1 / eta`` of
+    them, and repeat on longer windows until the survivors run on the full
+    history.
+    """
+
+    name = 'halving'
+
+    def __init__(self, seed=None, n_configs=None, min_fidelity=None, eta=3):
+        super().__init__(seed)
+        self.n_configs = n_configs
+        self.min_fidelity = min_fidelity
+        self.eta = eta
+
+    def search(self, evaluate, space, budget, metric):
+        n_configs = self.n_configs or min(space.size, 81)
+        min_fidelity = self.min_fidelity or self.eta ** -3
+        return self._bracket(evaluate, space, budget, metric, n_configs, min_fidelity, exclude=[])
+
+    def _bracket(self, evaluate, space, budget, metric, n_configs, min_fidelity, exclude):
+        rungs = max(0, math.ceil(math.log(1 / min_fidelity, self.eta) - 1e-9))
+        # Shrink the first rung until the whole bracket fits the remaining budget,
+        # otherwise it would be spent on short windows without reaching the full history
+        remaining = budget.remaining()
+        if remaining is not None:
+            while n_configs > 1 and self._bracket_cost(n_configs, rungs) > remaining:
+                n_configs -= 1
+        candidates = space.sample(self.rng, n_configs, exclude=exclude)
+        results = []
+        for rung in range(rungs + 1):
+            if not candidates:
+                break
+            fidelity = min(1.0, min_fidelity * self.eta ** rung)
+            rung_results = self._evaluate(evaluate, candidates, fidelity, budget)
+            results.extend(rung_results)
+            if fidelity >= 1.0 or budget.exhausted():
+                break
+            rung_results.sort(key=lambda r: score(r, metric), reverse=True)
+            keep = max(1, len(rung_results) // self.eta)
+            candidates = [r['params'] for r in rung_results[:keep] if score(r, metric) > float('-inf')]
+            logging.info(f"Successive halving rung {rung}: promoting {len(candidates)} of {len(rung_results)}")
+        return results
+
+
+    def _bracket_cost(self, n_configs, rungs):
+        cost, count = 0, n_configs
+        for _ in range(rungs + 1):
+            cost += count
+            count = max(1, count // self.eta)
+        return cost
+
+
+class Hyperband(SuccessiveHalving):
+    """
+    Successive halving run over several brackets, from many configurations on
+    very short windows to a few configurations on the full history, so a
+    misleading short window cannot eliminate every good configuration.
+    """
+
+    name = 'hyperband'
+
+    def __init__(self, seed=None, max_rungs=3, eta=3):
+        super().__init__(seed, eta=eta)
+        self.max_rungs = max_rungs
+
+    def search(self, evaluate, space, budget, metric):
+        results = []
+        # Repeat the sweep of brackets while budget and untried configurations remain
+        while not budget.exhausted():
+            produced = 0
+            for bracket in range(self.max_rungs, -1, -1):
+                if budget.exhausted():
+                    break
+                n_configs = math.ceil((self.max_rungs + 1) / (bracket + 1) * self.eta ** bracket)
+                min_fidelity = self.eta ** -bracket
+                tried = [r['params'] for r in results if r.get('fidelity', 1.0) >= 1.0]
+                bracket_results = self._bracket(evaluate, space, budget, metric, n_configs, min_fidelity, exclude=tried)
+                produced += len(bracket_results)
+                results.extend(bracket_results)
+            if not produced:
+                break
+        return results
+
+
+class TPESearch(SearchStrategy):
+    """
+    Tree-structured Parzen Estimator over the discrete space.
+
+    Observations are split at the ``gamma`` quantile into good and bad sets.
+    Each parameter gets a smoothed histogram over its (ordered) values for
+    both sets, and the candidate with the highest good/bad density ratio among
+    ``n_candidates`` draws from the good model is evaluated next.
+    """
+
+    name = 'tpe'
+
+    def __init__(self, seed=None, n_startup=10, gamma=0.25, n_candidates=24, batch_size=1):
+        super().__init__(seed)
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.batch_size = batch_size
+
+    def search(self, evaluate, space, budget, metric):
+        results = []
+        startup = space.sample(self.rng, min(self.n_startup, space.size))
+        results.extend(self._evaluate(evaluate, startup, 1.0, budget))
+        while not budget.exhausted() and len(results) < space.size:
+            batch = self._suggest(space, results, metric)
+            if not batch:
+                break
+            results.extend(self._evaluate(evaluate, batch, 1.0, budget))
+        return results
+
+    def _suggest(self, space, results, metric):
+        tried = {space.key(r['params']) for r in results}
+        ranked = sorted(results, key=lambda r: score(r, metric), reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good, bad = ranked[:n_good], ranked[n_good:]
+
+        densities = {}
+        for name in space.names:
+            values = space.values[name]
+            densities[name] = (self._density(values, [r['params'][name] for r in good]),
+                               self._density(values, [r['params'][name] for r in bad]))
+
+        candidates = []
+        for _ in range(self.n_candidates):
+            params = {}
+            for name in space.names:
+                good_density = densities[name][0]
+                params[name] = self.rng.choices(space.values[name], weights=good_density)[0]
+            if space.key(params) not in tried and space.is_valid(params):
+                candidates.append(params)
+        if not candidates:
+            return space.sample(self.rng, self.batch_size, exclude=[r['params'] for r in results])
+
+        def ratio(params):
+            value = 0.0
+            for name in space.names:
+                index = space.values[name].index(params[name])
+                good_density, bad_density = densities[name]
+                value += math.log(good_density[index]) - math.log(bad_density[index])
+            return value
+
+        unique = {space.key(params): params for params in candidates}
+        return sorted(unique.values(), key=ratio, reverse=True)[:self.batch_size]
+
+    @staticmethod
+    def _density(values, observed):
+        """Histogram over ``values`` with a uniform prior and neighbour smoothing"""
+        weights = [1.0] * len(values)
+        for value in observed:
+            index = values.index(value)
+            weights[index] += 2.0
+            for neighbour in (index - 1, index + 1):
+                if 0 <= neighbour < len(values):
+                    weights[neighbour] += 0.5
+        total = sum(weights)
+        return [w / total for w in weights]
+
+
+SEARCH_STRATEGIES = {
+    strategy.name: strategy for strategy in (RandomSearch, SuccessiveHalving, Hyperband, TPESearch)
+}
+
+
+def get_search_strategy(method, **kwargs):
+    """Instantiate a search strategy by name"""
+    if method not in SEARCH_STRATEGIES:
+        raise OptimizationError(
+            f"Unknown search method '{method}'. Available methods: {list(SEARCH_STRATEGIES.keys())}"
+        )
+    return SEARCH_STRATEGIES[method](**kwargs)
@@ -0,0 +1,66 @@
+# components/backtesting_module/shared_data.py
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrame:
+    """
+    OHLCV DataFrame published once in shared memory for worker processes.
+
+    The datetime index (as int64 nanoseconds) and every column (as float64)
+    are laid out as one 2-D block. Workers receive only the small ``spec``
+    dict and rebuild the frame on top of the shared buffer, so the data is
+    never pickled per task.
+    """
+
+    def __init__(self, df):
+        index = pd.DatetimeIndex(df.index)
+        tz = index.tz
+        values = df.to_numpy(dtype=np.float64)
+        rows, cols = values.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, rows * (cols + 1) * 8))
+        block = np.ndarray((cols + 1, rows), dtype=np.float64, buffer=self._shm.buf)
+        block[1:] = values.T
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        block[0].view(np.int64)[:] = index.values.astype('datetime64[ns]').view(np.int64)
+        self.spec = {
+            'name': self._shm.name,
+            'rows': rows,
+            'columns': list(df.columns),
+            'tz': str(tz) if tz is not None else None,
+            'index_name': df.index.name
+        }
+
+    @staticmethod
+    def attach(spec):
+        """
+        Rebuild the DataFrame in a worker.
+
+        Returns:
+            Tuple ``(shm, df)``; keep ``shm`` referenced for as long as ``df`` is used
+        """
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        cols = len(spec['columns'])
+        block = np.ndarray((cols + 1, spec['rows']), dtype=np.float64, buffer=shm.buf)
+        index = pd.DatetimeIndex(block[0].view(np.int64).astype('datetime64[ns]'), name=spec['index_name'])
+        if spec['tz']:
+            index = index.tz_localize('UTC').tz_convert(spec['tz'])
+        df = pd.DataFrame(block[1:].T, index=index, columns=spec['columns'], copy=False)
+        return shm, df
+
+    def close(self):
+        """Release and remove the shared block; call once every worker is done"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -2,6 +2,8 @@
 
 import backtrader as bt
 
+from . import cached_indicators
+
 class MovingAverageCrossoverStrategy(bt.Strategy):
     """Moving Average Crossover Strategy Implementation"""
     
@@ -11,8 +13,8 @@ class MovingAverageCrossoverStrategy(bt.Strategy):
     )
 
     def __init__(self):
-        self.short_ma = bt.indicators.SMA(self.data.close, period=self.params.short_window)
-        self.long_ma = bt.indicators.SMA(self.data.close, period=self.params.long_window)
+        self.short_ma = cached_indicators.sma_line(self.data.close, self.params.short_window)
+        self.long_ma = cached_indicators.sma_line(self.data.close, self.params.long_window)
         self.crossover = bt.indicators.CrossOver(self.short_ma, self.long_ma)
 
     def next(self):
@@ -31,7 +33,7 @@ class RSIStrategy(bt.Strategy):
     )
 
     def __init__(self):
-        self.rsi = bt.indicators.RSI(self.data.close, period=self.params.rsi_period)
+        self.rsi = cached_indicators.rsi_line(self.data.close, self.params.rsi_period)
 
     def next(self):
         if self.rsi < self.params.oversold and not self.position:
@@ -49,17 +51,17 @@ class MACDStrategy(bt.Strategy):
     )
 
     def __init__(self):
-        self.macd = bt.indicators.MACD(
+        self.macd, self.signal = cached_indicators.macd_lines(
             self.data.close,
-            period_me1=self.params.fast_period,
-            period_me2=self.params.slow_period,
-            period_signal=self.params.signal_period
+            self.params.fast_period,
+            self.params.slow_period,
+            self.params.signal_period
         )
 
     def next(self):
-        if self.macd.macd > self.macd.signal and not self.position:
+        if self.macd > self.signal and not self.position:
             self.buy()
-        elif self.macd.macd < self.macd.signal and self.position:
+        elif self.macd < self.signal and self.position:
             self.sell()
 
 class BollingerBandsStrategy(bt.Strategy):
@@ -71,16 +73,16 @@ class BollingerBandsStrategy(bt.Strategy):
     )
 
     def __init__(self):
-        self.boll = bt.indicators.BollingerBands(
+        self.top, self.bot = cached_indicators.bollinger_lines(
             self.data.close,
-            period=self.params.period,
-            devfactor=self.params.devfactor
+            self.params.period,
+            self.params.devfactor
         )
 
     def next(self):
-        if self.data.close < self.boll.lines.bot and not self.position:
+        if self.data.close < self.bot and not self.position:
             self.buy()
-        elif self.data.close > self.boll.lines.top and self.position:
+        elif self.data.close > self.top and self.position:
             self.sell()
 
 class MomentumStrategy(bt.Strategy):
@@ -91,10 +93,7 @@ class MomentumStrategy(bt.Strategy):
     )
 
     def __init__(self):
-        self.momentum = bt.indicators.MomentumOscillator(
-            self.data.close,
-            period=self.params.momentum_period
-        )
+        self.momentum = cached_indicators.momentum_line(self.data.close, self.params.momentum_period)
 
     def next(self):
         if self.momentum > 0 and not self.position:
@@ -0,0 +1,93 @@
+# components/backtesting_module/synthetic_data.py
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import DataError
+
+# Bars per regular trading session and bar spacing for each supported timeframe
+TIMEFRAMES = {
+    '1Day': {'bars_per_day': 1, 'freq': None},
+    '5Min': {'bars_per_day': 78, 'freq': '5min'},
+    '1Min': {'bars_per_day': 390, 'freq': '1min'}
+}
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Annualized drift and volatility of each market regime, and the chance per
+# trading day of staying in it. Regimes last weeks to months on average.
+REGIMES = (
+    {'name': 'bull', 'drift': 0.15, 'volatility': 0.12, 'persistence': 0.98},
+    {'name': 'bear', 'drift': -0.20, 'volatility': 0.30, 'persistence': 0.95},
+    {'name': 'sideways', 'drift': 0.0, 'volatility': 0.18, 'persistence': 0.97}
+)
+
+
+def bar_index(n_bars, timeframe='1Day', start='2020-01-01'):
+    """
+    Timestamps of ``n_bars`` consecutive bars: business days for daily bars,
+    regular 09:30-16:00 sessions for intraday ones.
+    """
+    if timeframe not in TIMEFRAMES:
+        raise DataError(f"Unsupported timeframe '{timeframe}'. Expected one of {list(TIMEFRAMES)}")
+    spec = TIMEFRAMES[timeframe]
+    days = pd.bdate_range(start, periods=-(-n_bars // spec['bars_per_day']))
+    if spec['freq'] is None:
+        return days[:n_bars]
+    offsets = pd.timedelta_range('09:30:00', periods=spec['bars_per_day'], freq=spec['freq'])
+    stamps = (days.values[:, None] + offsets.values[None, :]).ravel()
+    return pd.DatetimeIndex(stamps[:n_bars])
+
+
+def generate_ohlcv(n_bars, timeframe='1Day', seed=0, start='2020-01-01', start_price=100.0, regimes=REGIMES):
+    """
+    Reproducible OHLCV bars from a regime-switching geometric Brownian motion.
+
+    A Markov chain picks the regime of each trading day; within a day, bar
+    log returns are normal with the regime's drift and volatility scaled to
+    the bar length. Opens gap slightly from the previous close, highs and
+    lows bracket the open and close, and volume rises with the size of the
+    move. The same arguments always give the same frame.
+
+    Returns:
+        DataFrame with open, high, low, close and volume columns
+    """
+    if n_bars < 1:
+        raise DataError("At least one bar is needed")
+    index = bar_index(n_bars, timeframe, start)
+    bars_per_day = TIMEFRAMES[timeframe]['bars_per_day']
+    rng = np.random.default_rng(seed)
+
+    n_days = -(-n_bars // bars_per_day)
+    stay = rng.random(n_days)
+    jumps = rng.integers(1, len(regimes), n_days)
+    regime = np.empty(n_days, dtype=np.int64)
+    current = 0
+    for day in range(n_days):
+        if stay[day] > regimes[current]['persistence']:
+            current = (current + jumps[day]) % len(regimes)
+        regime[day] = current
+    regime = np.repeat(regime, bars_per_day)[:n_bars]
+
+    dt = 1.0 / (TRADING_DAYS_PER_YEAR * bars_per_day)
+    drift = np.array([r['drift'] for r in regimes])[regime]
+    volatility = np.array([r['volatility'] for r in regimes])[regime]
+    log_returns = (drift - 0.5 * volatility ** 2) * dt + volatility * np.sqrt(dt) * rng.standard_normal(n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    bar_volatility = volatility * np.sqrt(dt)
+    previous_close = np.concatenate(([start_price], close[:-1]))
+    open_ = previous_close * np.exp(0.25 * bar_volatility * rng.standard_normal(n_bars))
+    wick = np.abs(rng.standard_normal((2, n_bars))) * 0.5 * bar_volatility
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    move = np.abs(np.log(close / open_)) / bar_volatility
+    volume = np.round(1e6 / bars_per_day * (1.0 + move) * rng.lognormal(0.0, 0.3, n_bars))
+
+    return pd.DataFrame({
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    }, index=index)
@@ -0,0 +1,198 @@
+# components/backtesting_module/throughput.py
+
+import gc
+import json
+import logging
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from components.strategy_management_module.indicator_cache import indicator_cache
+from .config import BacktestConfig
+from .exceptions import BacktestError
+from .feeds import NumpyData, cerebro_options
+from .strategy_adapter import StrategyAdapter
+from .synthetic_data import generate_ohlcv
+from .vectorized_engine import VECTORIZED_STRATEGIES, VectorizedBacktester, build_strategy
+
+# backtrader: StrategyAdapter strategies in Cerebro, as Backtester.run_backtest runs them
+# vectorized: StrategyBase.generate_signals plus the NumPy fill simulation
+# streaming: StrategyBase.on_bar over every bar
+ENGINES = ('backtrader', 'vectorized', 'streaming')
+
+RESULT_KEY = ('engine', 'strategy', 'timeframe', 'bars')
+
+
+def _run_backtrader(strategy_name, data):
+    cerebro = bt.Cerebro(**cerebro_options())
+    cerebro.adddata(NumpyData(dataname=data))
+    cerebro.addstrategy(StrategyAdapter.get_strategy(strategy_name))
+    cerebro.broker.setcash(BacktestConfig.INITIAL_CASH)
+    cerebro.broker.setcommission(commission=BacktestConfig.DEFAULT_COMMISSION)
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+    cerebro.run()
+
+
+def _run_vectorized(strategy_name, data):
+    VectorizedBacktester(data).run(strategy_name)
+
+
+def _run_streaming(strategy_name, data):
+    build_strategy(strategy_name).warm_up(data)
+
+
+_RUNNERS = {
+    'backtrader': (_run_backtrader, StrategyAdapter.STRATEGIES),
+    'vectorized': (_run_vectorized, VECTORIZED_STRATEGIES),
+    'streaming': (_run_streaming, VECTORIZED_STRATEGIES)
+}
+
+
+def measure(run, repeat=3):
+    """
+    Best wall time of ``repeat`` calls to ``run`` and the peak memory it
+    allocates (MB), from one more call traced by ``tracemalloc``. Tracing
+    slows allocation down, so it is kept out of the timed calls.
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / (1024 * 1024)
+
+
+def run_suite(timeframes=('1Day', '5Min', '1Min'), n_bars=BacktestConfig.THROUGHPUT_BARS, engines=ENGINES,
+              strategies=None, repeat=3, seed=0):
+    """
+    Measure every strategy on every engine over synthetic data.
+
+    The indicator cache is cleared before each call so every measurement
+    is a cold run.
+
+    Args:
+        timeframes: Bar sizes to generate data for
+        n_bars: Bars per timeframe
+        engines: Subset of ``ENGINES``
+        strategies: Strategy names to measure (default: all the engine has)
+        repeat: Timed calls per measurement; the fastest is kept
+        seed: Seed of the synthetic data
+
+    Returns:
+        List of dicts with ``engine``, ``strategy``, ``timeframe``, ``bars``,
+        ``seconds``, ``bars_per_sec`` and ``peak_memory_mb``
+    """
+    unknown = [engine for engine in engines if engine not in _RUNNERS]
+    if unknown:
+        raise BacktestError(f"Unknown engines {unknown}. Expected some of {ENGINES}")
+
+    results = []
+    for timeframe in timeframes:
+        data = generate_ohlcv(n_bars, timeframe, seed=seed)
+        for engine in engines:
+            runner, available = _RUNNERS[engine]
+            for strategy_name in strategies or available:
+                if strategy_name not in available:
+                    continue
+
+                def run():
+                    indicator_cache.clear()
+                    runner(strategy_name, data)
+
+                seconds, peak_memory = measure(run, repeat)
+                results.append({
+                    'engine': engine,
+                    'strategy': strategy_name,
+                    'timeframe': timeframe,
+                    'bars': n_bars,
+                    'seconds': seconds,
+                    'bars_per_sec': n_bars / seconds,
+                    'peak_memory_mb': peak_memory
+                })
+                logging.info(f"{engine} {strategy_name} {timeframe}: {n_bars / seconds:,.0f} bars/s, "
+                             f"peak {peak_memory:.1f} MB")
+    return results
+
+
+def environment():
+    """Versions and machine details stored with each result file"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'backtrader': bt.__version__
+    }
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    document = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    logging.info(f"Saved {len(results)} throughput results to {path}")
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=BacktestConfig.THROUGHPUT_TOLERANCE,
+            min_memory_mb=BacktestConfig.THROUGHPUT_MIN_MEMORY_MB):
+    """
+    Regressions of ``results`` against ``baseline`` results.
+
+    A measurement regresses when its throughput is more than ``tolerance``
+    below the baseline, or its peak memory more than ``tolerance`` (and at
+    least ``min_memory_mb``) above it. Measurements missing from either
+    side are not compared.
+
+    Returns:
+        List of dicts with the measurement's key fields, ``metric``,
+        ``baseline``, ``current`` and relative ``change``
+    """
+    previous = {tuple(entry[field] for field in RESULT_KEY): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        reference = previous.get(tuple(entry[field] for field in RESULT_KEY))
+        if reference is None:
+            continue
+        checks = (
+            ('bars_per_sec', entry['bars_per_sec'] < reference['bars_per_sec'] * (1 - tolerance)),
+            ('peak_memory_mb', entry['peak_memory_mb'] > reference['peak_memory_mb'] * (1 + tolerance)
+             and entry['peak_memory_mb'] - reference['peak_memory_mb'] >= min_memory_mb)
+        )
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({
+                    **{field: entry[field] for field in RESULT_KEY},
+                    'metric': metric,
+                    'baseline': reference[metric],
+                    'current': entry[metric],
+                    'change': entry[metric] / reference[metric] - 1
+                })
+    return regressions
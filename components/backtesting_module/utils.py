@@ -3,6 +3,8 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from .config import BacktestConfig
+from .exceptions import DataError
 
 def validate_backtest_data(data):
     """
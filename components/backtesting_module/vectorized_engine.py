@@ -0,0 +1,274 @@
+# components/backtesting_module/vectorized_engine.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from components.strategy_management_module.strategies.moving_average_crossover import MovingAverageCrossoverStrategy
+from components.strategy_management_module.strategies.rsi_strategy import RSIStrategy
+from components.strategy_management_module.strategies.macd_strategy import MACDStrategy
+from components.strategy_management_module.strategies.bollinger_bands_strategy import BollingerBandsStrategy
+from components.strategy_management_module.strategies.momentum_stratey import MomentumStrategy
+from .config import BacktestConfig
+from .exceptions import DataError, StrategyError
+
+# Strategy names as registered in StrategyAdapter, mapped to the StrategyBase
+# implementations whose generate_signals() the engine consumes
+VECTORIZED_STRATEGIES = {
+    'MovingAverageCrossover': MovingAverageCrossoverStrategy,
+    'RSI': RSIStrategy,
+    'MACD': MACDStrategy,
+    'BollingerBands': BollingerBandsStrategy,
+    'Momentum': MomentumStrategy
+}
+
+# Backtrader parameter names that differ from the StrategyBase ones
+PARAM_ALIASES = {
+    'RSI': {'rsi_period': 'period'},
+    'BollingerBands': {'period': 'window', 'devfactor': 'num_std'},
+    'Momentum': {'momentum_period': 'lookback_period'}
+}
+
+# Strategies whose signal column marks entries (+1) and exits (-1) instead of
+# the position to hold; 0 means keep the current position
+EVENT_SIGNAL_STRATEGIES = ('RSI', 'BollingerBands')
+
+SIGNAL_MODES = ('state', 'event')
+
+
+def build_strategy(strategy_name, params=None):
+    """
+    Instantiate the StrategyBase implementation for a StrategyAdapter name.
+
+    Backtrader parameter names are translated and missing parameters fall back
+    to the strategy's defaults, so the same params dict works for both engines.
+    """
+    if strategy_name not in VECTORIZED_STRATEGIES:
+        raise StrategyError(
+            f"Strategy '{strategy_name}' has no vectorized implementation. "
+            f"Available strategies: {list(VECTORIZED_STRATEGIES.keys())}"
+        )
+    strategy_class = VECTORIZED_STRATEGIES[strategy_name]
+    aliases = PARAM_ALIASES.get(strategy_name, {})
+    merged = dict(strategy_class.default_params)
+    for key, value in (params or {}).items():
+        merged[aliases.get(key, key)] = value
+    return strategy_class(merged)
+
+
+def signals_to_target(signal, signal_mode='state'):
+    """
+    Convert a StrategyBase ``signal`` column into a long-only target (0 or 1) per bar.
+
+    Args:
+        signal: Array-like signal values
+        signal_mode: 'state' when the signal is the position to hold, 'event'
+            when +1/-1 mark entries/exits and 0 holds the previous position
+    """
+    if signal_mode not in SIGNAL_MODES:
+        raise ValueError(f"Invalid signal mode '{signal_mode}'. Expected one of {SIGNAL_MODES}")
+    signal = np.nan_to_num(np.asarray(signal, dtype=np.float64))
+    if signal_mode == 'state':
+        return (signal > 0).astype(np.float64)
+
+    events = np.where(signal > 0, 1.0, np.where(signal < 0, 0.0, np.nan))
+    # Forward fill the last event: index of the most recent non-NaN bar
+    last = np.where(~np.isnan(events), np.arange(len(events)), 0)
+    np.maximum.accumulate(last, out=last)
+    target = events[last]
+    return np.nan_to_num(target)
+
+
+def simulate_fills(opens, closes, target, cash, commission, stake=1, percents=None):
+    """
+    Turn per-bar targets into fills the way Backtrader's default broker does.
+
+    A target observed on bar ``t`` is a market order executed at the open of
+    bar ``t + 1``. Entries buy ``stake`` shares, or ``percents`` of cash at the
+    signal bar's close like ``bt.sizers.PercentSizer``; exits close the whole
+    position. Commission is ``abs(size) * price * commission``, as set by
+    ``cerebro.broker.setcommission(commission=...)``. An entry the cash cannot
+    cover is rejected and retried on the next bar while the target stays long.
+
+    Only bars where the target changes are visited, so the Python loop runs
+    once per trade rather than once per bar.
+
+    Returns:
+        Tuple of arrays ``(fill_bars, sizes, prices, commissions)``
+    """
+    n = len(closes)
+    desired = np.zeros(n)
+    desired[1:] = target[:-1]
+    change_bars = np.flatnonzero(np.diff(desired, prepend=0.0))
+
+    fill_bars, sizes, prices, commissions = [], [], [], []
+    position = 0.0
+    cash_now = float(cash)
+    retry_from = 0
+    for bar in change_bars:
+        if bar < retry_from:
+            continue
+        if desired[bar] > 0:
+            if position:
+                continue
+            # Try the entry on this bar and, if rejected, on every later bar
+            # until it fills or the target goes flat again
+            end = bar
+            while end < n and desired[end] > 0:
+                end += 1
+            for attempt in range(bar, end):
+                if percents is None:
+                    size = float(stake)
+                else:
+                    size = cash_now / closes[attempt - 1] * (percents / 100.0)
+                price = opens[attempt]
+                comm = abs(size) * price * commission
+                if size > 0 and size * price + comm <= cash_now:
+                    cash_now -= size * price + comm
+                    position = size
+                    fill_bars.append(attempt)
+                    sizes.append(size)
+                    prices.append(price)
+                    commissions.append(comm)
+                    break
+            retry_from = end
+        elif position:
+            price = opens[bar]
+            comm = position * price * commission
+            cash_now += position * price - comm
+            fill_bars.append(bar)
+            sizes.append(-position)
+            prices.append(price)
+            commissions.append(comm)
+            position = 0.0
+
+    return (np.asarray(fill_bars, dtype=np.int64), np.asarray(sizes, dtype=np.float64),
+            np.asarray(prices, dtype=np.float64), np.asarray(commissions, dtype=np.float64))
+
+
+def periods_per_year(index, trading_days=252, session_minutes=390):
+    """
+    Bars per year implied by the median spacing of a DatetimeIndex.
+
+    Intraday bars count ``session_minutes`` of trading per day (5-minute bars
+    give 252 * 78), bars about a day apart give ``trading_days`` and longer
+    bars are counted against the calendar (weekly about 52).
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) < 2:
+        return trading_days
+    spacing = pd.Series(index).diff().median()
+    if spacing < pd.Timedelta(hours=20):
+        return trading_days * max(1.0, pd.Timedelta(minutes=session_minutes) / spacing)
+    if spacing <= pd.Timedelta(days=4):
+        return trading_days
+    return pd.Timedelta(days=365.25) / spacing
+
+
+def compute_metrics(equity, initial_cash, periods_per_year=252):
+    """
+    Performance metrics from an equity curve.
+
+    ``total_return`` is the log return and ``max_drawdown`` a percentage, the
+    same conventions as Backtrader's Returns and DrawDown analyzers, so results
+    from both engines can be compared and stored side by side.
+    """
+    values = np.asarray(equity, dtype=np.float64)
+    final_value = float(values[-1]) if len(values) else float(initial_cash)
+    peaks = np.maximum.accumulate(values) if len(values) else values
+    drawdowns = (peaks - values) / peaks * 100.0 if len(values) else values
+    returns = np.diff(values, prepend=initial_cash) / np.concatenate(([initial_cash], values[:-1]))
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    sharpe = float(returns.mean() / std * np.sqrt(periods_per_year)) if std > 0 else None
+    return {
+        'final_value': final_value,
+        'total_return': float(np.log(final_value / initial_cash)),
+        'sharpe_ratio': sharpe,
+        'max_drawdown': float(drawdowns.max()) if len(drawdowns) else 0.0
+    }
+
+
+class VectorizedBacktester:
+    """
+    Array-based backtest engine for screening runs.
+
+    Fills, positions, cash and the equity curve are computed with NumPy from
+    the vectorized signals that every StrategyBase already produces, instead
+    of walking the bars through ``bt.Cerebro``. Execution follows Backtrader's
+    defaults (next-bar open fills, percentage commission, long-only) so the
+    final values agree with a Cerebro run of the same targets. Metrics are
+    annualized by ``periods_per_year``, inferred from the spacing of a
+    DatetimeIndex when not given.
+    """
+
+    def __init__(self, data, cash=BacktestConfig.INITIAL_CASH, commission=BacktestConfig.DEFAULT_COMMISSION,
+                 stake=1, percents=None, periods_per_year=None):
+        if data is None or data.empty:
+            raise DataError("No data supplied for vectorized backtest")
+        missing_columns = [col for col in ('open', 'close') if col not in data.columns]
+        if missing_columns:
+            raise DataError(f"Missing required columns: {missing_columns}")
+        self.data = data
+        self.cash = float(cash)
+        self.commission = float(commission)
+        self.stake = stake
+        self.percents = percents
+        self.periods_per_year = self._bars_per_year(data.index) if periods_per_year is None else periods_per_year
+        self._opens = data['open'].to_numpy(dtype=np.float64)
+        self._closes = data['close'].to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def _bars_per_year(index):
+        """``periods_per_year`` of a DatetimeIndex; 252 for any other index"""
+        return periods_per_year(index) if isinstance(index, pd.DatetimeIndex) else 252
+
+    def run(self, strategy_name, params=None):
+        """Generate the strategy's signals and backtest them"""
+        strategy = build_strategy(strategy_name, params)
+        signals = strategy.generate_signals(self.data)
+        signal_mode = 'event' if strategy_name in EVENT_SIGNAL_STRATEGIES else 'state'
+        return self.run_signals(signals['signal'], signal_mode=signal_mode)
+
+    def run_signals(self, signal, signal_mode='state'):
+        """
+        Backtest a precomputed signal column.
+
+        Returns:
+            Dict with ``equity``, ``position`` and ``cash`` Series indexed like
+            the data, a ``trades`` DataFrame and a ``metrics`` dict
+        """
+        target = signals_to_target(signal, signal_mode)
+        if len(target) != len(self._closes):
+            raise DataError("Signal length does not match the data")
+        fill_bars, sizes, prices, commissions = simulate_fills(
+            self._opens, self._closes, target, self.cash, self.commission,
+            stake=self.stake, percents=self.percents
+        )
+
+        n = len(self._closes)
+        position_delta = np.zeros(n)
+        cash_flow = np.zeros(n)
+        np.add.at(position_delta, fill_bars, sizes)
+        np.add.at(cash_flow, fill_bars, -sizes * prices - commissions)
+        position = np.cumsum(position_delta)
+        cash = self.cash + np.cumsum(cash_flow)
+        equity = cash + position * self._closes
+
+        index = self.data.index
+        trades = pd.DataFrame({
+            'datetime': index[fill_bars],
+            'size': sizes,
+            'price': prices,
+            'commission': commissions
+        })
+        metrics = compute_metrics(equity, self.cash, self.periods_per_year)
+        metrics['trades'] = len(trades)
+        logging.debug(f"Vectorized backtest: {len(trades)} fills, final value {metrics['final_value']:.2f}")
+        return {
+            'equity': pd.Series(equity, index=index, name='equity'),
+            'position': pd.Series(position, index=index, name='position'),
+            'cash': pd.Series(cash, index=index, name='cash'),
+            'trades': trades,
+            'metrics': metrics
+        }
@@ -0,0 +1,184 @@
+# components/backtesting_module/walk_forward.py
+
+import logging
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from .exceptions import OptimizationError
+from .feeds import NumpyData
+from .search import score
+from .strategy_adapter import StrategyAdapter
+from .vectorized_engine import VectorizedBacktester, compute_metrics, periods_per_year
+
+
+def generate_folds(index, train_size, test_size, step=None, anchored=False):
+    """
+    Split a DatetimeIndex into consecutive train/test folds.
+
+    Sizes are either bar counts (int) or durations understood by
+    ``pd.Timedelta`` (e.g. ``'365D'``). Rolling folds slide a fixed-length
+    train window; anchored folds always train from the first bar. The test
+    windows do not overlap when ``step`` equals ``test_size`` (the default).
+
+    Returns:
+        List of dicts with ``train_start``, ``train_stop``, ``test_start`` and
+        ``test_stop`` bar positions (``stop`` is exclusive)
+    """
+    index = pd.DatetimeIndex(index)
+    n = len(index)
+    step = step or test_size
+    by_bars = all(isinstance(size, (int, np.integer)) for size in (train_size, test_size, step))
+
+    def advance(position, size):
+        if by_bars:
+            return position + int(size)
+        if position >= n:
+            return n
+        return int(index.searchsorted(index[position] + pd.Timedelta(size), side='left'))
+
+    folds = []
+    start = 0
+    while True:
+        train_stop = advance(start, train_size)
+        test_stop = min(n, advance(train_stop, test_size))
+        if train_stop >= n or test_stop <= train_stop:
+            break
+        folds.append({
+            'train_start': 0 if anchored else start,
+            'train_stop': train_stop,
+            'test_start': train_stop,
+            'test_stop': test_stop
+        })
+        start = advance(start, step)
+    return folds
+
+
+class _BarValues(bt.Analyzer):
+    """Broker value at the close of every bar, warm-up bars included"""
+
+    def start(self):
+        self.values = []
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        self.values.append(self.strategy.broker.getvalue())
+
+    def get_analysis(self):
+        return self.values
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward analysis on top of ``Optimizer``.
+
+    The parameter grid for every train fold is evaluated in one process pool
+    run over a single shared copy of the data, so folds are optimized in
+    parallel without reloading anything. Each fold's best parameters are then
+    traded on the following test window and the out-of-sample bar returns
+    are chained into one equity curve.
+    """
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+
+    def run(self, param_ranges, train_size, test_size, step=None, anchored=False, metric='sharpe_ratio',
+            cash=100000.0, commission=0.001, engine='backtrader', max_workers=None):
+        """
+        Run the walk-forward optimization.
+
+        Args:
+            param_ranges: Dict of parameter name to the values to try in every fold, or a ``ParameterSpace``
+            train_size, test_size, step: Fold sizes in bars or as durations
+            anchored: Train every fold from the first bar
+            metric: Result key used to pick each fold's parameters
+            cash, commission, engine, max_workers: As for ``Optimizer.run_optimization``
+
+        Returns:
+            Dict with per-fold ``folds`` records, the stitched out-of-sample
+            ``equity`` Series and its ``metrics``
+        """
+        optimizer = self.optimizer
+        if optimizer.data is None:
+            optimizer.load_data()
+        data = optimizer.data
+        folds = generate_folds(data.index, train_size, test_size, step, anchored)
+        if not folds:
+            raise OptimizationError("Not enough data for a single walk-forward fold")
+
+        bars_per_year = periods_per_year(data.index)
+
+        combinations = list(optimizer.generate_combinations(param_ranges))
+        tasks = [
+            (fold_id, params, fold['train_start'], fold['train_stop'])
+            for fold_id, fold in enumerate(folds)
+            for params in combinations
+        ]
+        logging.info(f"Walk-forward for {optimizer.strategy_name}: {len(folds)} folds x "
+                     f"{len(combinations)} combinations")
+
+        best = {}
+        for fold_id, result in optimizer.iter_window_evaluations(
+                tasks, cash, commission, engine, max_workers, data=data):
+            if fold_id not in best or score(result, metric) > score(best[fold_id], metric):
+                best[fold_id] = result
+
+        records, returns = [], []
+        for fold_id, fold in enumerate(folds):
+            in_sample = best[fold_id]
+            if score(in_sample, metric) == float('-inf'):
+                raise OptimizationError(f"No valid parameters for walk-forward fold {fold_id}")
+            fold_returns = self._out_of_sample_returns(in_sample['params'], fold, cash, commission, engine)
+            returns.append(fold_returns)
+            fold_equity = cash * (1 + fold_returns).cumprod()
+            records.append({
+                'fold': fold_id,
+                'train_start': data.index[fold['train_start']],
+                'train_end': data.index[fold['train_stop'] - 1],
+                'test_start': data.index[fold['test_start']],
+                'test_end': data.index[fold['test_stop'] - 1],
+                'params': in_sample['params'],
+                'in_sample': in_sample,
+                'out_of_sample': compute_metrics(fold_equity.to_numpy(), cash, bars_per_year)
+            })
+
+        # Test windows overlap when step < test_size; each bar counts once, from its first fold
+        stitched = pd.concat(returns)
+        stitched = stitched[~stitched.index.duplicated(keep='first')]
+        equity = (cash * (1 + stitched).cumprod()).rename('equity')
+        metrics = compute_metrics(equity.to_numpy(), cash, bars_per_year)
+        logging.info(f"Walk-forward completed: out-of-sample final value {metrics['final_value']:.2f}")
+        return {'folds': records, 'equity': equity, 'metrics': metrics}
+
+    def _out_of_sample_returns(self, params, fold, cash, commission, engine):
+        """
+        Bar returns over the test window.
+
+        The run starts at the train window so indicators are warmed up and any
+        position open at the end of training carries into the test window;
+        only returns from the first test bar onwards are kept.
+        """
+        optimizer = self.optimizer
+        window = optimizer.data.iloc[fold['train_start']:fold['test_stop']]
+        test_offset = fold['test_start'] - fold['train_start']
+
+        if engine == 'vectorized':
+            equity = VectorizedBacktester(window, cash=cash, commission=commission).run(
+                optimizer.strategy_name, params)['equity']
+            returns = equity.pct_change()
+        else:
+            cerebro = bt.Cerebro(stdstats=False, **optimizer.engine_options)
+            cerebro.adddata(NumpyData(dataname=window))
+            cerebro.addstrategy(StrategyAdapter.get_strategy(optimizer.strategy_name), **params)
+            cerebro.broker.setcash(cash)
+            cerebro.broker.setcommission(commission=commission)
+            cerebro.addanalyzer(_BarValues, _name='bar_values')
+            values = cerebro.run()[0].analyzers.bar_values.get_analysis()
+            # One value per bar, so align by position rather than by Backtrader's naive datetimes
+            equity = pd.Series(values, index=window.index[:len(values)], dtype=float).reindex(window.index)
+            returns = pd.concat([pd.Series([cash]), equity.reset_index(drop=True)]).pct_change().iloc[1:]
+            returns.index = window.index
+        return returns.iloc[test_offset:].fillna(0.0)
@@ -0,0 +1,116 @@
+# components/data_management_module/adjustments.py
+
+import numpy as np
+import pandas as pd
+
+# Supported read-time adjustment modes
+ADJUSTMENT_MODES = ('raw', 'split', 'all')
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def _to_utc_ns(values, tz):
+    """Convert datetimes to int64 UTC nanoseconds; naive values are taken to be in ``tz``."""
+    index = pd.DatetimeIndex(pd.to_datetime(values))
+    if index.tz is None:
+        index = index.tz_localize(tz)
+    return index.tz_convert('UTC').asi8
+
+
+def build_adjustment_factors(actions, timestamps, closes, mode='all', tz='America/New_York'):
+    """
+    Build the cumulative adjustment factor table for one ticker.
+
+    Each event contributes a multiplier that applies to every bar strictly
+    before its ex-date: ``1 / ratio`` for a split and ``1 - amount / prev_close``
+    for a cash dividend, where ``prev_close`` is the last raw close before the
+    ex-date (taken from the action tuple when the store supplies it, otherwise
+    looked up in ``closes``). The multipliers are turned into a suffix
+    cumulative product so that a bar's total factor is a single lookup.
+
+    Args:
+        actions: Iterable of ``(ex_date, action_type, value[, prev_close])`` tuples
+        timestamps: Raw bar timestamps, sorted ascending
+        closes: Raw closing prices aligned with ``timestamps``
+        mode: 'split' to apply splits only, 'all' to apply splits and dividends
+        tz: Time zone used for naive datetimes
+
+    Returns:
+        Tuple ``(ex_ns, price_factors, volume_factors)``. ``ex_ns`` holds the
+        sorted ex-dates as UTC nanoseconds and the factor arrays have one more
+        element than ``ex_ns``; the last element (no later events) is 1.0.
+    """
+    actions = [a for a in actions if a[1] == 'split' or (mode == 'all' and a[1] == 'dividend')]
+    if not actions:
+        return np.empty(0, dtype=np.int64), np.ones(1), np.ones(1)
+
+    ex_ns = _to_utc_ns([a[0] for a in actions], tz)
+    kinds = np.array([a[1] for a in actions])
+    values = np.asarray([a[2] for a in actions], dtype=np.float64)
+    reference = np.asarray([a[3] if len(a) > 3 and a[3] is not None else np.nan for a in actions], dtype=np.float64)
+    order = np.argsort(ex_ns, kind='stable')
+    ex_ns, kinds, values, reference = ex_ns[order], kinds[order], values[order], reference[order]
+
+    price_mult = np.ones(len(ex_ns))
+    volume_mult = np.ones(len(ex_ns))
+
+    is_split = kinds == 'split'
+    price_mult[is_split] = 1.0 / values[is_split]
+    volume_mult[is_split] = values[is_split]
+
+    is_dividend = kinds == 'dividend'
+    if is_dividend.any():
+        bar_ns = _to_utc_ns(timestamps, tz)
+        closes = np.asarray(closes, dtype=np.float64)
+        prev = np.searchsorted(bar_ns, ex_ns[is_dividend], side='left') - 1
+        prev_close = reference[is_dividend]
+        lookup = np.isnan(prev_close) & (prev >= 0)
+        prev_close[lookup] = closes[prev[lookup]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dividend_mult = 1.0 - values[is_dividend] / prev_close
+        # No prior bar (or a nonsensical amount) means there is nothing to adjust
+        dividend_mult[~np.isfinite(dividend_mult) | (dividend_mult <= 0)] = 1.0
+        price_mult[is_dividend] = dividend_mult
+
+    price_factors = np.append(np.cumprod(price_mult[::-1])[::-1], 1.0)
+    volume_factors = np.append(np.cumprod(volume_mult[::-1])[::-1], 1.0)
+    return ex_ns, price_factors, volume_factors
+
+
+def apply_adjustments(df, actions, mode='all', tz='America/New_York'):
+    """
+    Return an adjusted copy of a raw OHLCV frame indexed by timestamp.
+
+    The factor for every bar is found with one ``searchsorted`` against the
+    sorted ex-dates, so the cost is O(bars + events) regardless of how many
+    corporate actions the ticker has had.
+
+    Args:
+        df: Raw bars with open/high/low/close/volume columns and a DatetimeIndex
+        actions: Iterable of ``(ex_date, action_type, value[, prev_close])`` tuples
+        mode: One of ``ADJUSTMENT_MODES``
+        tz: Time zone used for naive datetimes
+
+    Returns:
+        DataFrame with the same index and columns as ``df``
+    """
+    if mode not in ADJUSTMENT_MODES:
+        raise ValueError(f"Invalid adjustment mode '{mode}'. Expected one of {ADJUSTMENT_MODES}")
+    if mode == 'raw' or df.empty:
+        return df
+
+    df = df.sort_index()
+    ex_ns, price_factors, volume_factors = build_adjustment_factors(
+        actions, df.index, df['close'].to_numpy(), mode=mode, tz=tz
+    )
+    if len(ex_ns) == 0:
+        return df
+
+    # Events with ex-date <= bar time have already happened for that bar
+    idx = np.searchsorted(ex_ns, _to_utc_ns(df.index, tz), side='right')
+    adjusted = df.copy()
+    price_cols = [c for c in PRICE_COLUMNS if c in adjusted.columns]
+    adjusted[price_cols] = adjusted[price_cols].to_numpy(dtype=np.float64) * price_factors[idx][:, None]
+    if 'volume' in adjusted.columns:
+        adjusted['volume'] = adjusted['volume'].to_numpy(dtype=np.float64) * volume_factors[idx]
+    return adjusted
@@ -6,6 +6,7 @@ import pandas as pd
 import pytz
 from alpaca_trade_api.rest import REST, TimeFrame, TimeFrameUnit
 from .config import config
+from components.logging_monitoring_module.async_logging import get_module_logger, get_debug_channel
 class AlpacaAPIClient:
     """Client for interacting with Alpaca's REST API"""
     
@@ -34,12 +35,9 @@ class AlpacaAPIClient:
 
     def _setup_logging(self):
         """Set up logging for the API client"""
-        logger = logging.getLogger('alpaca_api')
-        logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(config.get('DEFAULT', 'log_file'))
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
+        logger = get_module_logger('alpaca_api', config.get('DEFAULT', 'log_file'))
+        # Multi-year backfills issue hundreds of chunk requests; sample their progress
+        self.chunk_log = get_debug_channel('alpaca_api.chunks', sample_every=20)
         return logger
 
     def _respect_rate_limit(self):
@@ -61,14 +59,11 @@ class AlpacaAPIClient:
         while current_date < end_date:
             chunk_end = min(current_date + timedelta(days=self.chunk_size), end_date)
             chunk_count += 1
-            print(f"CRITICAL DEBUG: Fetching chunk {chunk_count}: {current_date} to {chunk_end}")
+            self.chunk_log.debug("Fetching chunk %d for %s: %s to %s", chunk_count, ticker, current_date, chunk_end)
             chunk_data = self._fetch_data_chunk(ticker, current_date, chunk_end, timeframe)
 
             if not chunk_data.empty:
-                print(f"CRITICAL DEBUG: Retrieved {len(chunk_data)} records in chunk {chunk_count}")
                 all_data.append(chunk_data)
-            else:
-                print(f"CRITICAL DEBUG: No data retrieved in chunk {chunk_count}")
 
             current_date = chunk_end + timedelta(seconds=1)  # Avoid overlapping
 
@@ -77,11 +72,12 @@ class AlpacaAPIClient:
         else:
             final_data = pd.DataFrame()
 
-        print(f"CRITICAL DEBUG: Final data shape={final_data.shape}, columns={final_data.columns.tolist()}")
         if not final_data.empty:
-            earliest_date = final_data.index.min()
-            latest_date = final_data.index.max()
-            print(f"CRITICAL DEBUG: Data ranges from {earliest_date} to {latest_date}")
+            self.logger.info("Fetched %d bars for %s in %d chunks (%s to %s)",
+                             len(final_data), ticker, chunk_count,
+                             final_data.index.min(), final_data.index.max())
+        else:
+            self.logger.info("No bars fetched for %s in %d chunks", ticker, chunk_count)
 
         return final_data
     
@@ -113,8 +109,7 @@ class AlpacaAPIClient:
                 ).df
 
                 if bars.empty:
-                    self.logger.warning(f"No data returned for {ticker} between {start_date} and {end_date}")
-                    print(f"CRITICAL DEBUG: No data returned for {ticker} between {start_date} and {end_date}")
+                    self.chunk_log.debug("No data returned for %s between %s and %s", ticker, start_date, end_date)
                     return pd.DataFrame()
 
                 # Ensure the index is a DateTimeIndex
@@ -133,16 +128,13 @@ class AlpacaAPIClient:
                 bars.index = bars.index.tz_convert(ny_tz)
                 bars = bars.between_time('09:30', '16:00')
 
-                self.logger.info(f"Successfully fetched {len(bars)} bars for {ticker} from {start_date} to {end_date}")
-                print(f"CRITICAL DEBUG: Successfully fetched {len(bars)} bars for {ticker} from {start_date} to {end_date}")
+                self.chunk_log.debug("Fetched %d bars for %s from %s to %s", len(bars), ticker, start_date, end_date)
                 return bars
 
             except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed for {ticker}: {str(e)}")
-                print(f"CRITICAL DEBUG: Attempt {attempt + 1} failed for {ticker}: {str(e)}")
+                self.logger.warning("Attempt %d failed for %s: %s", attempt + 1, ticker, e)
                 if attempt == self.retry_count - 1:
-                    self.logger.error(f"Failed to fetch data for {ticker} after {self.retry_count} attempts")
-                    print(f"CRITICAL DEBUG: Failed to fetch data for {ticker} after {self.retry_count} attempts")
+                    self.logger.error("Failed to fetch data for %s after %d attempts", ticker, self.retry_count)
                     raise
                 time.sleep(self.retry_delay * (attempt + 1))  # Exponential backoff
 
@@ -159,13 +151,13 @@ class AlpacaAPIClient:
                 self.logger.error("API access verification failed")
                 return False
         except Exception as e:
-            self.logger.error(f"API access verification failed: {str(e)}")
+            self.logger.error("API access verification failed: %s", e)
             return False
 
     def get_bars(self, ticker, start_date, end_date):
         """Get historical bars for a ticker"""
         try:
-            self.logger.info(f"Requesting bars for {ticker} from {start_date} to {end_date}")
+            self.logger.info("Requesting bars for %s from %s to %s", ticker, start_date, end_date)
             
             bars = self.api.get_bars(
                 ticker,
@@ -176,14 +168,14 @@ class AlpacaAPIClient:
             ).df
 
             if bars.empty:
-                self.logger.warning(f"No data returned for {ticker} between {start_date} and {end_date}")
+                self.logger.warning("No data returned for %s between %s and %s", ticker, start_date, end_date)
                 return pd.DataFrame()
 
-            self.logger.info(f"Successfully fetched {len(bars)} bars for {ticker}")
+            self.logger.info("Successfully fetched %d bars for %s", len(bars), ticker)
             return bars
 
         except Exception as e:
-            self.logger.error(f"Error fetching bars: {str(e)}")
+            self.logger.error("Error fetching bars: %s", e)
             raise
 
     def _get_bars_for_date(self, ticker, date):
@@ -193,8 +185,8 @@ class AlpacaAPIClient:
             end_date = datetime.combine(date, datetime.max.time())
             bars = self.get_bars(ticker, start_date, end_date)
             if not bars.empty:
-                self.logger.info(f"Fetched {len(bars)} bars for {ticker} on {date.strftime('%Y-%m-%d')}")
+                self.logger.info("Fetched %d bars for %s on %s", len(bars), ticker, date)
             return bars
         except Exception as e:
-            self.logger.error(f"Error fetching bars for {date}: {str(e)}")
+            self.logger.error("Error fetching bars for %s: %s", date, e)
             return pd.DataFrame()
@@ -43,6 +43,29 @@ class DataConfig:
             'rate_limit_delay': '0.2'
         }
 
+        # SQLite connection settings applied to every pooled connection
+        self.config['storage'] = {
+            'profile': 'balanced',
+            'busy_timeout_ms': '15000',
+            'pool_size': '5',
+            'max_overflow': '10'
+        }
+
+        # Background database maintenance (intervals in seconds)
+        self.config['maintenance'] = {
+            'enabled': 'true',
+            'poll_interval': '30',
+            'checkpoint_interval': '300',
+            'checkpoint_truncate_wal_mb': '64',
+            'optimize_interval': '3600',
+            'analyze_interval': '86400',
+            'vacuum_interval': '3600',
+            'vacuum_pages_per_run': '1000',
+            # Converting a database created without incremental auto-vacuum takes one
+            # full VACUUM, which locks it for the duration; only done when enabled
+            'convert_incremental_vacuum': 'false'
+        }
+
         # Validate required settings
         self._validate_config()
 
@@ -63,5 +86,9 @@ class DataConfig:
         """Get a float configuration value"""
         return self.config.getfloat(section, key)
 
+    def get_boolean(self, section, key):
+        """Get a boolean configuration value"""
+        return self.config.getboolean(section, key)
+
 # Global config instance
 config = DataConfig()
\ No newline at end of file
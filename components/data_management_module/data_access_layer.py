@@ -1,15 +1,59 @@
 # components/data_management_module/data_access_layer.py
 
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, ForeignKey, UniqueConstraint, func, text
+from sqlalchemy import create_engine, event, Column, String, Integer, Float, DateTime, ForeignKey, UniqueConstraint, func, text, select
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from datetime import datetime, timedelta
 import logging
+import os
+import pandas as pd
 from .config import config
+from components.logging_monitoring_module.async_logging import get_module_logger
 
 Base = declarative_base()
 
+# Connection PRAGMAs per storage profile. Any key can be overridden in the
+# [storage] config section.
+#   durable   - fsync on every commit, for machines that may lose power
+#   balanced  - WAL with synchronous=NORMAL: a crash can lose the last
+#               commits but never corrupts the database
+#   bulk_load - no fsync at all; only for rebuilding a database from scratch
+STORAGE_PROFILES = {
+    'durable': {
+        'synchronous': 'FULL',
+        'cache_size': '-16384',
+        'mmap_size': '0',
+        'temp_store': 'DEFAULT'
+    },
+    'balanced': {
+        'synchronous': 'NORMAL',
+        'cache_size': '-65536',
+        'mmap_size': '268435456',
+        'temp_store': 'MEMORY'
+    },
+    'bulk_load': {
+        'synchronous': 'OFF',
+        'cache_size': '-262144',
+        'mmap_size': '1073741824',
+        'temp_store': 'MEMORY'
+    }
+}
+
+
+def storage_pragmas(profile=None):
+    """Resolve the PRAGMAs for a storage profile, applying config overrides"""
+    profile = profile or config.get('storage', 'profile')
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile '{profile}'. Expected one of {list(STORAGE_PROFILES)}")
+    pragmas = dict(STORAGE_PROFILES[profile])
+    for key in pragmas:
+        if config.config.has_option('storage', key):
+            pragmas[key] = config.get('storage', key)
+    pragmas['busy_timeout'] = config.get('storage', 'busy_timeout_ms')
+    return pragmas
+
+
 class Ticker(Base):
     __tablename__ = 'tickers'
     symbol = Column(String, primary_key=True)
@@ -41,25 +85,114 @@ class HistoricalData(Base):
             raise ValueError("Volume cannot be negative")
         return True
 
+class CorporateAction(Base):
+    """
+    Split or cash dividend event used to adjust stored raw bars at read time.
+
+    ``value`` is the split ratio (new shares per old share, e.g. 4.0 for a
+    4-for-1 split) or the cash amount per share for a dividend.
+    """
+    __tablename__ = 'corporate_actions'
+    id = Column(Integer, primary_key=True)
+    ticker_symbol = Column(String, ForeignKey('tickers.symbol'), nullable=False)
+    ex_date = Column(DateTime(timezone=True), nullable=False)
+    action_type = Column(String, nullable=False)
+    value = Column(Float, nullable=False)
+
+    __table_args__ = (UniqueConstraint('ticker_symbol', 'ex_date', 'action_type'),)
+
+    ACTION_TYPES = ('split', 'dividend')
+
+    @staticmethod
+    def validate_action(action_type, value):
+        """Validate a corporate action before insertion"""
+        if action_type not in CorporateAction.ACTION_TYPES:
+            raise ValueError(f"action_type must be one of {CorporateAction.ACTION_TYPES}")
+        if not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError("Corporate action value must be a positive number")
+        return True
+
 class DatabaseManager:
-    def __init__(self):
-        self.engine = create_engine(
-            f"sqlite:///{config.get('DEFAULT', 'database_path')}",
-            connect_args={'check_same_thread': False, 'timeout': 15}  # Added parameters
-        )
-        # Optionally set journal mode to WAL to improve concurrency
-        with self.engine.connect() as conn:
-            conn.execute(text('PRAGMA journal_mode=WAL;'))
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+    """
+    Owns the SQLite engines shared by the fetch, streaming and command threads.
+
+    Writes go through ``engine``/``Session``; queries go through ``read_engine``/
+    ``ReadSession``, whose connections are ``query_only`` and so can never take
+    the write lock. In WAL mode readers and the single writer do not block each
+    other. Both session factories are thread-scoped, so every thread reuses
+    one session per engine instead of building a new one per call.
+    """
+
+    def __init__(self, database_path=None, profile=None, read_only=False):
+        """
+        Args:
+            database_path: SQLite file (default from the data manager config)
+            profile: Storage profile name for the PRAGMAs
+            read_only: Open only ``read_engine``/``ReadSession``. Nothing is
+                created or written, so any number of processes can open the
+                database this way alongside the writer; write methods are
+                unavailable.
+        """
+        database_path = database_path or config.get('DEFAULT', 'database_path')
+        self.pragmas = storage_pragmas(profile)
+        self.read_only = read_only
+        pool_args = {
+            'pool_size': config.get_int('storage', 'pool_size'),
+            'max_overflow': config.get_int('storage', 'max_overflow'),
+            # busy_timeout is set by the connect hook together with the other PRAGMAs
+            'connect_args': {'check_same_thread': False}
+        }
+        self.engine = None
+        self.Session = None
+        if not read_only:
+            self.engine = create_engine(f"sqlite:///{database_path}", **pool_args)
+            event.listen(self.engine, 'connect', self._apply_pragmas)
+            with self.engine.connect() as conn:
+                # auto_vacuum can only be switched on before the first table is created;
+                # existing databases are converted by enable_incremental_vacuum()
+                if not conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'").first():
+                    conn.exec_driver_sql('PRAGMA auto_vacuum=INCREMENTAL')
+                conn.execute(text('PRAGMA journal_mode=WAL;'))
+            Base.metadata.create_all(self.engine)
+            self.Session = scoped_session(sessionmaker(bind=self.engine))
+
+        self.read_engine = create_engine(f"sqlite:///{database_path}", **pool_args)
+        event.listen(self.read_engine, 'connect', self._apply_read_pragmas)
+        self.ReadSession = scoped_session(sessionmaker(bind=self.read_engine))
         self._setup_logging()
 
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        """Run the storage profile PRAGMAs on every new pooled connection"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for key, value in self.pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+        finally:
+            cursor.close()
+
+    def _apply_read_pragmas(self, dbapi_connection, connection_record):
+        self._apply_pragmas(dbapi_connection, connection_record)
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+    def remove_sessions(self):
+        """Discard the calling thread's sessions; call when a worker thread exits"""
+        if self.Session is not None:
+            self.Session.remove()
+        self.ReadSession.remove()
+
+    def dispose(self):
+        """Close every pooled connection on both engines"""
+        self.remove_sessions()
+        if self.engine is not None:
+            self.engine.dispose()
+        self.read_engine.dispose()
+
     def _setup_logging(self):
-        self.logger = logging.getLogger('database_manager')
-        self.logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(config.get('DEFAULT', 'log_file'))
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(handler)
+        self.logger = get_module_logger('database_manager', config.get('DEFAULT', 'log_file'))
 
     def add_ticker(self, symbol):
         """Add a new ticker to the database"""
@@ -82,17 +215,17 @@ class DatabaseManager:
         try:
             session.bulk_save_objects(records)
             session.commit()
-            self.logger.info(f"Bulk inserted {len(records)} records")
+            self.logger.info("Bulk inserted %d records", len(records))
         except SQLAlchemyError as e:
             session.rollback()
-            self.logger.error(f"Error in bulk insert: {str(e)}")
+            self.logger.error("Error in bulk insert: %s", e)
             raise
         finally:
             session.close()
 
     def get_historical_data(self, ticker, start_date, end_date):
         """Retrieve historical data for a specific ticker and date range"""
-        session = self.Session()
+        session = self.ReadSession()
         try:
             query = session.query(HistoricalData).filter(
                 HistoricalData.ticker_symbol == ticker,
@@ -102,6 +235,64 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_historical_frame(self, ticker, start_date, end_date):
+        """Retrieve raw bars for a ticker as a DataFrame indexed by timestamp"""
+        query = select(
+            HistoricalData.timestamp, HistoricalData.open, HistoricalData.high,
+            HistoricalData.low, HistoricalData.close, HistoricalData.volume
+        ).where(
+            HistoricalData.ticker_symbol == ticker,
+            HistoricalData.timestamp.between(start_date, end_date)
+        ).order_by(HistoricalData.timestamp)
+        with self.read_engine.connect() as conn:
+            df = pd.read_sql(query, conn)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df.set_index('timestamp')
+
+    def add_corporate_action(self, ticker, ex_date, action_type, value):
+        """Record a split or dividend; stored bars stay raw and are adjusted on read"""
+        CorporateAction.validate_action(action_type, value)
+        session = self.Session()
+        try:
+            session.add(CorporateAction(
+                ticker_symbol=ticker,
+                ex_date=ex_date,
+                action_type=action_type,
+                value=value
+            ))
+            session.commit()
+            self.logger.info("Added %s for %s on %s: %s", action_type, ticker, ex_date, value)
+        except IntegrityError:
+            session.rollback()
+            self.logger.warning("%s for %s on %s already recorded", action_type, ticker, ex_date)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error("Error adding corporate action for %s: %s", ticker, e)
+            raise
+        finally:
+            session.close()
+
+    def get_corporate_actions(self, ticker):
+        """
+        Return ``(ex_date, action_type, value, prev_close)`` tuples for a ticker
+        ordered by ex-date. ``prev_close`` is the last stored raw close before the
+        ex-date, so dividend factors are correct even for windows that end earlier.
+        """
+        prev_close = select(HistoricalData.close).where(
+            HistoricalData.ticker_symbol == CorporateAction.ticker_symbol,
+            HistoricalData.timestamp < CorporateAction.ex_date
+        ).order_by(HistoricalData.timestamp.desc()).limit(1).scalar_subquery()
+        session = self.ReadSession()
+        try:
+            rows = session.query(
+                CorporateAction.ex_date, CorporateAction.action_type, CorporateAction.value, prev_close
+            ).filter(
+                CorporateAction.ticker_symbol == ticker
+            ).order_by(CorporateAction.ex_date).all()
+            return [tuple(row) for row in rows]
+        finally:
+            session.close()
+
     def cleanup_old_data(self, days_to_keep=30):
         """Cleanup historical data older than specified days"""
         session = self.Session()
@@ -111,9 +302,17 @@ class DatabaseManager:
                 HistoricalData.timestamp < cutoff_date
             ).delete()
             session.commit()
+            self.logger.info("Cleaned up %d old records", deleted)
             if deleted > 0:
-                session.execute(text('VACUUM'))  # Defragment the database
-            self.logger.info(f"Cleaned up {deleted} old records")
+                # Return freed pages a bounded chunk at a time instead of a full VACUUM,
+                # which would lock the whole database; the maintenance scheduler reclaims the rest.
+                # Incremental vacuum does nothing until the database is converted, which is
+                # left to an explicit enable_incremental_vacuum() call.
+                if self.auto_vacuum_mode() == 2:
+                    self.incremental_vacuum(config.get_int('maintenance', 'vacuum_pages_per_run'))
+                else:
+                    self.logger.info("Freed pages stay in the database file until it is converted "
+                                     "to incremental auto-vacuum (see enable_incremental_vacuum)")
         except SQLAlchemyError as e:
             session.rollback()
             self.logger.error(f"Error during cleanup: {str(e)}")
@@ -121,6 +320,78 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @property
+    def database_path(self):
+        return self.read_engine.url.database
+
+    def wal_size(self):
+        """Size of the write-ahead log in bytes (0 when there is none)"""
+        wal_path = f"{self.database_path}-wal"
+        return os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    def wal_checkpoint(self, mode='PASSIVE'):
+        """
+        Run a WAL checkpoint.
+
+        PASSIVE never waits for readers or writers; TRUNCATE waits for them and
+        then resets the WAL file to zero bytes.
+
+        Returns:
+            Tuple ``(busy, log_frames, checkpointed_frames)`` as reported by SQLite
+        """
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        with self.engine.connect() as conn:
+            return tuple(conn.exec_driver_sql(f'PRAGMA wal_checkpoint({mode})').first())
+
+    def optimize(self, analyze=False):
+        """Refresh query planner statistics; a full ANALYZE when ``analyze`` is set"""
+        with self.engine.connect() as conn:
+            if analyze:
+                conn.exec_driver_sql('ANALYZE')
+            conn.exec_driver_sql('PRAGMA optimize')
+
+    def auto_vacuum_mode(self):
+        """0 = NONE, 1 = FULL, 2 = INCREMENTAL"""
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql('PRAGMA auto_vacuum').scalar()
+
+    def freelist_count(self):
+        """Unused pages in the database file"""
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+    def enable_incremental_vacuum(self):
+        """Switch an existing database to incremental auto-vacuum (requires one full VACUUM)"""
+        if self.auto_vacuum_mode() == 2:
+            return False
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.exec_driver_sql('VACUUM')
+        self.logger.info("Enabled incremental auto-vacuum")
+        return True
+
+    def incremental_vacuum(self, max_pages):
+        """
+        Return at most ``max_pages`` free pages to the file system.
+
+        Returns:
+            Number of pages reclaimed (always 0 unless auto_vacuum is INCREMENTAL)
+        """
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            before = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            # SQLite frees one page per statement step and the sqlite3 module
+            # only steps a row-less statement once; executescript runs it to
+            # completion
+            cursor.executescript(f'PRAGMA incremental_vacuum({int(max_pages)});')
+            after = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            cursor.close()
+        finally:
+            conn.close()
+        return before - after
+
     def create_session(self):
         """Create and return a new database session"""
         try:
@@ -153,20 +424,20 @@ class DatabaseManager:
             # Add and commit the new record
             session.add(data)
             session.commit()
-            self.logger.info(f"Appended real-time data for {bar.symbol} at {bar.timestamp} to the database")
+            self.logger.debug("Appended real-time data for %s at %s to the database", bar.symbol, bar.timestamp)
         except IntegrityError as ie:
             session.rollback()
-            self.logger.warning(f"Data for {bar.symbol} at {bar.timestamp} already exists in the database.")
+            self.logger.warning("Data for %s at %s already exists in the database.", bar.symbol, bar.timestamp)
         except SQLAlchemyError as e:
             session.rollback()
-            self.logger.error(f"Error saving real-time data: {str(e)}")
+            self.logger.error("Error saving real-time data: %s", e)
             raise
         finally:
             session.close()
             
     def get_last_timestamp(self, ticker_symbol):
         """Get the timestamp of the last record for a ticker in the database."""
-        session = self.Session()
+        session = self.ReadSession()
         try:
             last_record = session.query(HistoricalData.timestamp)\
                 .filter(HistoricalData.ticker_symbol == ticker_symbol)\
@@ -9,17 +9,19 @@ from pathlib import Path
 from .config import config
 from .alpaca_api import AlpacaAPIClient
 from .data_access_layer import db_manager, Ticker, HistoricalData
+from .adjustments import apply_adjustments
+from .maintenance import MaintenanceScheduler
 from .real_time_data import RealTimeDataStreamer
 import pytz
 from dateutil.relativedelta import relativedelta  # for accurate date calculations
 from sqlalchemy.exc import IntegrityError        # for handling database integrity errors
-import traceback         
 from datetime import datetime, timedelta
 import threading
 import json
 from zmq.error import ZMQError
 import zmq
 from .utils import append_ticker_to_csv
+from components.logging_monitoring_module.async_logging import get_module_logger, get_debug_channel
 
 
 class DataManager:
@@ -32,34 +34,35 @@ class DataManager:
         self.lock = threading.RLock()
         self.load_tickers()
         self.real_time_streamer = None
+        self.maintenance_scheduler = None
         self.logger.info("DataManager initialized.")
         self._last_maintenance = None
         self._running = True        # for clean shutdown
         self._setup_command_socket() # set up command handling first
         self.initialize_database()         # Then initialize other components
         self.start_real_time_streaming()        # Then initialize other components
+        self.start_maintenance_scheduler()
         self.logger.info("DataManager initialized.")        # for clean shutdown
 
     def _setup_logging(self):
         """Set up logging for the data manager"""
-        logger = logging.getLogger('data_manager')
-        logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(config.get('DEFAULT', 'log_file'))
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
+        logger = get_module_logger('data_manager', config.get('DEFAULT', 'log_file'))
+        # Per-batch/per-record diagnostics, throttled so bulk loads cannot flood the log
+        self.debug_log = get_debug_channel('data_manager.debug', max_per_second=10)
+        # The command loop wakes every second; report idle polling at most once a minute
+        self.command_log = get_debug_channel('data_manager.commands', max_per_second=1 / 60)
         return logger
     
     def load_tickers(self):
         """Load tickers from the tickers file."""
         tickers_file = Path(config.get('DEFAULT', 'tickers_file'))
         if not tickers_file.exists():
-            self.logger.error(f"Tickers file not found: {tickers_file}")
+            self.logger.error("Tickers file not found: %s", tickers_file)
             raise FileNotFoundError(f"Tickers file not found: {tickers_file}")
         
         with open(tickers_file, 'r') as f:
             self.tickers = [line.strip() for line in f if line.strip()]
-        self.logger.info(f"Loaded {len(self.tickers)} tickers: {self.tickers}")
+        self.logger.info("Loaded %d tickers: %s", len(self.tickers), self.tickers)
 
 
     def _save_historical_data(self, ticker, df):
@@ -85,42 +88,35 @@ class DataManager:
                         )
                         records.append(record)
                     except ValueError as e:
-                        self.logger.warning(f"Skipping invalid data point for {ticker}: {str(e)}")
-                        print(f"CRITICAL DEBUG: Skipping invalid data point for {ticker}: {str(e)}")
+                        self.debug_log.warning("Skipping invalid data point for %s: %s", ticker, e)
 
                 if records:
                     batch_size = config.get_int('DEFAULT', 'batch_size')  # Use batch_size from config
                     num_records = len(records)
-                    print(f"CRITICAL DEBUG: Attempting to save {num_records} records for {ticker}")
+                    self.debug_log.debug("Attempting to save %d records for %s", num_records, ticker)
 
                     for i in range(0, num_records, batch_size):
                         batch = records[i:i+batch_size]
                         try:
                             session.bulk_save_objects(batch)
                             session.commit()
-                            print(f"CRITICAL DEBUG: Successfully saved batch {i//batch_size +1} with {len(batch)} records")
+                            self.debug_log.debug("Saved batch %d with %d records", i // batch_size + 1, len(batch))
                         except IntegrityError as ie:
                             session.rollback()
-                            self.logger.warning(f"IntegrityError when saving batch {i//batch_size +1} for {ticker}: {str(ie)}")
-                            print(f"CRITICAL DEBUG: IntegrityError when saving batch {i//batch_size +1} for {ticker}: {str(ie)}")
+                            self.logger.warning("IntegrityError when saving batch %d for %s: %s", i // batch_size + 1, ticker, ie)
                         except Exception as e:
                             session.rollback()
-                            self.logger.error(f"Exception when saving batch {i//batch_size +1} for {ticker}: {str(e)}")
-                            print(f"CRITICAL DEBUG: Exception when saving batch {i//batch_size +1} for {ticker}: {str(e)}")
-                            traceback.print_exc()
+                            self.logger.error("Exception when saving batch %d for %s: %s", i // batch_size + 1, ticker, e, exc_info=True)
                             raise
 
-                self.logger.info(f"Stored {len(records)} records for {ticker}")
-                print(f"CRITICAL DEBUG: Stored {len(records)} records for {ticker}")
-                    
+                self.logger.info("Stored %d records for %s", len(records), ticker)
+
             except Exception as e:
                 session.rollback()
-                self.logger.error(f"Database error for {ticker}: {str(e)}")
-                print(f"CRITICAL DEBUG: Database error for {ticker}: {str(e)}")
+                self.logger.error("Database error for %s: %s", ticker, e)
                 raise
             finally:
                 session.close()
-                print("CRITICAL DEBUG: Database session closed.")
 
                     
     def _filter_market_hours(self, data, timezone):
@@ -145,7 +141,7 @@ class DataManager:
                 threading.Thread(target=self.real_time_streamer.start, daemon=True).start()
                 self.logger.info("Real-time streaming started successfully")
             except Exception as e:
-                self.logger.error(f"Failed to start real-time streaming: {str(e)}")
+                self.logger.error("Failed to start real-time streaming: %s", e)
                 raise
         else:
             self.logger.warning("Real-time streamer is already running")
@@ -158,11 +154,25 @@ class DataManager:
                 self.real_time_streamer = None
                 self.logger.info("Stopped real-time data streaming")
             except Exception as e:
-                self.logger.error(f"Error stopping real-time stream: {str(e)}")
+                self.logger.error("Error stopping real-time stream: %s", e)
                 raise
 
+    def start_maintenance_scheduler(self):
+        """Start background WAL checkpointing, statistics refresh and incremental vacuum"""
+        if not config.get_boolean('maintenance', 'enabled'):
+            return
+        if self.maintenance_scheduler is None or not self.maintenance_scheduler.is_alive():
+            self.maintenance_scheduler = MaintenanceScheduler(db_manager)
+            self.maintenance_scheduler.start()
+
+    def stop_maintenance_scheduler(self):
+        """Stop the background maintenance thread"""
+        if self.maintenance_scheduler:
+            self.maintenance_scheduler.stop()
+            self.maintenance_scheduler = None
+
     def perform_maintenance(self):
-        """Perform database maintenance"""
+        """Perform database maintenance (storage housekeeping runs on MaintenanceScheduler)"""
         try:
             current_time = datetime.now()
             if (self._last_maintenance is None or 
@@ -178,7 +188,7 @@ class DataManager:
                 self._last_maintenance = current_time
                 self.logger.info("Performed maintenance without data cleanup")
         except Exception as e:
-            self.logger.error(f"Error during maintenance: {str(e)}")
+            self.logger.error("Error during maintenance: %s", e)
             raise
 
 
@@ -187,28 +197,22 @@ class DataManager:
         try:
             data = db_manager.get_historical_data(ticker, start_date, end_date)
             if not data:
-                self.logger.error(f"No data found for {ticker} between {start_date} and {end_date}")
+                self.logger.error("No data found for %s between %s and %s", ticker, start_date, end_date)
             return data
         except Exception as e:
-            self.logger.error(f"Error retrieving historical data: {str(e)}")
+            self.logger.error("Error retrieving historical data: %s", e)
             raise
 
     def _setup_command_socket(self):
         """Setup ZeroMQ socket for receiving commands"""
         try:
-            # Add timestamp for precise timing of events
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-            startup_msg = f"{current_time} - Starting command socket initialization..."
-            self.logger.info(startup_msg)
-            print(startup_msg)  # Print to console as well
+            self.logger.info("Starting command socket initialization...")
             
             # Create new ZMQ context
             self.command_context = zmq.Context.instance()  # Using singleton instance
-            print("DEBUG: Created ZMQ context")
             
             # Create and configure socket
             self.command_socket = self.command_context.socket(zmq.REP)
-            print("DEBUG: Created REP socket")
             
             # Set socket options for better diagnostics
             self.command_socket.setsockopt(zmq.LINGER, 1000)
@@ -216,17 +220,11 @@ class DataManager:
             self.command_socket.setsockopt(zmq.SNDTIMEO, 1000)
             self.command_socket.setsockopt(zmq.IMMEDIATE, 1)
             self.command_socket.setsockopt(zmq.IPV6, 0)  # Disable IPv6
-            print("DEBUG: Socket options set")
             
             # Try to bind
             bind_addr = "tcp://*:5556"  # Bind to all interfaces
-            bind_msg = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')} - Attempting to bind to {bind_addr}"
-            self.logger.info(bind_msg)
-            print(bind_msg)
-            
-            print(f"DEBUG: About to bind socket...")
+            self.logger.info("Attempting to bind to %s", bind_addr)
             self.command_socket.bind(bind_addr)
-            print(f"DEBUG: Socket bound successfully")
             
             # Start command handler thread
             self._running = True  # Ensure this is set before starting thread
@@ -235,22 +233,16 @@ class DataManager:
                 daemon=True,
                 name="CommandHandler"
             )
-            print("DEBUG: Created command handler thread")
             self.command_thread.start()
-            print("DEBUG: Command handler thread started")
             
             # Verify thread started
             if self.command_thread.is_alive():
-                success_msg = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')} - Command socket initialized and handler thread started"
-                self.logger.info(success_msg)
-                print(success_msg)
+                self.logger.info("Command socket initialized and handler thread started")
             else:
                 raise RuntimeError("Command handler thread failed to start")
                     
         except zmq.error.ZMQError as e:
-            error_msg = f"ZMQ Error during command socket setup: {str(e)}"
-            self.logger.error(error_msg)
-            print(error_msg)
+            self.logger.error("ZMQ Error during command socket setup: %s", e)
             if hasattr(self, 'command_socket'):
                 try:
                     self.command_socket.close()
@@ -264,9 +256,7 @@ class DataManager:
             raise
             
         except Exception as e:
-            error_msg = f"Unexpected error in command socket setup: {str(e)}"
-            self.logger.error(error_msg)
-            print(error_msg)
+            self.logger.error("Unexpected error in command socket setup: %s", e)
             if hasattr(self, 'command_socket'):
                 try:
                     self.command_socket.close()
@@ -316,7 +306,7 @@ class DataManager:
 
     def _handle_commands(self):
         """Handle incoming commands"""
-        print("DEBUG: Command handler thread starting...")  # Debug print
+        self.logger.info("Command handler thread starting")
 
         # Set up a poller
         poller = zmq.Poller()
@@ -324,16 +314,15 @@ class DataManager:
 
         while self._running:
             try:
-                print("DEBUG: Waiting for command...")  # Debug print
+                self.command_log.debug("Waiting for command...")
 
                 # Poll the socket for incoming messages
                 socks = dict(poller.poll(1000))  # Wait for 1 second
                 if self.command_socket in socks and socks[self.command_socket] == zmq.POLLIN:
-                    print("DEBUG: Poll returned activity, attempting to receive...")  # Debug print
                     try:
                         # Receive the command
                         command = self.command_socket.recv_json()
-                        print(f"DEBUG: Received command: {command}")  # Debug print
+                        self.logger.info("Received command: %s", command)
 
                         response = {'success': False, 'message': ''}
 
@@ -350,14 +339,11 @@ class DataManager:
                         else:
                             response = {'success': False, 'message': 'Unknown command type'}
 
-                        print(f"DEBUG: Sending response: {response}")  # Added debug print
                         self.command_socket.send_json(response)
-                        self.logger.info(f"Sent response: {response}")
+                        self.logger.info("Sent response: %s", response)
 
                     except Exception as e:
-                        error_msg = f"Error processing command: {e}"
-                        self.logger.error(error_msg)
-                        print(f"DEBUG: {error_msg}")  # Added debug print
+                        self.logger.error("Error processing command: %s", e)
                         # Attempt to send an error response
                         try:
                             self.command_socket.send_json({
@@ -365,25 +351,23 @@ class DataManager:
                                 'message': f"Error processing command: {str(e)}"
                             })
                         except Exception as send_error:
-                            self.logger.error(f"Failed to send error response: {send_error}")
+                            self.logger.error("Failed to send error response: %s", send_error)
                         continue  # Keep the thread running
                 else:
                     # No message received, continue waiting
                     continue
 
             except Exception as e:
-                error_msg = f"Unexpected error in command handler: {e}"
-                self.logger.error(error_msg)
-                print(f"DEBUG: {error_msg}")  # Added debug print
+                self.logger.error("Unexpected error in command handler: %s", e)
                 # Sleep briefly to avoid tight loop in case of persistent error
-                time.sleep(1)
+                time_module.sleep(1)
                 continue  # Keep the thread running
 
     def reload_tickers(self):
             """Reload tickers from the tickers file dynamically."""
             with self.lock:
                 self.load_tickers()
-                print("Tickers reloaded.")
+                self.logger.info("Tickers reloaded.")
 
                 
                 
@@ -393,6 +377,7 @@ class DataManager:
         try:
             # Stop real-time streaming
             self.stop_real_time_streaming()
+            self.stop_maintenance_scheduler()
             
             # Cleanup command socket resources
             if hasattr(self, 'command_socket'):
@@ -427,40 +412,32 @@ class DataManager:
             self.logger.error(f"Error during cleanup: {str(e)}")
 
 
-    def get_backtrader_data(self, ticker, start_date, end_date):
+    def get_backtrader_data(self, ticker, start_date, end_date, adjustment='raw'):
         """
         Retrieves historical data in a format compatible with Backtrader.
 
         :param ticker: Stock ticker symbol.
         :param start_date: Start date as a datetime object.
         :param end_date: End date as a datetime object.
+        :param adjustment: 'raw', 'split' or 'all' (splits and dividends). Bars are
+            stored raw; adjusted views are derived from the corporate_actions table.
         :return: Pandas DataFrame with necessary columns.
         """
         try:
-            # Get historical data
-            data = self.get_historical_data(ticker, start_date, end_date)
-            
-            # Convert to DataFrame if we get a list
-            if isinstance(data, list):
-                df = pd.DataFrame(data)
-            else:
-                df = data
+            df = db_manager.get_historical_frame(ticker, start_date, end_date)
                 
             # Check if we have data
-            if df is None or (isinstance(df, pd.DataFrame) and df.empty):
+            if df.empty:
                 raise ValueError(f"No data found for ticker {ticker} between {start_date} and {end_date}")
-                
-            # Select and rename columns
-            if isinstance(df, pd.DataFrame):
-                df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-                df.rename(columns={'timestamp': 'datetime'}, inplace=True)
-                df.set_index('datetime', inplace=True)
-                df.index = pd.to_datetime(df.index)
+
+            df.index.name = 'datetime'
+            if adjustment != 'raw':
+                df = apply_adjustments(df, db_manager.get_corporate_actions(ticker), mode=adjustment)
                 
             return df
             
         except Exception as e:
-            self.logger.error(f"Error retrieving backtrader data for {ticker}: {str(e)}")
+            self.logger.error("Error retrieving backtrader data for %s: %s", ticker, e)
             # Return empty DataFrame instead of raising to maintain compatibility
             return pd.DataFrame()
 
@@ -470,7 +447,7 @@ class DataManager:
             end_date = datetime.now(pytz.timezone('US/Eastern'))
             start_date = end_date - timedelta(days=5*365)  # 5 years
             
-            self.logger.info(f"Fetching data for {ticker}")
+            self.logger.info("Fetching data for %s", ticker)
             data = self.alpaca_client.fetch_historical_data(
                 ticker,
                 start_date,
@@ -479,15 +456,15 @@ class DataManager:
             )
             
             if not data.empty:
-                self.logger.info(f"Storing {len(data)} records for {ticker}")
+                self.logger.info("Storing %d records for %s", len(data), ticker)
                 self._save_historical_data(ticker, data)
-                self.logger.info(f"Successfully stored data for {ticker}")
+                self.logger.info("Successfully stored data for %s", ticker)
             else:
-                self.logger.warning(f"No data received for {ticker}")
+                self.logger.warning("No data received for %s", ticker)
                 
             return data
         except Exception as e:
-            self.logger.error(f"Error in fetch_historical_data for {ticker}: {e}")
+            self.logger.error("Error in fetch_historical_data for %s: %s", ticker, e)
             raise
         
     def fetch_historical_data_for_ticker(self, ticker_symbol):
@@ -504,16 +481,14 @@ class DataManager:
                     # If we have data, start from the last record
                     # Add a small buffer (1 bar) to ensure we don't miss any data
                     start_date = last_timestamp - timedelta(minutes=1)
-                    self.logger.info(f"Fetching data for {ticker_symbol} from last record: {start_date}")
-                    print(f"Fetching data for {ticker_symbol} from last record: {start_date}")
+                    self.logger.info("Fetching data for %s from last record: %s", ticker_symbol, start_date)
                 else:
                     # If no existing data, fetch historical data for configured years
                     years = config.get_int('DEFAULT', 'historical_data_years')
                     start_date = end_date - relativedelta(years=years)
-                    self.logger.info(f"No existing data found. Fetching {years} years of historical data for {ticker_symbol}")
-                    print(f"No existing data found. Fetching {years} years of historical data for {ticker_symbol}")
+                    self.logger.info("No existing data found. Fetching %d years of historical data for %s", years, ticker_symbol)
 
-                self.logger.info(f"Fetching historical data for {ticker_symbol}")
+                self.logger.info("Fetching historical data for %s", ticker_symbol)
 
                 historical_data = self.api_client.fetch_historical_data(
                     ticker_symbol, start_date, end_date, timeframe='1Min'
@@ -522,36 +497,33 @@ class DataManager:
                 if not historical_data.empty:
                     historical_data = self._filter_market_hours(historical_data, ny_tz)
                     self._save_historical_data(ticker_symbol, historical_data)
-                    self.logger.info(f"Historical data for {ticker_symbol} fetched and stored.")
-                    print(f"Historical data for {ticker_symbol} fetched and stored.")
+                    self.logger.info("Historical data for %s fetched and stored.", ticker_symbol)
                 else:
-                    self.logger.warning(f"No historical data fetched for {ticker_symbol}")
-                    print(f"No historical data fetched for {ticker_symbol}")
+                    self.logger.warning("No historical data fetched for %s", ticker_symbol)
                     
         except Exception as e:
-            self.logger.error(f"Error fetching data for {ticker_symbol}: {str(e)}")
-            print(f"Error fetching data for {ticker_symbol}: {str(e)}")
+            self.logger.error("Error fetching data for %s: %s", ticker_symbol, e)
 
     def fetch_historical_data_async(self, ticker_symbol):
         """Fetch historical data for a ticker asynchronously."""
-        self.logger.info(f"fetch_historical_data_async for {ticker_symbol} triggered.")
+        self.logger.info("fetch_historical_data_async for %s triggered.", ticker_symbol)
         threading.Thread(target=self.fetch_historical_data_for_ticker, args=(ticker_symbol,)).start()
         
     def add_new_ticker(self, ticker):
-            self.logger.debug(f"Attempting to add ticker: {ticker}")  # Changed from logger to self.logger
+            self.logger.debug("Attempting to add ticker: %s", ticker)
             try:
                 # Log API connection attempt
-                self.logger.debug("Checking API connection")  # Changed
+                self.logger.debug("Checking API connection")
                 
                 # Log ticker validation
-                self.logger.debug(f"Validating ticker {ticker}")  # Changed
+                self.logger.debug("Validating ticker %s", ticker)
                 
                 # Log data retrieval attempt
-                self.logger.debug("Attempting to retrieve ticker data")  # Changed
+                self.logger.debug("Attempting to retrieve ticker data")
                 
                 # Validate ticker symbol format first
                 if not self._validate_ticker_symbol(ticker):
-                    self.logger.error(f"Invalid ticker symbol format: {ticker}")
+                    self.logger.error("Invalid ticker symbol format: %s", ticker)
                     return False
 
                 tickers_file = config.get('DEFAULT', 'tickers_file')
@@ -563,22 +535,21 @@ class DataManager:
                         if self.real_time_streamer:
                             try:
                                 self.real_time_streamer.update_tickers(self.tickers)
-                                self.logger.info(f"Real-time streaming updated for {ticker}")
+                                self.logger.info("Real-time streaming updated for %s", ticker)
                             except Exception as e:
-                                self.logger.error(f"Failed to update real-time streaming for {ticker}: {e}")
+                                self.logger.error("Failed to update real-time streaming for %s: %s", ticker, e)
                                 
                         # Fetch historical data last since it's async and most likely to fail
                         self.fetch_historical_data_async(ticker)
                         
-                    self.logger.info(f"Ticker {ticker} successfully added and initialization started")
-                    self.logger.debug(f"Successfully added ticker: {ticker}")  # Changed
+                    self.logger.info("Ticker %s successfully added and initialization started", ticker)
                     return True
                 
-                self.logger.warning(f"Ticker {ticker} was not added - may already exist")
+                self.logger.warning("Ticker %s was not added - may already exist", ticker)
                 return False
                 
             except Exception as e:
-                self.logger.error(f"Failed to add ticker {ticker}: {str(e)}", exc_info=True)  # Changed
+                self.logger.error("Failed to add ticker %s: %s", ticker, e, exc_info=True)
                 return False
         
     def _validate_ticker_symbol(self, symbol):
@@ -594,7 +565,7 @@ class DataManager:
             
     def get_last_record_timestamp(self, ticker_symbol):
         """Get the timestamp of the last record for a ticker in the database"""
-        session = db_manager.Session()
+        session = db_manager.ReadSession()
         try:
             last_record = session.query(HistoricalData)\
                 .filter_by(ticker_symbol=ticker_symbol)\
@@ -609,18 +580,14 @@ class DataManager:
                 else:
                     aware_timestamp = last_record.timestamp.astimezone(ny_tz)
                 
-                self.logger.info(f"Found last record for {ticker_symbol} at {aware_timestamp}")
-                print(f"CRITICAL DEBUG: Found last record for {ticker_symbol} at {aware_timestamp}")
-                print(f"CRITICAL DEBUG: Timestamp timezone info: {aware_timestamp.tzinfo}")
+                self.logger.info("Found last record for %s at %s", ticker_symbol, aware_timestamp)
                 return aware_timestamp
             else:
-                self.logger.info(f"No existing records found for {ticker_symbol}")
-                print(f"CRITICAL DEBUG: No existing records found for {ticker_symbol}")
+                self.logger.info("No existing records found for %s", ticker_symbol)
                 return None
                 
         except Exception as e:
-            self.logger.error(f"Error getting last record timestamp for {ticker_symbol}: {str(e)}")
-            print(f"CRITICAL DEBUG: Error getting last record timestamp: {str(e)}")
+            self.logger.error("Error getting last record timestamp for %s: %s", ticker_symbol, e)
             raise
         finally:
             session.close()
@@ -633,22 +600,22 @@ class DataManager:
                 current_time = datetime.now(pytz.timezone('America/New_York'))
                 # Check if we've missed any data (gap larger than 5 minutes during market hours)
                 if (current_time - last_timestamp).total_seconds() > 300:  # 5 minutes
-                    self.logger.info(f"Data gap detected for {ticker}, fetching missing data")
+                    self.logger.info("Data gap detected for %s, fetching missing data", ticker)
                     self.fetch_historical_data_for_ticker(ticker)
         except Exception as e:
-            self.logger.error(f"Error verifying data continuity for {ticker}: {str(e)}")
+            self.logger.error("Error verifying data continuity for %s: %s", ticker, e)
             raise
         
     def initialize_database(self):
         """Initialize database with historical data"""
         try:
             with self.lock:
-                print(f"CRITICAL DEBUG: Starting database initialization")
+                self.logger.info("Starting database initialization")
                 ny_tz = pytz.timezone('America/New_York')
                 end_date = datetime.now(ny_tz)
                 
                 for ticker in self.tickers:
-                    print(f"CRITICAL DEBUG: Processing ticker {ticker}")
+                    self.debug_log.debug("Processing ticker %s", ticker)
                     # Get the last record timestamp using db_manager
                     last_timestamp = db_manager.get_last_timestamp(ticker)
                     
@@ -658,44 +625,35 @@ class DataManager:
                             start_date = ny_tz.localize(last_timestamp - timedelta(minutes=1))
                         else:
                             start_date = last_timestamp - timedelta(minutes=1)
-                        print(f"CRITICAL DEBUG: Found last record for {ticker}, starting from {start_date}")
-                        print(f"CRITICAL DEBUG: Start date timezone info: {start_date.tzinfo}")
+                        self.debug_log.debug("Found last record for %s, starting from %s", ticker, start_date)
                     else:
                         # If no existing data, fetch historical data for configured years
                         years = config.get_int('DEFAULT', 'historical_data_years')
                         start_date = end_date - relativedelta(years=years)  # Will inherit timezone from end_date
-                        print(f"CRITICAL DEBUG: No existing data for {ticker}, fetching {years} years of history")
-                        print(f"CRITICAL DEBUG: Start date timezone info: {start_date.tzinfo}")
-
-                    # Print the date range for debugging
-                    print(f"CRITICAL DEBUG: Date range from {start_date} to {end_date}")
-                    print(f"CRITICAL DEBUG: End date timezone info: {end_date.tzinfo}")
+                        self.debug_log.debug("No existing data for %s, fetching %d years of history", ticker, years)
 
-                    self.logger.info(f"Fetching historical data for {ticker}")
+                    self.logger.info("Fetching historical data for %s from %s to %s", ticker, start_date, end_date)
 
                     # Fetch and store historical data
                     historical_data = self.api_client.fetch_historical_data(
                         ticker, start_date, end_date, timeframe='5Min'
                     )
 
-                    print(f"CRITICAL DEBUG: Got data empty={historical_data.empty}")
 
                     if not historical_data.empty:
                         # Filter data to market hours (9:30 AM to 4:00 PM EST)
                         historical_data = self._filter_market_hours(historical_data, ny_tz)
                         # Save historical data using _save_historical_data method
                         self._save_historical_data(ticker, historical_data)
-                        self.logger.info(f"Historical data for {ticker} fetched and stored.")
-                        print(f"Historical data for {ticker} fetched and stored.")
+                        self.logger.info("Historical data for %s fetched and stored.", ticker)
                     else:
-                        print(f"CRITICAL DEBUG: No data to save for {ticker}")
+                        self.logger.info("No data to save for %s", ticker)
 
                     # Respect rate limits
                     time_module.sleep(1)  # Ensure 'time_module' is correctly imported
 
-                print("CRITICAL DEBUG: Database initialization completed")
+                self.logger.info("Database initialization completed")
 
         except Exception as e:
-            self.logger.error(f"Error initializing database: {str(e)}")
-            print(f"CRITICAL DEBUG: Error during initialization: {str(e)}")
+            self.logger.error("Error initializing database: %s", e)
             raise
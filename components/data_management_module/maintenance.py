@@ -0,0 +1,165 @@
+# components/data_management_module/maintenance.py
+
+import threading
+import time
+from collections import deque
+
+from .config import config
+from components.logging_monitoring_module.async_logging import get_module_logger
+
+
+class MaintenanceScheduler(threading.Thread):
+    """
+    Runs SQLite housekeeping on a background thread so writers never pay for it.
+
+    Each task has its own interval:
+
+    - WAL checkpoint: PASSIVE by default, TRUNCATE once the WAL grows past
+      ``checkpoint_truncate_wal_mb`` so the file cannot grow without bound
+    - ``PRAGMA optimize``, plus a full ``ANALYZE`` on a longer interval
+    - ``PRAGMA incremental_vacuum`` limited to ``vacuum_pages_per_run`` pages,
+      so reclaiming space never holds the write lock for long. Incremental
+      vacuum does nothing on a database without incremental auto-vacuum (one
+      created before it was enabled). Converting it takes one full ``VACUUM``
+      that locks the whole database, so it only happens when
+      ``convert_incremental_vacuum`` is set; otherwise the scheduler logs that
+      incremental reclaim is unavailable. ``DatabaseManager.enable_incremental_vacuum()``
+      converts on demand, e.g. during a quiet period
+
+    Checkpoint latency, WAL size and reclaimed pages are kept in a bounded
+    history available from ``get_metrics()``.
+    """
+
+    HISTORY_SIZE = 100
+
+    def __init__(self, db_manager, settings=None):
+        super().__init__(daemon=True, name="DatabaseMaintenance")
+        self.db_manager = db_manager
+        self.logger = get_module_logger('database_maintenance', config.get('DEFAULT', 'log_file'))
+        settings = settings or {}
+
+        def setting(key, cast=int):
+            return cast(settings.get(key, config.get('maintenance', key)))
+
+        self.poll_interval = setting('poll_interval', float)
+        self.intervals = {
+            'checkpoint': setting('checkpoint_interval', float),
+            'optimize': setting('optimize_interval', float),
+            'analyze': setting('analyze_interval', float),
+            'vacuum': setting('vacuum_interval', float)
+        }
+        self.truncate_threshold = setting('checkpoint_truncate_wal_mb', float) * 1024 * 1024
+        self.vacuum_pages = setting('vacuum_pages_per_run')
+        self.convert_vacuum = setting('convert_incremental_vacuum',
+                                      lambda value: str(value).lower() in ('1', 'true', 'yes', 'on'))
+        self._vacuum_unavailable_logged = False
+
+        now = time.monotonic()
+        self._next_run = {task: now + interval for task, interval in self.intervals.items()}
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=self.HISTORY_SIZE)
+        self._totals = {'checkpoints': 0, 'truncates': 0, 'pages_reclaimed': 0, 'errors': 0}
+
+    def run(self):
+        self.logger.info("Database maintenance scheduler started")
+        while not self._stop_event.wait(timeout=self.poll_interval):
+            self.run_pending()
+        self.logger.info("Database maintenance scheduler stopped")
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=5)
+
+    def run_pending(self, force=False):
+        """Run every task whose interval has elapsed (or all of them when ``force`` is set)"""
+        now = time.monotonic()
+        for task, interval in self.intervals.items():
+            if force or now >= self._next_run[task]:
+                self._next_run[task] = now + interval
+                try:
+                    getattr(self, f'_run_{task}')()
+                except Exception as e:
+                    with self._lock:
+                        self._totals['errors'] += 1
+                    self.logger.error("Maintenance task %s failed: %s", task, e)
+
+    def _record(self, task, **values):
+        entry = {'task': task, 'time': time.time()}
+        entry.update(values)
+        with self._lock:
+            self._history.append(entry)
+
+    def _run_checkpoint(self):
+        wal_before = self.db_manager.wal_size()
+        mode = 'TRUNCATE' if wal_before >= self.truncate_threshold else 'PASSIVE'
+        started = time.perf_counter()
+        busy, log_frames, checkpointed = self.db_manager.wal_checkpoint(mode)
+        latency = time.perf_counter() - started
+        wal_after = self.db_manager.wal_size()
+        with self._lock:
+            self._totals['checkpoints'] += 1
+            if mode == 'TRUNCATE':
+                self._totals['truncates'] += 1
+        self._record('checkpoint', mode=mode, latency=latency, busy=busy, log_frames=log_frames,
+                     checkpointed=checkpointed, wal_before=wal_before, wal_after=wal_after)
+        self.logger.info("WAL checkpoint (%s) in %.3fs: %d/%d frames, WAL %d -> %d bytes",
+                         mode, latency, checkpointed, log_frames, wal_before, wal_after)
+
+    def _run_optimize(self):
+        started = time.perf_counter()
+        self.db_manager.optimize()
+        self._record('optimize', latency=time.perf_counter() - started)
+
+    def _run_analyze(self):
+        started = time.perf_counter()
+        self.db_manager.optimize(analyze=True)
+        latency = time.perf_counter() - started
+        self._record('analyze', latency=latency)
+        self.logger.info("ANALYZE completed in %.3fs", latency)
+
+    def _run_vacuum(self):
+        started = time.perf_counter()
+        if self.db_manager.auto_vacuum_mode() != 2 and not self.convert_vacuum:
+            if not self._vacuum_unavailable_logged:
+                self.logger.warning("Incremental vacuum is unavailable: the database was created without "
+                                    "incremental auto-vacuum. Set maintenance.convert_incremental_vacuum or call "
+                                    "DatabaseManager.enable_incremental_vacuum() to convert it with one full VACUUM")
+                self._vacuum_unavailable_logged = True
+            self._record('vacuum', mode='unavailable', latency=time.perf_counter() - started, pages=0)
+            return
+        if self.db_manager.auto_vacuum_mode() != 2:
+            # The conversion's full VACUUM reclaims every free page at once
+            reclaimed = self.db_manager.freelist_count()
+            self.db_manager.enable_incremental_vacuum()
+            mode = 'convert'
+        else:
+            reclaimed = self.db_manager.incremental_vacuum(self.vacuum_pages)
+            mode = 'incremental'
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._totals['pages_reclaimed'] += reclaimed
+        self._record('vacuum', mode=mode, latency=latency, pages=reclaimed)
+        if mode == 'convert':
+            self.logger.info("Converted database to incremental auto-vacuum in %.3fs, reclaiming %d pages",
+                             latency, reclaimed)
+        elif reclaimed:
+            self.logger.info("Incremental vacuum reclaimed %d pages in %.3fs", reclaimed, latency)
+
+    def get_metrics(self):
+        """Current WAL size, running totals and the most recent run of each task"""
+        with self._lock:
+            history = list(self._history)
+            totals = dict(self._totals)
+        last = {}
+        for entry in history:
+            last[entry['task']] = entry
+        checkpoint_latencies = [e['latency'] for e in history if e['task'] == 'checkpoint']
+        return {
+            'wal_size_bytes': self.db_manager.wal_size(),
+            'totals': totals,
+            'last_run': last,
+            'max_checkpoint_latency': max(checkpoint_latencies) if checkpoint_latencies else None,
+            'history': history
+        }
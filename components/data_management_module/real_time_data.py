@@ -10,6 +10,7 @@ from alpaca_trade_api.stream import Stream
 from alpaca_trade_api.common import URL
 from .config import config
 from .data_access_layer import db_manager, HistoricalData
+from components.logging_monitoring_module.async_logging import get_module_logger
 import pytz
 
 class RealTimeDataStreamer:
@@ -39,12 +40,7 @@ class RealTimeDataStreamer:
 
     def _setup_logging(self):
         """Set up logging for the real-time data streamer"""
-        logger = logging.getLogger('realtime_data')
-        logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(config.get('DEFAULT', 'log_file'))
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
-        return logger
+        return get_module_logger('realtime_data', config.get('DEFAULT', 'log_file'))
 
     async def _is_market_hours(self):
         """Check if current time is within market hours"""
@@ -78,7 +74,7 @@ class RealTimeDataStreamer:
             #     pass
 
         except Exception as e:
-            self.logger.error(f"Error processing bar data: {str(e)}")
+            self.logger.error("Error processing bar data: %s", e)
             
     def update_tickers(self, new_tickers):
         """Update the list of tickers being streamed."""
@@ -148,9 +144,9 @@ class RealTimeDataStreamer:
             # Save real-time data using db_manager
             db_manager.save_real_time_data(bar)
             # Log confirmation
-            self.logger.info(f"Stored real-time data for {bar.symbol} at {bar.timestamp}")
+            self.logger.debug("Stored real-time data for %s at %s", bar.symbol, bar.timestamp)
         except Exception as e:
-            self.logger.error(f"Failed to store bar data: {str(e)}")
+            self.logger.error("Failed to store bar data: %s", e)
 
 
     def _publish_bar_data(self, bar):
@@ -168,10 +164,10 @@ class RealTimeDataStreamer:
 
             topic = f"{config.get('DEFAULT', 'zeromq_topic')}.{bar.symbol}"
             self.publisher.send_string(f"{topic} {json.dumps(message)}")
-            self.logger.debug(f"Published bar data for {bar.symbol}")
+            self.logger.debug("Published bar data for %s", bar.symbol)
 
         except Exception as e:
-            self.logger.error(f"Failed to publish bar data: {str(e)}")
+            self.logger.error("Failed to publish bar data: %s", e)
 
 
     def start(self):
@@ -186,7 +182,7 @@ class RealTimeDataStreamer:
         # Subscribe to bars for all tickers
         for ticker in self.tickers:
             self.stream.subscribe_bars(self.handle_bar, ticker)
-            self.logger.info(f"Subscribed to bars for {ticker}")
+            self.logger.info("Subscribed to bars for %s", ticker)
 
         # Start the stream in a separate thread
         try:
@@ -234,4 +230,4 @@ class RealTimeDataStreamer:
                 self.logger.info(f"Subscribed to bars for {ticker}")
 
             self.tickers = new_tickers
-            print("Tickers updated for streaming.")
+            self.logger.info("Tickers updated for streaming.")
@@ -0,0 +1,260 @@
+# components/data_management_module/snapshot.py
+
+import hashlib
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+SNAPSHOT_VERSION = 1
+FORMATS = {'feather': '.arrow', 'parquet': '.parquet'}
+
+# SQLAlchemy stores DateTime values in SQLite as text in this layout
+SQLITE_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# historical_data as declared by data_access_layer.HistoricalData, minus the
+# unique constraint, which is created as an index once the bulk load is done
+_HISTORICAL_DATA_DDL = """
+    CREATE TABLE historical_data (
+        id INTEGER NOT NULL PRIMARY KEY,
+        ticker_symbol VARCHAR REFERENCES tickers (symbol),
+        timestamp DATETIME NOT NULL,
+        open FLOAT NOT NULL,
+        high FLOAT NOT NULL,
+        low FLOAT NOT NULL,
+        close FLOAT NOT NULL,
+        volume INTEGER NOT NULL
+    )
+"""
+_TABLE_DDL = {
+    'tickers': """
+        CREATE TABLE tickers (
+            symbol VARCHAR NOT NULL PRIMARY KEY,
+            last_updated DATETIME,
+            added_date DATETIME
+        )
+    """,
+    'corporate_actions': """
+        CREATE TABLE corporate_actions (
+            id INTEGER NOT NULL PRIMARY KEY,
+            ticker_symbol VARCHAR NOT NULL REFERENCES tickers (symbol),
+            ex_date DATETIME NOT NULL,
+            action_type VARCHAR NOT NULL,
+            value FLOAT NOT NULL,
+            UNIQUE (ticker_symbol, ex_date, action_type)
+        )
+    """
+}
+_HISTORICAL_DATA_INDEX = """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_historical_data_ticker_timestamp
+    ON historical_data (ticker_symbol, timestamp)
+"""
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is incomplete or fails verification"""
+    pass
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Snapshots require pyarrow. Install it with 'pip install pyarrow'.") from e
+
+
+def _sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_frame(df, path, fmt):
+    if fmt == 'feather':
+        # Feather v2 is the Arrow IPC file format
+        df.to_feather(path, compression='zstd')
+    else:
+        df.to_parquet(path, compression='zstd', index=False)
+
+
+def _read_frame(path, fmt):
+    return pd.read_feather(path) if fmt == 'feather' else pd.read_parquet(path)
+
+
+def _table_exists(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone() is not None
+
+
+def export_snapshot(database_path, output_dir, tickers=None, fmt='feather'):
+    """
+    Write one columnar file per ticker plus a manifest with row counts and checksums.
+
+    All reads happen inside a single read transaction, so the snapshot is
+    consistent even while the DataManager keeps writing to the WAL.
+
+    Args:
+        database_path: Path of the market data SQLite database
+        output_dir: Directory to create the snapshot in
+        tickers: Tickers to export; defaults to every ticker with stored bars
+        fmt: 'feather' (Arrow IPC) or 'parquet'
+
+    Returns:
+        The manifest as a dict
+    """
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Invalid snapshot format '{fmt}'. Expected one of {list(FORMATS)}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)
+    try:
+        conn.execute('BEGIN')
+        if tickers is None:
+            tickers = [row[0] for row in conn.execute(
+                "SELECT DISTINCT ticker_symbol FROM historical_data ORDER BY ticker_symbol"
+            )]
+
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'created_at': datetime.utcnow().isoformat(),
+            'source': str(database_path),
+            'format': fmt,
+            'tickers': {},
+            'tables': {}
+        }
+
+        for ticker in tickers:
+            df = pd.read_sql_query(
+                "SELECT timestamp, open, high, low, close, volume FROM historical_data "
+                "WHERE ticker_symbol = ? ORDER BY timestamp",
+                conn, params=(ticker,)
+            )
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            path = output_dir / f"{ticker}{FORMATS[fmt]}"
+            _write_frame(df, path, fmt)
+            manifest['tickers'][ticker] = {
+                'file': path.name,
+                'rows': len(df),
+                'start': df['timestamp'].min().isoformat() if len(df) else None,
+                'end': df['timestamp'].max().isoformat() if len(df) else None,
+                'sha256': _sha256(path)
+            }
+            logger.info("Exported %d bars for %s", len(df), ticker)
+
+        for table in ('tickers', 'corporate_actions'):
+            if not _table_exists(conn, table):
+                continue
+            df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+            path = output_dir / f"_{table}{FORMATS[fmt]}"
+            _write_frame(df, path, fmt)
+            manifest['tables'][table] = {'file': path.name, 'rows': len(df), 'sha256': _sha256(path)}
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+    with open(output_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    logger.info("Snapshot of %d tickers written to %s", len(manifest['tickers']), output_dir)
+    return manifest
+
+
+def load_manifest(snapshot_dir, verify=True):
+    """Read a snapshot manifest and optionally verify every file's checksum"""
+    snapshot_dir = Path(snapshot_dir)
+    manifest_path = snapshot_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise SnapshotError(f"No manifest found in {snapshot_dir}")
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {manifest.get('version')}")
+
+    if verify:
+        entries = list(manifest['tickers'].values()) + list(manifest['tables'].values())
+        for entry in entries:
+            path = snapshot_dir / entry['file']
+            if not path.exists():
+                raise SnapshotError(f"Missing snapshot file: {entry['file']}")
+            if _sha256(path) != entry['sha256']:
+                raise SnapshotError(f"Checksum mismatch for {entry['file']}")
+    return manifest
+
+
+def import_snapshot(snapshot_dir, database_path, verify=True):
+    """
+    Bulk-load a snapshot into a market data database.
+
+    Into a database without a historical_data table the bars are appended
+    with no secondary index and journaling relaxed, and the unique
+    (ticker_symbol, timestamp) index is built once at the end. Into an
+    existing database rows are merged with INSERT OR IGNORE, so importing
+    over live data never duplicates bars.
+
+    Args:
+        snapshot_dir: Directory written by ``export_snapshot``
+        database_path: Target SQLite database (created if missing)
+        verify: Check file checksums against the manifest first
+
+    Returns:
+        Dict mapping ticker to the number of rows read from the snapshot
+    """
+    _require_pyarrow()
+    snapshot_dir = Path(snapshot_dir)
+    manifest = load_manifest(snapshot_dir, verify=verify)
+    fmt = manifest['format']
+
+    conn = sqlite3.connect(database_path)
+    try:
+        fresh = not _table_exists(conn, 'historical_data')
+        if fresh:
+            conn.execute('PRAGMA journal_mode=OFF')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute(_HISTORICAL_DATA_DDL)
+        insert = "INSERT INTO" if fresh else "INSERT OR IGNORE INTO"
+
+        for table, entry in manifest['tables'].items():
+            df = _read_frame(snapshot_dir / entry['file'], fmt)
+            if not _table_exists(conn, table):
+                conn.execute(_TABLE_DDL[table])
+            columns = ', '.join(df.columns)
+            placeholders = ', '.join('?' for _ in df.columns)
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            conn.executemany(f"INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+        counts = {}
+        for ticker, entry in manifest['tickers'].items():
+            df = _read_frame(snapshot_dir / entry['file'], fmt)
+            timestamps = df['timestamp'].dt.strftime(SQLITE_DATETIME_FORMAT)
+            rows = zip(
+                [ticker] * len(df), timestamps,
+                df['open'].tolist(), df['high'].tolist(), df['low'].tolist(),
+                df['close'].tolist(), df['volume'].astype('int64').tolist()
+            )
+            conn.executemany(
+                f"{insert} historical_data (ticker_symbol, timestamp, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            counts[ticker] = len(df)
+            logger.info("Imported %d bars for %s", len(df), ticker)
+
+        if fresh:
+            conn.execute(_HISTORICAL_DATA_INDEX)
+        conn.commit()
+        if fresh:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('ANALYZE')
+    finally:
+        conn.close()
+    return counts
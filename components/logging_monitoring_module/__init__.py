@@ -2,6 +2,7 @@
 
 # Import core components for top-level access and mocking
 from .alerts import send_alert
+from .async_logging import get_module_logger, get_debug_channel
 from .config import LoggingConfig, MonitoringConfig
 from .logger import get_logger
 from .monitor import HealthMonitor
\ No newline at end of file
@@ -0,0 +1,238 @@
+# File: components/logging_monitoring_module/async_logging.py
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+from .config import LoggingConfig
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_lock = threading.Lock()
+_queue = None
+_listener = None
+_sinks = {}       # sink key ('console' or absolute file path) -> handler owned by the listener
+_routes = {}      # frozenset of sink keys -> QueueHandler shared by loggers with that routing
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler calls ``format()`` in the emitting thread, which is
+    exactly the cost we want off the hot path. Records are enqueued as-is with
+    the set of sinks they should be written to; when the queue is full the
+    record is dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue, sinks):
+        super().__init__(log_queue)
+        self.sinks = frozenset(sinks)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference frames that may be gone by the time the
+            # listener runs, so render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record._sinks = self.sinks
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _RoutingHandler(logging.Handler):
+    """Listener-side handler that dispatches each record to its sinks."""
+
+    def handle(self, record):
+        for key in getattr(record, '_sinks', ()):
+            sink = _sinks.get(key)
+            if sink is not None and record.levelno >= sink.level:
+                sink.handle(record)
+        return True
+
+    def emit(self, record):
+        pass
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template: at most ``rate`` records per ``per``
+    seconds pass for any given ``record.msg``.
+    """
+
+    def __init__(self, rate=1, per=1.0):
+        super().__init__()
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = max(1.0, self.rate)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(record.msg, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate / self.per)
+            if tokens < 1.0:
+                self._buckets[record.msg] = (tokens, now)
+                return False
+            self._buckets[record.msg] = (tokens - 1.0, now)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Pass one record in every ``every`` records for each message template."""
+
+    def __init__(self, every=100):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        with self._lock:
+            count = self._counts.get(record.msg, 0)
+            self._counts[record.msg] = count + 1
+        return count % self.every == 0
+
+
+def _get_queue():
+    """Create the shared queue and start the writer thread on first use."""
+    global _queue, _listener
+    if _listener is None:
+        _queue = queue.Queue(maxsize=LoggingConfig.QUEUE_SIZE)
+        _listener = logging.handlers.QueueListener(_queue, _RoutingHandler(), respect_handler_level=False)
+        _listener.start()
+        atexit.register(stop_listener)
+    return _queue
+
+
+def _get_sink(key):
+    if key not in _sinks:
+        if key == 'console':
+            handler = logging.StreamHandler(sys.stdout)
+        else:
+            log_dir = os.path.dirname(key)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            handler = logging.FileHandler(key, encoding='utf8')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _sinks[key] = handler
+    return _sinks[key]
+
+
+def get_module_logger(name, log_file=None, level=logging.INFO, console=None):
+    """
+    Return a logger whose output is written by the background listener thread.
+
+    Safe to call every time a component is constructed: each logger gets at
+    most one queue handler, and every file is opened exactly once no matter
+    how many loggers write to it. The logger does not propagate, so records
+    are not written a second time by handlers configured on the root logger.
+
+    Args:
+        name: Logger name
+        log_file: File the records are written to, if any
+        level: Logger level
+        console: Also write to stdout. Defaults to ``LoggingConfig.LOG_TO_CONSOLE``
+    """
+    if console is None:
+        console = LoggingConfig.LOG_TO_CONSOLE
+    keys = set()
+    if log_file:
+        keys.add(os.path.abspath(log_file))
+    if console:
+        keys.add('console')
+
+    logger = logging.getLogger(name)
+    with _lock:
+        log_queue = _get_queue()
+        for key in keys:
+            _get_sink(key)
+        route = frozenset(keys)
+        if route not in _routes:
+            _routes[route] = DeferredQueueHandler(log_queue, route)
+        handler = _routes[route]
+        for existing in list(logger.handlers):
+            if isinstance(existing, DeferredQueueHandler) and existing is not handler:
+                logger.removeHandler(existing)
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def get_debug_channel(name, max_per_second=None, sample_every=None, level=None):
+    """
+    Return a child logger for high-frequency diagnostics.
+
+    The channel inherits the parent's handlers through propagation, is
+    disabled unless ``LoggingConfig.DEBUG_CHANNELS`` (or ``level``) enables
+    DEBUG, and can be throttled so a per-chunk or per-second message cannot
+    flood the queue.
+
+    Args:
+        name: Dotted logger name, normally ``'<parent>.<channel>'``
+        max_per_second: Rate limit per message template; fractions such as
+            ``1 / 60`` allow one record a minute
+        sample_every: Keep one record in N per message template
+        level: Explicit level; defaults to DEBUG when debug channels are on
+    """
+    channel = logging.getLogger(name)
+    if level is None:
+        level = logging.DEBUG if LoggingConfig.DEBUG_CHANNELS else logging.WARNING
+    channel.setLevel(level)
+    for existing in list(channel.filters):
+        if isinstance(existing, (RateLimitFilter, SamplingFilter)):
+            channel.removeFilter(existing)
+    if sample_every:
+        channel.addFilter(SamplingFilter(sample_every))
+    if max_per_second:
+        channel.addFilter(RateLimitFilter(rate=max_per_second, per=1.0))
+    return channel
+
+
+def dropped_records():
+    """Number of records discarded because the queue was full."""
+    return sum(handler.dropped for handler in _routes.values())
+
+
+def flush(timeout=5.0):
+    """Block until every queued record has been written."""
+    if _queue is None:
+        return
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for sink in list(_sinks.values()):
+        sink.flush()
+
+
+def stop_listener():
+    """Drain the queue, stop the writer thread and close all sinks."""
+    global _queue, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            _queue = None
+        for handler in _routes.values():
+            for logger in logging.Logger.manager.loggerDict.values():
+                if isinstance(logger, logging.Logger) and handler in logger.handlers:
+                    logger.removeHandler(handler)
+        _routes.clear()
+        for sink in _sinks.values():
+            sink.close()
+        _sinks.clear()
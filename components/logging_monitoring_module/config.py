@@ -9,6 +9,9 @@ load_dotenv()
 class LoggingConfig:
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'logs/application.log')
+    LOG_TO_CONSOLE = os.getenv('LOG_TO_CONSOLE', 'True') == 'True'
+    DEBUG_CHANNELS = os.getenv('LOG_DEBUG_CHANNELS', 'False') == 'True'
+    QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
     _initialized = False
 
     @classmethod
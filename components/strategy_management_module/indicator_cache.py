@@ -0,0 +1,143 @@
+# File: components/strategy_management_module/indicator_cache.py
+"""
+Memoized indicator arrays shared by every strategy instance in a process.
+
+Optimization sweeps build one strategy per parameter combination over the
+same price series, so the same SMA/EMA/rolling std is requested again and
+again. Results are keyed by (data fingerprint, indicator, params) and kept
+in an LRU bounded by total bytes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class IndicatorCache:
+    """Thread-safe LRU of read-only NumPy arrays, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Return the cached array for ``key``, computing and storing it on a miss.
+
+        Arrays are returned read-only, so a caller cannot corrupt the copy
+        other strategies will receive.
+        """
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = np.asarray(compute(), dtype=np.float64)
+        value.setflags(write=False)
+        with self._lock:
+            if key not in self._entries and value.nbytes <= self.max_bytes:
+                self._entries[key] = value
+                self._bytes += value.nbytes
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Process-wide cache used by the strategies
+indicator_cache = IndicatorCache()
+
+
+def fingerprint(values) -> str:
+    """
+    Content hash of a price series.
+
+    Hashing is far cheaper than any indicator it guards (blake2b runs at
+    roughly 1 GB/s), and hashing the content rather than caching by object
+    identity means data modified in place can never be served stale results.
+    """
+    array = np.ascontiguousarray(values.to_numpy() if isinstance(values, pd.Series) else values)
+    digest = hashlib.blake2b(array.tobytes(), digest_size=16)
+    digest.update(repr((array.shape, array.dtype.str)).encode())
+    return digest.hexdigest()
+
+
+def cached(name: str, values, params: tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+    """Look up ``name(params)`` over ``values`` in the process-wide cache."""
+    return indicator_cache.get_or_compute((fingerprint(values), name) + tuple(params), compute)
+
+
+def _series(values) -> pd.Series:
+    return values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=np.float64))
+
+
+# Indicators with the pandas conventions used by StrategyBase.generate_signals
+
+def sma(values, window: int, min_periods: int = None) -> np.ndarray:
+    """``Series.rolling(window, min_periods).mean()``"""
+    return cached('sma', values, (window, min_periods),
+                  lambda: _series(values).rolling(window=window, min_periods=min_periods).mean().to_numpy())
+
+
+def rolling_std(values, window: int, min_periods: int = None) -> np.ndarray:
+    """``Series.rolling(window, min_periods).std()`` (sample standard deviation)"""
+    return cached('rolling_std', values, (window, min_periods),
+                  lambda: _series(values).rolling(window=window, min_periods=min_periods).std().to_numpy())
+
+
+def ema(values, span: int) -> np.ndarray:
+    """``Series.ewm(span, adjust=False).mean()``"""
+    return cached('ema', values, (span,),
+                  lambda: _series(values).ewm(span=span, adjust=False).mean().to_numpy())
+
+
+def pct_change(values, periods: int) -> np.ndarray:
+    """``Series.pct_change(periods)``"""
+    return cached('pct_change', values, (periods,),
+                  lambda: _series(values).pct_change(periods=periods).to_numpy())
+
+
+def rsi(values, period: int) -> np.ndarray:
+    """RSI from simple rolling means of gains and losses (``min_periods=1``), as RSIStrategy computes it."""
+    def compute():
+        delta = _series(values).diff()
+        gain = delta.where(delta > 0, 0).fillna(0)
+        loss = (-delta.where(delta < 0, 0)).fillna(0)
+        avg_gain = gain.rolling(window=period, min_periods=1).mean()
+        avg_loss = loss.rolling(window=period, min_periods=1).mean()
+        rs = avg_gain / avg_loss
+        return (100 - (100 / (1 + rs))).to_numpy()
+    return cached('rsi', values, (period,), compute)
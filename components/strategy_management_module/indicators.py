@@ -0,0 +1,250 @@
+# File: components/strategy_management_module/indicators.py
+"""
+Streaming indicators for incremental (bar by bar) signal generation.
+
+Each indicator keeps a constant amount of state and updates in O(1) per bar.
+The arithmetic mirrors the pandas rolling/ewm routines used by
+``generate_signals`` (compensated running sums, Welford variance), so the
+incremental path produces the same values as the batch path.
+"""
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable
+
+NAN = float('nan')
+
+
+class StreamingIndicator(ABC):
+    """Base class: feed values with ``update`` and read the latest ``value``."""
+
+    value = NAN
+
+    @abstractmethod
+    def update(self, value: float):
+        """Add one observation and return the updated indicator value."""
+        pass
+
+    def extend(self, values: Iterable[float]):
+        """Initialize from history; returns the value after the last observation."""
+        for value in values:
+            self.update(value)
+        return self.value
+
+
+class RollingMean(StreamingIndicator):
+    """``Series.rolling(window, min_periods).mean()``"""
+
+    def __init__(self, window: int, min_periods: int = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = deque(maxlen=window)
+        self._reset()
+
+    def _reset(self):
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev = NAN
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.window == 1:
+            self._reset()
+        elif len(self._values) == self.window:
+            self._remove(self._values[0])
+        self._values.append(value)
+        self._add(value)
+        self.value = self._mean()
+        return self.value
+
+    def _add(self, value):
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        self._same_count = self._same_count + 1 if value == self._prev else 1
+        self._prev = value
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+    def _mean(self):
+        if self._nobs < max(self.min_periods, 1):
+            return NAN
+        if self._same_count >= self._nobs:
+            return self._prev
+        result = self._sum / self._nobs
+        if (self._neg_ct == 0 and result < 0) or (self._neg_ct == self._nobs and result > 0):
+            return 0.0
+        return result
+
+
+class RollingStd(StreamingIndicator):
+    """``Series.rolling(window, min_periods).std()`` (sample standard deviation)"""
+
+    def __init__(self, window: int, min_periods: int = None, ddof: int = 1):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.ddof = ddof
+        self._values = deque(maxlen=window)
+        self._reset()
+
+    def _reset(self):
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev = NAN
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.window == 1:
+            self._reset()
+        elif len(self._values) == self.window:
+            self._remove(self._values[0])
+        self._values.append(value)
+        self._add(value)
+        self.value = self._std()
+        return self.value
+
+    def _add(self, value):
+        if value != value:
+            return
+        self._same_count = self._same_count + 1 if value == self._prev else 1
+        self._prev = value
+        self._nobs += 1
+        prev_mean = self._mean - self._comp_add
+        y = value - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean += t / self._nobs
+        self._ssqdm += (value - prev_mean) * (value - self._mean)
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self._nobs -= 1
+        if not self._nobs:
+            self._mean = self._ssqdm = 0.0
+            return
+        prev_mean = self._mean - self._comp_remove
+        y = value - self._comp_remove
+        t = y - self._mean
+        self._comp_remove = t + self._mean - y
+        self._mean -= t / self._nobs
+        self._ssqdm -= (value - prev_mean) * (value - self._mean)
+
+    def _std(self):
+        if self._nobs < max(self.min_periods, 1) or self._nobs <= self.ddof:
+            return NAN
+        if self._nobs == 1 or self._same_count >= self._nobs:
+            return 0.0
+        return math.sqrt(max(self._ssqdm / (self._nobs - self.ddof), 0.0))
+
+
+class EMA(StreamingIndicator):
+    """``Series.ewm(span=span, adjust=False).mean()``, or ``alpha`` for Wilder-style smoothing"""
+
+    def __init__(self, span: float = None, alpha: float = None):
+        if alpha is None:
+            alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        self._old_wt_factor = 1.0 - alpha
+        self._new_wt = alpha
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.value == self.value:
+            if value == value and self.value != value:
+                old_wt = self._old_wt_factor
+                self.value = (old_wt * self.value + self._new_wt * value) / (old_wt + self._new_wt)
+        elif value == value:
+            self.value = value
+        return self.value
+
+
+class Momentum(StreamingIndicator):
+    """``Series.pct_change(periods)``"""
+
+    def __init__(self, periods: int):
+        self.periods = periods
+        self._values = deque(maxlen=periods + 1)
+
+    def update(self, value: float) -> float:
+        self._values.append(float(value))
+        if len(self._values) <= self.periods:
+            self.value = NAN
+        else:
+            self.value = _divide(self._values[-1], self._values[0]) - 1
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """
+    Relative strength index.
+
+    ``method='simple'`` averages gains and losses over a rolling window
+    (``min_periods=1``) as RSIStrategy does; ``method='wilder'`` uses Wilder's
+    exponential smoothing with ``alpha = 1 / period``.
+    """
+
+    def __init__(self, period: int, method: str = 'simple'):
+        if method == 'simple':
+            self._avg_gain, self._avg_loss = RollingMean(period, 1), RollingMean(period, 1)
+        elif method == 'wilder':
+            self._avg_gain, self._avg_loss = EMA(alpha=1.0 / period), EMA(alpha=1.0 / period)
+        else:
+            raise ValueError(f"Unknown RSI method '{method}'")
+        self._prev = None
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        delta = NAN if self._prev is None else value - self._prev
+        self._prev = value
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        rs = _divide(self._avg_gain.update(gain), self._avg_loss.update(loss))
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class MACD(StreamingIndicator):
+    """MACD line and its signal line; ``value`` is the tuple ``(macd, signal)``"""
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        self._fast = EMA(fast_period)
+        self._slow = EMA(slow_period)
+        self._signal = EMA(signal_period)
+        self.value = (NAN, NAN)
+
+    def update(self, value: float):
+        macd = self._fast.update(value) - self._slow.update(value)
+        self.value = (macd, self._signal.update(macd))
+        return self.value
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with IEEE semantics (inf/nan) instead of ZeroDivisionError, as pandas divides."""
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
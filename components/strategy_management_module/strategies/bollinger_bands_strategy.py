@@ -1,5 +1,7 @@
 # File: components/strategy_management_module/strategies/bollinger_bands_strategy.py
 from components.strategy_management_module.strategies.strategy_base import StrategyBase
+from components.strategy_management_module import indicator_cache as ind
+from components.strategy_management_module import indicators
 import pandas as pd
 
 class BollingerBandsStrategy(StrategyBase):
@@ -28,8 +30,8 @@ class BollingerBandsStrategy(StrategyBase):
 
     def generate_signals(self, data):
         """Generate trading signals."""
-        rolling_mean = data['close'].rolling(window=self.params['window']).mean()
-        rolling_std = data['close'].rolling(window=self.params['window']).std()
+        rolling_mean = pd.Series(ind.sma(data['close'], self.params['window']), index=data.index)
+        rolling_std = pd.Series(ind.rolling_std(data['close'], self.params['window']), index=data.index)
         
         upper_band = rolling_mean + (rolling_std * self.params['num_std'])
         lower_band = rolling_mean - (rolling_std * self.params['num_std'])
@@ -40,4 +42,16 @@ class BollingerBandsStrategy(StrategyBase):
                            (data['close'] >= upper_band).astype(float))
         signals['positions'] = signals['signal'].diff()
         
-        return signals
\ No newline at end of file
+        return signals
+
+    def on_bar(self, bar):
+        """Update the bands with one bar and return its signal."""
+        if self._state is None:
+            self._state = (indicators.RollingMean(self.params['window']),
+                           indicators.RollingStd(self.params['window']))
+        rolling_mean, rolling_std = self._state
+        close = float(bar['close'])
+        mean, std = rolling_mean.update(close), rolling_std.update(close)
+        upper_band = mean + (std * self.params['num_std'])
+        lower_band = mean - (std * self.params['num_std'])
+        return float(close <= lower_band) - float(close >= upper_band)
@@ -1,5 +1,7 @@
 # File: components/strategy_management_module/strategies/macd_strategy.py
 from components.strategy_management_module.strategies.strategy_base import StrategyBase
+from components.strategy_management_module import indicator_cache as ind
+from components.strategy_management_module import indicators
 import pandas as pd
 
 class MACDStrategy(StrategyBase):
@@ -31,17 +33,23 @@ class MACDStrategy(StrategyBase):
 
     def generate_signals(self, data):
         """Generate trading signals."""
-        exp1 = data['close'].ewm(span=self.params['fast_period'], 
-                                adjust=False).mean()
-        exp2 = data['close'].ewm(span=self.params['slow_period'], 
-                                adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=self.params['signal_period'], 
-                              adjust=False).mean()
+        exp1 = ind.ema(data['close'], self.params['fast_period'])
+        exp2 = ind.ema(data['close'], self.params['slow_period'])
+        macd = pd.Series(exp1 - exp2, index=data.index)
+        signal_line = pd.Series(ind.ema(macd, self.params['signal_period']), index=data.index)
         
         signals = pd.DataFrame(index=data.index)
         signals['signal'] = 0.0
         signals['signal'] = (macd > signal_line).astype(float)
         signals['positions'] = signals['signal'].diff()
         
-        return signals
\ No newline at end of file
+        return signals
+
+    def on_bar(self, bar):
+        """Update the MACD with one bar and return its signal."""
+        if self._state is None:
+            self._state = indicators.MACD(self.params['fast_period'],
+                                          self.params['slow_period'],
+                                          self.params['signal_period'])
+        macd, signal_line = self._state.update(bar['close'])
+        return 1.0 if macd > signal_line else 0.0
@@ -1,5 +1,7 @@
 # File: components/strategy_management_module/strategies/momentum_strategy.py
 from components.strategy_management_module.strategies.strategy_base import StrategyBase
+from components.strategy_management_module import indicator_cache as ind
+from components.strategy_management_module import indicators
 import pandas as pd
 
 class MomentumStrategy(StrategyBase):
@@ -28,11 +30,18 @@ class MomentumStrategy(StrategyBase):
 
     def generate_signals(self, data):
         """Generate trading signals."""
-        momentum = data['close'].pct_change(periods=self.params['lookback_period'])
+        momentum = pd.Series(ind.pct_change(data['close'], self.params['lookback_period']), index=data.index)
         
         signals = pd.DataFrame(index=data.index)
         signals['signal'] = 0.0
         signals['signal'] = (momentum > self.params['threshold']).astype(float)
         signals['positions'] = signals['signal'].diff()
         
-        return signals
\ No newline at end of file
+        return signals
+
+    def on_bar(self, bar):
+        """Update the momentum with one bar and return its signal."""
+        if self._state is None:
+            self._state = indicators.Momentum(self.params['lookback_period'])
+        momentum = self._state.update(bar['close'])
+        return 1.0 if momentum > self.params['threshold'] else 0.0
@@ -11,6 +11,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict
 from .strategy_base import StrategyBase
+from components.strategy_management_module import indicator_cache as ind
+from components.strategy_management_module import indicators
 
 class MovingAverageCrossoverStrategy(StrategyBase):
     """Moving Average Crossover trading strategy."""
@@ -42,12 +44,10 @@ class MovingAverageCrossoverStrategy(StrategyBase):
             signals['signal'] = 0.0
 
             # Calculate moving averages
-            signals['short_mavg'] = data['close'].rolling(
-                window=self.params['short_window'], 
-                min_periods=1).mean()
-            signals['long_mavg'] = data['close'].rolling(
-                window=self.params['long_window'], 
-                min_periods=1).mean()
+            signals['short_mavg'] = ind.sma(
+                data['close'], self.params['short_window'], min_periods=1)
+            signals['long_mavg'] = ind.sma(
+                data['close'], self.params['long_window'], min_periods=1)
 
             # Generate signals using loc to avoid chained assignment warning
             signals.loc[signals.index, 'signal'] = np.where(
@@ -57,4 +57,14 @@ class MovingAverageCrossoverStrategy(StrategyBase):
             return signals
         except Exception as e:
             self.logger.error(f"Error generating signals: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def on_bar(self, bar) -> float:
+        """Update the moving averages with one bar and return its signal."""
+        if self._state is None:
+            self._state = (
+                indicators.RollingMean(self.params['short_window'], min_periods=1),
+                indicators.RollingMean(self.params['long_window'], min_periods=1))
+        short_mavg, long_mavg = self._state
+        close = bar['close']
+        return 1.0 if short_mavg.update(close) > long_mavg.update(close) else 0.0
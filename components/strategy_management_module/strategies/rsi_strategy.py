@@ -1,5 +1,7 @@
 # File: components/strategy_management_module/strategies/rsi_strategy.py
 from components.strategy_management_module.strategies.strategy_base import StrategyBase
+from components.strategy_management_module import indicator_cache as ind
+from components.strategy_management_module import indicators
 import pandas as pd
 
 class RSIStrategy(StrategyBase):
@@ -30,17 +32,7 @@ class RSIStrategy(StrategyBase):
 
     def generate_signals(self, data):
         """Generate trading signals."""
-        delta = data['close'].diff()
-        gain = delta.where(delta > 0, 0).fillna(0)
-        loss = (-delta.where(delta < 0, 0)).fillna(0)
-        
-        avg_gain = gain.rolling(window=self.params['period'], 
-                              min_periods=1).mean()
-        avg_loss = loss.rolling(window=self.params['period'], 
-                              min_periods=1).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = pd.Series(ind.rsi(data['close'], self.params['period']), index=data.index)
 
         signals = pd.DataFrame(index=data.index)
         signals['signal'] = 0.0
@@ -48,4 +40,15 @@ class RSIStrategy(StrategyBase):
         signals.loc[rsi < self.params['oversold'], 'signal'] = 1.0     # Fixed chained assignment
         signals['positions'] = signals['signal'].diff()
 
-        return signals
\ No newline at end of file
+        return signals
+
+    def on_bar(self, bar):
+        """Update the RSI with one bar and return its signal."""
+        if self._state is None:
+            self._state = indicators.RSI(self.params['period'])
+        rsi = self._state.update(bar['close'])
+        if rsi < self.params['oversold']:
+            return 1.0
+        if rsi > self.params['overbought']:
+            return -1.0
+        return 0.0
@@ -15,6 +15,7 @@ class StrategyBase(ABC):
         """
         self.params = params
         self.validate_params()
+        self._state = None
 
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -38,3 +39,39 @@ class StrategyBase(ABC):
             ValueError: If parameters are invalid
         """
         pass
+
+    @abstractmethod
+    def on_bar(self, bar) -> float:
+        """
+        Incremental counterpart of generate_signals.
+
+        Updates the strategy's streaming indicators with one new bar in O(1)
+        and returns the signal generate_signals would give for that bar.
+
+        Args:
+            bar: Mapping with at least a 'close' value (dict or DataFrame row)
+
+        Returns:
+            Signal for the bar
+        """
+        pass
+
+    def warm_up(self, data: pd.DataFrame) -> float:
+        """
+        Initialize the incremental state from history.
+
+        Args:
+            data: Market data with OHLCV columns
+
+        Returns:
+            Signal for the last bar of the history
+        """
+        self.reset()
+        signal = 0.0
+        for close in data['close'].to_numpy(dtype=float):
+            signal = self.on_bar({'close': close})
+        return signal
+
+    def reset(self) -> None:
+        """Discard the incremental state built by on_bar."""
+        self._state = None
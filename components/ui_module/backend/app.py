@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 import os
 import sys
@@ -71,12 +71,19 @@ class DataManagerClient:
     def close(self):
         self.socket.close()
 
+from components.backtesting_module.exceptions import BacktestError
+from components.backtesting_module.job_service import BacktestJobService
+
 app = Flask(__name__)
 CORS(app)
 
 # Initialize the data manager client
 data_manager_client = DataManagerClient()
 
+# Backtests run in the background; requests only submit, poll and stream them
+backtest_jobs = BacktestJobService.shared()
+SSE_KEEPALIVE_SECONDS = 15
+
 def get_tickers_file_path():
     """Get the absolute path to the tickers.csv file"""
     return os.path.join(project_root, 'tickers.csv')
@@ -212,6 +219,115 @@ def get_strategies():
             'message': str(e)
         }), 500
 
+@app.route('/api/backtests', methods=['POST'])
+def submit_backtest():
+    """Queue a backtest job and return its ID"""
+    try:
+        data = request.get_json() or {}
+        date_range = data.get('dateRange') or {}
+        job_id = backtest_jobs.submit(
+            strategy_name=data.get('strategy'),
+            ticker=data.get('symbol') or data.get('ticker'),
+            start_date=data.get('start_date') or date_range.get('start'),
+            end_date=data.get('end_date') or date_range.get('end'),
+            strategy_params=data.get('params'),
+            cash=data.get('cash', 100000.0),
+            commission=data.get('commission', 0.001)
+        )
+        return jsonify({
+            'success': True,
+            'job_id': job_id
+        }), 202
+    except (BacktestError, ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+
+@app.route('/api/backtests', methods=['GET'])
+def list_backtests():
+    return jsonify({
+        'success': True,
+        'jobs': backtest_jobs.list_jobs()
+    })
+
+@app.route('/api/backtests/<job_id>', methods=['GET'])
+def get_backtest(job_id):
+    job = backtest_jobs.describe(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'message': f'Unknown backtest job {job_id}'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@app.route('/api/backtests/<job_id>/cancel', methods=['POST'])
+def cancel_backtest(job_id):
+    if not backtest_jobs.cancel(job_id):
+        return jsonify({
+            'success': False,
+            'message': f'Backtest job {job_id} is not running'
+        }), 409
+    return jsonify({
+        'success': True,
+        'message': f'Cancellation requested for {job_id}'
+    })
+
+@app.route('/api/backtests/<job_id>/events', methods=['GET'])
+def stream_backtest_events(job_id):
+    """Server-sent events of a job: status changes and progress, replayed from ``since`` or Last-Event-ID"""
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'message': f'Unknown backtest job {job_id}'
+        }), 404
+    since = request.args.get('since', type=int)
+    if since is None:
+        since = int(request.headers.get('Last-Event-ID', -1)) + 1
+
+    def stream():
+        for event in job.events(since, timeout=SSE_KEEPALIVE_SECONDS):
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/backtests/<job_id>/artifacts', methods=['GET'])
+def get_backtest_artifacts(job_id):
+    artifacts = backtest_jobs.artifacts(job_id)
+    if artifacts is None:
+        return jsonify({
+            'success': False,
+            'message': f'No artifacts for backtest job {job_id}'
+        }), 404
+    return jsonify({
+        'success': True,
+        'artifacts': artifacts
+    })
+
+@app.route('/api/backtests/<job_id>/trades', methods=['GET'])
+def get_backtest_trades(job_id):
+    """A page of a completed job's trades (``offset``, ``limit``)"""
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', 100, type=int)), 1000)
+    page = backtest_jobs.trades(job_id, offset, limit)
+    if page is None:
+        return jsonify({
+            'success': False,
+            'message': f'No trades for backtest job {job_id}'
+        }), 404
+    return jsonify({
+        'success': True,
+        **page
+    })
+
 def initialize_app():
     """Initialize the application with required setup"""
     try:
@@ -0,0 +1,48 @@
+# snapshot_command.py
+import argparse
+import logging
+import sys
+import time
+
+from components.data_management_module.snapshot import export_snapshot, import_snapshot, SnapshotError
+
+DEFAULT_DATABASE = 'data/market_data.db'
+
+
+def main():
+    """Export or import Arrow/Parquet snapshots of the market data database"""
+    parser = argparse.ArgumentParser(description="Market data snapshot export/import")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Write a snapshot of the database")
+    export_parser.add_argument('output_dir')
+    export_parser.add_argument('--database', default=DEFAULT_DATABASE)
+    export_parser.add_argument('--tickers', nargs='*', help="Tickers to export (default: all)")
+    export_parser.add_argument('--format', choices=['feather', 'parquet'], default='feather')
+
+    import_parser = subparsers.add_parser('import', help="Bulk-load a snapshot into a database")
+    import_parser.add_argument('snapshot_dir')
+    import_parser.add_argument('--database', default=DEFAULT_DATABASE)
+    import_parser.add_argument('--no-verify', action='store_true', help="Skip checksum verification")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    started = time.time()
+    try:
+        if args.command == 'export':
+            manifest = export_snapshot(args.database, args.output_dir, tickers=args.tickers, fmt=args.format)
+            rows = sum(entry['rows'] for entry in manifest['tickers'].values())
+            print(f"Exported {rows} bars for {len(manifest['tickers'])} tickers to {args.output_dir}")
+        else:
+            counts = import_snapshot(args.snapshot_dir, args.database, verify=not args.no_verify)
+            print(f"Imported {sum(counts.values())} bars for {len(counts)} tickers into {args.database}")
+    except (SnapshotError, ImportError, ValueError) as e:
+        print(f"Snapshot {args.command} failed: {e}")
+        return 1
+    print(f"Completed in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
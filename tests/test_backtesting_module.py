@@ -1,7 +1,44 @@
 import pytest
+import sqlite3
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import backtrader as bt
+from components.backtesting_module import optimizer as optimizer_module
+from components.backtesting_module.backtester import Backtester
+from components.backtesting_module.benchmark_service import BenchmarkService
+from components.backtesting_module.capture import CaptureAnalyzer
+from components.backtesting_module.config import BacktestConfig
+from components.backtesting_module.early_stopping import EarlyStopping
+from components.backtesting_module.feeds import NumpyData
+from components.backtesting_module.job_service import BacktestJobService
+from components.backtesting_module.monte_carlo import MonteCarloSimulator, trade_returns
+from components.backtesting_module.optimizer import Optimizer
+from components.backtesting_module.parameter_space import Categorical, FloatRange, IntRange, LogRange, ParameterSpace
+from components.backtesting_module.parameter_validator import ParameterValidator
+from components.backtesting_module.portfolio_backtester import PortfolioBacktester
+from components.backtesting_module.result_cache import ResultCache
+from components.backtesting_module.results_repository import ResultsRepository
+from components.backtesting_module.results_viewer import ResultsViewer
+from components.backtesting_module import resource_monitor as resource_monitor_module
+from components.backtesting_module.resource_monitor import ResourceMonitor
+from components.backtesting_module.exceptions import OptimizationError
+from components.backtesting_module.scheduler import ResourceScheduler
+from components.backtesting_module.search import SearchBudget, SearchSpace, SearchStrategy
+from components.backtesting_module.shared_data import SharedFrame
+from components.backtesting_module.strategy_adapter import StrategyAdapter
+from components.backtesting_module.synthetic_data import generate_ohlcv
+from components.backtesting_module import exceptions, throughput
+from components.strategy_management_module.indicator_cache import indicator_cache
+from components.backtesting_module.batch_backtester import BatchBacktester
+from components.data_management_module.data_access_layer import DatabaseManager, HistoricalData
+from components.backtesting_module.walk_forward import WalkForwardOptimizer, generate_folds
+from components.backtesting_module.vectorized_engine import (
+    VectorizedBacktester, build_strategy, compute_metrics, periods_per_year, signals_to_target
+)
 
 # Mock classes for testing
 class BacktestError(Exception):
@@ -155,5 +192,954 @@ def test_optimization_constraints(sample_price_data):
     assert all(w >= constraints['min_weight'] for w in weights.values())
     assert all(w <= constraints['max_weight'] for w in weights.values())
 
+@pytest.fixture
+def ohlcv_data():
+    """Synthetic daily OHLCV bars for engine tests"""
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+    open_ = close * (1 + rng.normal(0, 0.003, 400))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * 1.01,
+        'low': np.minimum(open_, close) * 0.99,
+        'close': close,
+        'volume': 1000
+    }, index=pd.date_range('2020-01-01', periods=400, freq='D'))
+
+class TargetStrategy(bt.Strategy):
+    """Reference Backtrader strategy that follows precomputed long/flat targets"""
+    params = (('target', None), ('percents', None))
+
+    def next(self):
+        target = self.p.target[len(self) - 1]
+        if target > 0 and not self.position:
+            if self.p.percents:
+                self.buy(size=self.broker.getcash() / self.data.close[0] * self.p.percents / 100)
+            else:
+                self.buy()
+        elif target == 0 and self.position:
+            self.close()
+
+def run_cerebro(data, target, percents=None):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=data))
+    cerebro.addstrategy(TargetStrategy, target=target, percents=percents)
+    cerebro.broker.setcash(100000.0)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    results = cerebro.run()
+    return cerebro.broker.getvalue(), results[0].analyzers.drawdown.get_analysis()['max']['drawdown']
+
+@pytest.mark.parametrize('strategy_name,signal_mode', [
+    ('MovingAverageCrossover', 'state'),
+    ('RSI', 'event'),
+    ('MACD', 'state')
+])
+@pytest.mark.parametrize('percents', [None, 95])
+def test_vectorized_engine_matches_backtrader(ohlcv_data, strategy_name, signal_mode, percents):
+    """Vectorized fills agree with Cerebro on the same signals"""
+    result = VectorizedBacktester(ohlcv_data, percents=percents).run(strategy_name)
+    signals = build_strategy(strategy_name).generate_signals(ohlcv_data)
+    target = signals_to_target(signals['signal'], signal_mode)
+    final_value, max_drawdown = run_cerebro(ohlcv_data, target, percents)
+
+    assert result['metrics']['final_value'] == pytest.approx(final_value, rel=1e-9)
+    assert result['metrics']['max_drawdown'] == pytest.approx(max_drawdown, rel=1e-6)
+    assert result['metrics']['trades'] > 0
+    assert len(result['equity']) == len(ohlcv_data)
+
+def test_event_signals_hold_position():
+    """Event signals keep the previous position until the opposite event"""
+    target = signals_to_target([0, 1, 0, 0, -1, 0, 1], 'event')
+    assert target.tolist() == [0, 1, 1, 1, 0, 0, 1]
+
+def test_rejected_entry_is_retried(ohlcv_data):
+    """An entry that cash cannot cover is retried on later bars"""
+    engine = VectorizedBacktester(ohlcv_data, cash=10.0, stake=1)
+    result = engine.run_signals(np.ones(len(ohlcv_data)))
+    assert result['metrics']['trades'] == 0
+    assert result['equity'].iloc[-1] == pytest.approx(10.0)
+
+def test_backtrader_param_names_are_translated():
+    """Backtrader-style params map onto the StrategyBase names"""
+    strategy = build_strategy('BollingerBands', {'period': 25, 'devfactor': 2.5})
+    assert strategy.params['window'] == 25
+    assert strategy.params['num_std'] == 2.5
+
+def test_shared_frame_round_trip(ohlcv_data):
+    """Workers rebuild an identical frame from shared memory"""
+    data = ohlcv_data.tz_localize('America/New_York')
+    with SharedFrame(data) as shared:
+        shm, attached = SharedFrame.attach(shared.spec)
+        try:
+            assert (attached.index == data.index).all()
+            assert str(attached.index.tz) == 'America/New_York'
+            np.testing.assert_array_equal(attached.to_numpy(), data.to_numpy(dtype=float))
+        finally:
+            del attached
+            shm.close()
+
+@pytest.mark.parametrize('strategy_name,params', [
+    ('MovingAverageCrossover', {'short_window': 10, 'long_window': 30}),
+    ('RSI', {'rsi_period': 14, 'oversold': 45, 'overbought': 55}),
+    ('MACD', {}),
+    ('BollingerBands', {'period': 20, 'devfactor': 1.5}),
+    ('Momentum', {'momentum_period': 10})
+])
+@pytest.mark.parametrize('runonce', [True, False])
+def test_cached_indicators_match_backtrader(ohlcv_data, monkeypatch, strategy_name, params, runonce):
+    """Adapter strategies trade identically on cached and native indicators"""
+    def final_value():
+        cerebro = bt.Cerebro(stdstats=False, runonce=runonce)
+        cerebro.adddata(bt.feeds.PandasData(dataname=ohlcv_data))
+        cerebro.addstrategy(StrategyAdapter.get_strategy(strategy_name), **params)
+        cerebro.broker.setcash(100000.0)
+        cerebro.broker.setcommission(commission=0.001)
+        cerebro.run()
+        return cerebro.broker.getvalue()
+
+    indicator_cache.clear()
+    cached = [final_value(), final_value()]
+    assert indicator_cache.stats()['hits'] > 0
+    monkeypatch.setattr(indicator_cache, 'enabled', False)
+    native = final_value()
+
+    assert cached[0] != 100000.0
+    assert cached == pytest.approx([native, native], rel=1e-12)
+
+def test_monte_carlo_is_seeded_and_chunked(ohlcv_data):
+    """Simulations are reproducible and do not depend on the chunk size"""
+    equity = VectorizedBacktester(ohlcv_data, percents=95).run('MovingAverageCrossover')['equity']
+    simulator = MonteCarloSimulator.from_equity(equity)
+    chunked = MonteCarloSimulator.from_equity(equity, max_memory_mb=0.1)
+    for method in ('bootstrap', 'block', 'shuffle'):
+        result = simulator.run(2000, method=method, seed=42)
+        np.testing.assert_array_equal(result['terminal_value'], chunked.run(2000, method=method, seed=42)['terminal_value'])
+        assert list(result['bands'].columns) == ['terminal_value', 'sharpe_ratio', 'max_drawdown']
+        assert result['bands']['max_drawdown'].is_monotonic_increasing
+        assert 0.0 <= result['probability_of_loss'] <= 1.0
+
+    # A permutation reorders the same returns: the terminal value is fixed, the path is not
+    shuffled = simulator.run(500, method='shuffle', seed=1)
+    assert shuffled['terminal_value'] == pytest.approx(np.full(500, equity.iloc[-1]))
+    assert shuffled['max_drawdown'].std() > 0
+
+def test_trade_returns_compound_to_final_value(ohlcv_data):
+    """Round-trip trade returns on equity compound to the backtest's realized P&L"""
+    result = VectorizedBacktester(ohlcv_data, percents=95).run('MovingAverageCrossover',
+                                                              {'short_window': 10, 'long_window': 30})
+    trades = result['trades']
+    returns = trade_returns(trades, 100000.0)
+    assert len(returns) == len(trades) // 2
+    realized = 100000.0 - (trades['size'] * trades['price'] + trades['commission']).iloc[:2 * len(returns)].sum()
+    assert 100000.0 * np.prod(1 + returns) == pytest.approx(realized)
+    simulation = MonteCarloSimulator.from_trades(trades).run(200, method='bootstrap', seed=0)
+    assert simulation['horizon'] == len(returns)
+
+class BuyAndHold(bt.Strategy):
+    """Reference fully invested buy-and-hold, filled at the first close"""
+    def next(self):
+        if not self.position:
+            # Just under the cash available, so rounding does not trip the margin check
+            self.buy(size=self.broker.getcash() / (self.data.close[0] * 1.001) * (1 - 1e-12))
+
+def counting_fetch(data, calls):
+    def fetch(ticker, start_date, end_date, timeframe):
+        calls.append((ticker, start_date, end_date))
+        bars = data.loc[start_date:end_date]
+        return bars.rename(columns={'close': 'c'}).rename_axis('t').reset_index()
+    return fetch
+
+def test_benchmark_metrics_match_backtrader(ohlcv_data):
+    """The cached buy-and-hold curve reproduces Backtrader's analyzers"""
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=ohlcv_data))
+    cerebro.addstrategy(BuyAndHold)
+    cerebro.broker.setcash(100000.0)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.broker.set_coc(True)
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+    analyzers = cerebro.run()[0].analyzers
+
+    service = BenchmarkService(fetch=counting_fetch(ohlcv_data, []))
+    metrics = service.metrics('SPY', ohlcv_data.index[0], ohlcv_data.index[-1])
+    assert metrics['Final Portfolio Value'] == pytest.approx(cerebro.broker.getvalue())
+    assert metrics['Total Return'] == pytest.approx(analyzers.returns.get_analysis()['rtot'])
+    assert metrics['Sharpe Ratio'] == pytest.approx(analyzers.sharpe.get_analysis()['sharperatio'])
+    assert metrics['Max Drawdown'] == pytest.approx(analyzers.drawdown.get_analysis()['max']['drawdown'])
+
+def test_benchmark_windows_share_one_fetch(ohlcv_data):
+    """Windows inside the fetched range are slices of one curve, rebased to their first bar"""
+    calls = []
+    service = BenchmarkService(fetch=counting_fetch(ohlcv_data, calls))
+    full = service.equity_curve('SPY', datetime(2020, 1, 1), datetime(2020, 12, 31))
+    window = service.equity_curve('SPY', datetime(2020, 3, 1), datetime(2020, 6, 30), cash=50000.0)
+    assert len(calls) == 1
+    assert window.index[0] == pd.Timestamp('2020-03-01') and window.index[-1] == pd.Timestamp('2020-06-30')
+    assert window.iloc[0] == pytest.approx(50000.0 / 1.001)
+    expected = full.loc['2020-03-01':'2020-06-30']
+    np.testing.assert_allclose(window.to_numpy(), (expected / expected.iloc[0] * 50000.0 / 1.001).to_numpy())
+
+    # A window past the cached range widens it once
+    service.equity_curve('SPY', datetime(2020, 6, 1), datetime(2021, 1, 31))
+    service.equity_curve('SPY', datetime(2020, 1, 1), datetime(2021, 1, 31))
+    assert calls[1:] == [('SPY', pd.Timestamp('2020-01-01'), pd.Timestamp('2021-01-31'))]
+
+def test_compare_with_benchmark_reports_relative_metrics(ohlcv_data, monkeypatch):
+    monkeypatch.setattr(Backtester, 'load_data', lambda self: setattr(self, 'data', ohlcv_data))
+    backtester = Backtester('MovingAverageCrossover', {'short_window': 10, 'long_window': 30}, 'TEST',
+                            datetime(2020, 1, 1), datetime(2021, 2, 3))
+    backtester.result_cache = None
+    calls = []
+    backtester.benchmark_service = BenchmarkService(fetch=counting_fetch(ohlcv_data, calls))
+    backtester.run_backtest()
+    comparison = backtester.compare_with_benchmark('SPY')
+    assert backtester.compare_with_benchmark('SPY') == comparison
+    assert len(calls) == 1
+    assert set(comparison['Benchmark']) == set(comparison['Strategy'])
+    relative = comparison['Relative']
+    # The strategy is either flat or long the same prices as the benchmark
+    assert 0.0 < relative['Beta'] <= 1.0
+    assert -1.0 <= relative['Correlation'] <= 1.0
+
+@pytest.mark.parametrize('timeframe,bars_per_day', [('1Day', 1), ('5Min', 78), ('1Min', 390)])
+def test_synthetic_data_is_reproducible_ohlcv(timeframe, bars_per_day):
+    data = generate_ohlcv(1000, timeframe, seed=3)
+    pd.testing.assert_frame_equal(data, generate_ohlcv(1000, timeframe, seed=3))
+    assert not data.equals(generate_ohlcv(1000, timeframe, seed=4))
+    assert len(data) == 1000 and data.index.is_monotonic_increasing and data.index.is_unique
+    assert (data['high'] >= data[['open', 'close']].max(axis=1)).all()
+    assert (data['low'] <= data[['open', 'close']].min(axis=1)).all()
+    assert (data['volume'] > 0).all()
+    assert (data.index.dayofweek < 5).all()
+    if bars_per_day > 1:
+        sessions = data.groupby(data.index.date).size()
+        assert sessions.iloc[0] == bars_per_day
+        assert data.index[0].time() == datetime(2020, 1, 1, 9, 30).time()
+
+def test_throughput_suite_measures_and_flags_regressions():
+    results = throughput.run_suite(['5Min'], n_bars=500, engines=['backtrader', 'vectorized', 'streaming'],
+                                   strategies=['MovingAverageCrossover'], repeat=1)
+    assert [entry['engine'] for entry in results] == ['backtrader', 'vectorized', 'streaming']
+    for entry in results:
+        assert entry['bars'] == 500 and entry['timeframe'] == '5Min'
+        assert entry['bars_per_sec'] == pytest.approx(500 / entry['seconds'])
+        assert entry['peak_memory_mb'] >= 0
+    assert throughput.compare(results, results) == []
+
+    slower = [dict(entry, bars_per_sec=entry['bars_per_sec'] * 0.5) for entry in results]
+    bigger = [dict(entry, peak_memory_mb=entry['peak_memory_mb'] + 10) for entry in results]
+    assert {r['metric'] for r in throughput.compare(slower, results)} == {'bars_per_sec'}
+    assert len(throughput.compare(bigger, results)) == 3
+    assert throughput.compare(results, []) == []
+    with pytest.raises(exceptions.BacktestError):
+        throughput.run_suite(['1Day'], engines=['gpu'])
+
+def test_throughput_results_round_trip(tmp_path):
+    results = [{'engine': 'vectorized', 'strategy': 'RSI', 'timeframe': '1Day', 'bars': 10,
+                'seconds': 0.1, 'bars_per_sec': 100.0, 'peak_memory_mb': 1.0}]
+    path = str(tmp_path / 'out' / 'throughput.json')
+    throughput.save_results(results, path)
+    assert throughput.load_results(path) == results
+
+@pytest.fixture
+def optimizer(ohlcv_data):
+    optimizer = Optimizer('MovingAverageCrossover', 'TEST', None, None)
+    optimizer.data = ohlcv_data
+    optimizer.result_cache = None  # every test measures fresh evaluations
+    return optimizer
+
+def test_optimizer_reuses_cached_results(optimizer, tmp_path, monkeypatch):
+    """Repeated combinations come from the cache until the data changes"""
+    optimizer.result_cache = ResultCache(str(tmp_path / 'cache.db'))
+    param_ranges = {'short_window': [5, 10], 'long_window': [20, 30]}
+    first = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+
+    def fail(*args):
+        raise AssertionError("evaluated instead of cached")
+    monkeypatch.setattr(optimizer_module, '_evaluate', fail)
+    second = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+    key = lambda r: tuple(r['params'].values())
+    assert sorted(second, key=key) == sorted(first, key=key)
+    # 2.0 and 2 are the same parameter value
+    assert 'error' not in optimizer.run_optimization({'short_window': [5.0], 'long_window': [20]},
+                                                     engine='vectorized', max_workers=1)[0]
+
+    optimizer.data = optimizer.data.assign(close=optimizer.data['close'] * 1.01)
+    changed = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+    assert all('error' in r for r in changed)
+
+def test_backtester_serves_identical_runs_from_cache(ohlcv_data, tmp_path, monkeypatch):
+    """A repeated backtest is served from the cache and saved only once"""
+    monkeypatch.setattr(Backtester, 'load_data', lambda self: setattr(self, 'data', ohlcv_data))
+    backtester = Backtester('MovingAverageCrossover', {'short_window': 10, 'long_window': 30}, 'TEST',
+                            datetime(2020, 1, 1), datetime(2021, 2, 3))
+    backtester.result_cache = ResultCache(str(tmp_path / 'cache.db'))
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    backtester.run_backtest()
+    assert backtester.results is not None
+    metrics, equity = backtester.get_performance_metrics(), backtester.equity
+    assert backtester.save_results(repository) == 1
+
+    monkeypatch.setattr(bt.Cerebro, 'run', lambda self: pytest.fail("Cerebro ran for a cached backtest"))
+    backtester.run_backtest()
+    assert backtester.results is None
+    assert backtester.get_performance_metrics() == metrics
+    pd.testing.assert_series_equal(backtester.equity, equity)
+    assert backtester.equity.iloc[-1] == pytest.approx(metrics['Final Portfolio Value'])
+    assert backtester.save_results(repository) == 0
+    assert len(repository.recent()) == 1
+    repository.close()
+
+def test_closed_range_cache_hit_skips_the_fetch(ohlcv_data, tmp_path, monkeypatch):
+    """A finished date range is served from the cache before any data is fetched"""
+    fetches = []
+    monkeypatch.setattr(Backtester, 'load_data', lambda self: (fetches.append(self.ticker),
+                                                               setattr(self, 'data', ohlcv_data)))
+    cache = ResultCache(str(tmp_path / 'missing' / 'cache.db'))
+
+    def backtester(end_date):
+        backtester = Backtester('MovingAverageCrossover', {'short_window': 10, 'long_window': 30}, 'TEST',
+                                datetime(2020, 1, 1), end_date)
+        backtester.result_cache = cache
+        return backtester
+
+    first = backtester(datetime(2021, 2, 3))
+    first.run_backtest()
+    vectorized = first.run_vectorized_backtest()
+    assert len(fetches) == 1
+
+    second = backtester(datetime(2021, 2, 3))
+    second.run_backtest()
+    assert second.run_vectorized_backtest()['metrics'] == vectorized['metrics']
+    assert len(fetches) == 1 and second.data is None
+    assert second.get_performance_metrics() == first.get_performance_metrics()
+    assert second.result_key == first.result_key
+
+    # A range reaching today is always fetched and fingerprinted
+    backtester(datetime.now() + timedelta(days=1)).run_backtest()
+    assert len(fetches) == 2
+
+def test_backtest_captures_equity_and_trades(ohlcv_data, tmp_path, monkeypatch):
+    """Every run keeps its equity curve and trade log, stored compressed next to its row and paged"""
+    monkeypatch.setattr(Backtester, 'load_data', lambda self: setattr(self, 'data', ohlcv_data))
+    backtester = Backtester('MovingAverageCrossover', {'short_window': 5, 'long_window': 20}, 'TEST',
+                            datetime(2020, 1, 1), datetime(2021, 2, 3))
+    backtester.result_cache = None
+    backtester.run_backtest()
+    capture = backtester.capture
+    equity = capture.equity
+    assert len(equity) == len(ohlcv_data) and capture.stride == 1
+    assert equity['equity'].iloc[-1] == pytest.approx(backtester.final_value)
+    assert (equity['cash'] + equity['position'] * ohlcv_data['close'].to_numpy()).to_numpy() == \
+        pytest.approx(equity['equity'].to_numpy())
+    trades = capture.trades_frame()
+    assert capture.trade_count > 8
+    assert (trades['close_time'] > trades['open_time']).all()
+    assert trades['pnl'].to_numpy() == pytest.approx(
+        (trades['size'] * (trades['exit_price'] - trades['entry_price'])).to_numpy())
+    # Closed-trade returns on equity compound to the realized net P&L
+    returns = trade_returns(capture.trades, 100000.0)
+    assert 100000.0 * np.prod(1 + returns) == pytest.approx(100000.0 + trades['pnl_net'].sum())
+    assert backtester.run_monte_carlo(200, method='bootstrap', seed=0, trades=True)['horizon'] == capture.trade_count
+
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    backtester.save_results(repository)
+    pd.testing.assert_frame_equal(repository.get_equity(backtester.result_key), equity)
+    assert repository.save_capture('paged', capture, page_size=4)
+    assert not repository.save_capture('paged', capture, page_size=4)
+    page, total = repository.get_trades('paged', offset=3, limit=6)
+    assert total == capture.trade_count
+    pd.testing.assert_frame_equal(page, trades.iloc[3:9].reset_index(drop=True))
+    assert repository.get_trades('paged', offset=total, limit=5)[0].empty
+    assert repository.get_trades('missing') is None
+    repository.close()
+
+@pytest.mark.parametrize('preload', [True, False])
+def test_capture_memory_is_bounded(preload):
+    """A run longer than max_points is downsampled to at most max_points, keeping the last bar"""
+    data = generate_ohlcv(5000, '1Min', seed=3)
+    cerebro = bt.Cerebro(preload=preload)
+    cerebro.adddata(bt.feeds.PandasData(dataname=data))
+    cerebro.addstrategy(StrategyAdapter.get_strategy('MovingAverageCrossover'))
+    cerebro.addanalyzer(CaptureAnalyzer, _name='capture', max_points=300)
+    capture = cerebro.run()[0].analyzers.capture.get_analysis()
+    assert 100 < len(capture.equity) <= 300
+    assert capture.equity.index[-1] == data.index[-1]
+    assert capture.equity.index[1] == data.index[capture.stride]
+    assert capture.equity['equity'].iloc[-1] == pytest.approx(cerebro.broker.getvalue())
+
+def _feed_run(feed_class, data, options, **feed_params):
+    cerebro = bt.Cerebro(stdstats=False, **options)
+    cerebro.adddata(feed_class(dataname=data, **feed_params))
+    cerebro.addstrategy(StrategyAdapter.get_strategy('MovingAverageCrossover'), short_window=5, long_window=20)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addanalyzer(CaptureAnalyzer, _name='capture')
+    capture = cerebro.run()[0].analyzers.capture.get_analysis()
+    return cerebro.broker.getvalue(), capture
+
+@pytest.mark.parametrize('options', [{}, {'runonce': False}, {'preload': False}, {'exactbars': 1}, {'exactbars': -1}])
+def test_numpy_feed_matches_pandas_feed(ohlcv_data, options):
+    """The array feed runs the same bars and trades as PandasData in every memory mode"""
+    value, capture = _feed_run(NumpyData, ohlcv_data, options)
+    expected_value, expected = _feed_run(bt.feeds.PandasData, ohlcv_data, options)
+    assert value == expected_value
+    pd.testing.assert_frame_equal(capture.equity, expected.equity)
+    # Trade refs are numbered across the process, so they differ between runs
+    pd.testing.assert_frame_equal(capture.trades_frame().drop(columns='ref'), expected.trades_frame().drop(columns='ref'))
+
+def test_numpy_feed_dates_and_range(ohlcv_data):
+    """tz-aware indexes map to the same UTC bars as PandasData, and fromdate/todate trim the arrays"""
+    aware = ohlcv_data.tz_localize('America/New_York')
+    assert _feed_run(NumpyData, aware, {})[1].equity.index.equals(_feed_run(bt.feeds.PandasData, aware, {})[1].equity.index)
+    window = {'fromdate': datetime(2020, 3, 1), 'todate': datetime(2020, 9, 30)}
+    for options in ({}, {'preload': False}):
+        _, capture = _feed_run(NumpyData, ohlcv_data, options, **window)
+        assert capture.equity.index[0] == pd.Timestamp('2020-03-01')
+        assert capture.equity.index[-1] == pd.Timestamp('2020-09-30')
+
+def test_engine_options_reach_backtester_and_optimizer(ohlcv_data, optimizer, monkeypatch):
+    """exactbars and runonce change memory use and speed, not results"""
+    monkeypatch.setattr(Backtester, 'load_data', lambda self: setattr(self, 'data', ohlcv_data))
+    metrics = []
+    for options in ({}, {'exactbars': 1}, {'runonce': False, 'preload': False}):
+        backtester = Backtester('MovingAverageCrossover', {'short_window': 10, 'long_window': 30}, 'TEST',
+                                datetime(2020, 1, 1), datetime(2021, 2, 3))
+        backtester.result_cache = None
+        backtester.run_backtest(**options)
+        metrics.append(backtester.get_performance_metrics())
+    assert metrics[1] == metrics[0] and metrics[2] == metrics[0]
+
+    param_ranges = {'short_window': [5, 10], 'long_window': [20]}
+    default = optimizer.run_optimization(param_ranges, max_workers=1)
+    optimizer.engine_options = {'exactbars': 1}
+    assert optimizer.run_optimization(param_ranges, max_workers=1) == default
+
+def _job_service(tmp_path, monkeypatch, load_data):
+    monkeypatch.setattr(BacktestConfig, 'RESULT_CACHE_ENABLED', False)
+    monkeypatch.setattr(Backtester, 'load_data', load_data)
+    return BacktestJobService(max_workers=1, artifact_dir=str(tmp_path / 'jobs'),
+                              repository=ResultsRepository(str(tmp_path / 'results.db')), history_size=0)
+
+def test_backtest_job_streams_progress_and_persists_artifacts(ohlcv_data, tmp_path, monkeypatch):
+    """A job reports progress over its bars, then its metrics and equity outlive it"""
+    service = _job_service(tmp_path, monkeypatch, lambda self: setattr(self, 'data', ohlcv_data))
+    job_id = service.submit('MovingAverageCrossover', 'test', '2020-01-01', '2021-02-03',
+                            {'short_window': 10, 'long_window': 30})
+    job = service.get(job_id)
+    events = [event for event in job.events(timeout=10) if event is not None]
+    assert [e['status'] for e in events if e['type'] == 'status'] == ['queued', 'running', 'completed']
+    assert [e['seq'] for e in events] == list(range(len(events)))
+    progress = [e for e in events if e['type'] == 'progress']
+    assert 10 <= len(progress) <= BacktestConfig.JOB_PROGRESS_EVENTS + 1
+    assert progress[-1]['percent'] == 100.0 and progress[-1]['bars'] == len(ohlcv_data)
+    assert all(a['bar'] < b['bar'] for a, b in zip(progress, progress[1:]))
+    assert progress[-1]['value'] == pytest.approx(job.metrics['Final Portfolio Value'])
+    # Replaying from a later event skips the earlier ones
+    assert next(job.events(since=3))['seq'] == 3
+
+    second = service.get(service.submit('MovingAverageCrossover', 'TEST', '2020-01-01', '2021-02-03',
+                                        {'short_window': 5}))
+    assert list(second.events(timeout=10))[-1]['status'] == 'completed'
+    service.shutdown(wait=True)
+    assert service.get(job_id) is None
+    assert service.describe(job_id)['status'] == 'completed'
+    artifacts = service.artifacts(job_id)
+    assert artifacts['equity']['values'][-1] == pytest.approx(job.metrics['Final Portfolio Value'])
+    assert len(artifacts['equity']['index']) == len(artifacts['equity']['values'])
+    assert len(service.repository.recent()) == 2
+    page = service.trades(job_id, offset=0, limit=5)
+    assert page['total'] > 5 and len(page['trades']) == 5
+    assert page['trades'][0]['close_time'] > page['trades'][0]['open_time']
+    service.repository.close()
+
+def test_backtest_jobs_cancel_cooperatively(ohlcv_data, tmp_path, monkeypatch):
+    """A queued job never starts and a running one stops at its next bar without a result"""
+    loading, release = threading.Event(), threading.Event()
+
+    def load_data(self):
+        self.data = ohlcv_data
+        loading.set()
+        release.wait(10)
+    service = _job_service(tmp_path, monkeypatch, load_data)
+    running = service.submit('MovingAverageCrossover', 'TEST', '2020-01-01', '2021-02-03')
+    queued = service.submit('MovingAverageCrossover', 'TEST', '2020-01-01', '2021-02-03')
+    assert loading.wait(10)
+    assert service.cancel(queued) and service.describe(queued)['status'] == 'cancelled'
+    assert service.cancel(running)
+    release.set()
+    events = [event for event in service.get(running).events(timeout=10) if event is not None]
+    assert events[-1]['status'] == 'cancelled'
+    assert not [e for e in events if e['type'] == 'progress']
+    assert not service.cancel(running)
+    assert service.artifacts(running) is None and service.repository.recent().empty
+    with pytest.raises(exceptions.StrategyError):
+        service.submit('Unknown', 'TEST', '2020-01-01', '2021-02-03')
+    with pytest.raises(exceptions.BacktestError):
+        service.submit('MovingAverageCrossover', 'TEST', '2021-01-01', '2020-01-01')
+    service.shutdown(wait=True)
+    service.repository.close()
+
+def test_results_repository_batches_and_ranks(optimizer, tmp_path):
+    """A sweep is saved in one batch and ranked by SQLite"""
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    param_ranges = {'short_window': [5, 10, 15], 'long_window': [20, 30, 40]}
+    results = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+    assert optimizer.save_results(results, engine='vectorized', repository=repository) == 9
+    assert optimizer.save_results(results, engine='vectorized', repository=repository) == 0
+
+    top = repository.top('sharpe_ratio', n=3, strategy_name='MovingAverageCrossover', ticker='TEST')
+    expected = sorted((r['sharpe_ratio'] for r in results), reverse=True)[:3]
+    assert top['sharpe_ratio'].tolist() == pytest.approx(expected)
+    assert isinstance(top['strategy_params'].iloc[0], dict)
+    assert repository.top('max_drawdown', n=1)['max_drawdown'].iloc[0] == pytest.approx(
+        min(r['max_drawdown'] for r in results))
+
+    plan = repository._connection().execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM backtest_results ORDER BY sharpe_ratio DESC LIMIT 3').fetchall()
+    assert 'idx_backtest_results_sharpe_ratio' in str(plan)
+    repository.close()
+
+    viewer = ResultsViewer(str(tmp_path / 'results.db'))
+    assert len(viewer.get_results(limit=5)) == 5
+    assert viewer.get_top_results('total_return', n=1)['id'].iloc[0] in viewer.get_results(limit=9)['id'].tolist()
+
+def test_parallel_optimization_matches_serial(optimizer, monkeypatch):
+    """A pooled sweep returns the same results as an in-process one"""
+    param_ranges = {'short_window': [5, 10, 15], 'long_window': [20, 30]}
+    serial = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+
+    monkeypatch.setattr(ResourceMonitor, 'get_worker_count', staticmethod(lambda max_workers=None: 2))
+    streamed = []
+    parallel = optimizer.run_optimization(param_ranges, engine='vectorized', callback=streamed.append)
+
+    key = lambda result: sorted(result['params'].items())
+    assert sorted(parallel, key=key) == sorted(serial, key=key)
+    assert len(streamed) == 6
+    assert optimizer.get_best_params(parallel, metric='total_return') in [r['params'] for r in serial]
+
+def test_worker_count_samples_cpu_load(monkeypatch):
+    """Pool sizing measures CPU load over an interval instead of psutil's first-call 0.0"""
+    intervals = []
+
+    def cpu_percent(interval=None):
+        intervals.append(interval)
+        return 100.0 if interval else 0.0
+    monkeypatch.setattr(resource_monitor_module.psutil, 'cpu_percent', cpu_percent)
+    monkeypatch.setattr(resource_monitor_module.os, 'cpu_count', lambda: 8)
+    assert ResourceMonitor.get_worker_count() == 1
+    assert intervals and all(interval > 0 for interval in intervals)
+
+def _load(external_cpu, available_mb, total_mb=10000):
+    return {'cpu_percent': external_cpu, 'own_cpu_percent': 0.0, 'external_cpu_percent': external_cpu,
+            'memory_percent': 100 - available_mb / total_mb * 100, 'available_mb': available_mb,
+            'total_mb': total_mb, 'rss_mb': 0.0}
+
+def test_scheduler_targets_follow_external_load():
+    """Tasks in flight shrink when other processes need CPU or memory and grow back when they do not"""
+    scheduler = ResourceScheduler(cpu_threshold=80, memory_threshold=80, worker_memory_mb=100)
+    scheduler.cpu_count = 4
+    assert scheduler.target_workers(2, 4, _load(10, 8000)) == 3
+    assert scheduler.target_workers(2, 2, _load(10, 8000)) == 2
+    assert scheduler.target_workers(3, 4, _load(70, 8000)) == 1
+    assert scheduler.target_workers(2, 4, _load(0, 2100)) == 3
+    assert scheduler.target_workers(2, 4, _load(0, 1900)) == 1
+
+def test_scheduler_admission_waits_for_headroom(monkeypatch):
+    """New work waits for headroom instead of failing, and gives up after the timeout"""
+    scheduler = ResourceScheduler(cpu_threshold=80, memory_threshold=80, poll_interval=0.01)
+    loads = iter([_load(95, 8000), _load(90, 8000), _load(20, 8000)])
+    monkeypatch.setattr(scheduler, 'sample', lambda: next(loads))
+    assert scheduler.admit(timeout=5)['external_cpu_percent'] == 20
+
+    monkeypatch.setattr(scheduler, 'sample', lambda: _load(20, 500))
+    started = time.monotonic()
+    with pytest.raises(ResourceWarning):
+        scheduler.admit(timeout=0.05)
+    assert time.monotonic() - started < 1
+
+def test_scheduler_throttles_tasks_in_flight(monkeypatch):
+    """The pool keeps no more tasks in flight than the current target"""
+    scheduler = ResourceScheduler()
+    monkeypatch.setattr(scheduler, 'target_workers', lambda active, limit, sample=None: 2)
+    lock, running, started = threading.Lock(), [0], {}
+
+    def task(item):
+        with lock:
+            running[0] += 1
+            started[item] = running[0]
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if item < 0:
+            raise ValueError(item)
+        return item * item
+
+    with ThreadPool(4) as pool:
+        assert sorted(scheduler.imap_unordered(pool, task, range(12), 4)) == [i * i for i in range(12)]
+        with pytest.raises(ValueError):
+            list(scheduler.imap_unordered(pool, task, [1, -1], 4))
+    # The first four go out at the pool size; the rest only once the count is under two
+    assert max(started[item] for item in range(4, 12)) <= 2
+    assert scheduler.get_history()[0]['from'] == 4 and scheduler.get_history()[0]['to'] == 2
+    assert len(scheduler.get_history()) == 1
+
+def test_scheduler_does_not_throttle_short_tasks():
+    """Concurrency is re-evaluated from a cached sample, not a fresh CPU reading per task"""
+    scheduler = ResourceScheduler()
+    scheduler.sample()
+    with ThreadPool(4) as pool:
+        started = time.monotonic()
+        assert len(list(scheduler.imap_unordered(pool, abs, range(200), 4))) == 200
+        elapsed = time.monotonic() - started
+    # A 0.1 s reading per completion would take 20 s
+    assert elapsed < 2
+
+def test_optimization_draws_combinations_lazily(optimizer, tmp_path):
+    """A sweep over a huge grid starts at once and holds only the tasks in flight"""
+    huge = {'short_window': range(5, 10 ** 6), 'long_window': range(20, 10 ** 6)}
+    for cache in (None, ResultCache(str(tmp_path / 'cache.db'))):
+        optimizer.result_cache = cache
+        started = time.monotonic()
+        sweep = optimizer.iter_optimization(huge, engine='vectorized', max_workers=1)
+        first = [next(sweep) for _ in range(3)]
+        sweep.close()
+        assert time.monotonic() - started < 10
+        assert [r['params'] for r in first] == [{'short_window': 5, 'long_window': w} for w in (20, 21, 22)]
+
+def test_stream_optimization_appends_results_in_batches(optimizer, tmp_path):
+    """Results reach the store while the sweep runs and only the best one is kept"""
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    # A bare space skips the short < long rule, so the two inverted combinations run and fail
+    param_ranges = ParameterSpace({'short_window': [5, 10, 15, 30], 'long_window': [20, 25]})
+    stored = []
+    summary = optimizer.stream_optimization(param_ranges, engine='vectorized', max_workers=1, metric='total_return',
+                                            repository=repository, batch_size=2,
+                                            callback=lambda result: stored.append(len(repository.recent(100))))
+    assert summary['evaluated'] == 8 and summary['failed'] == 2 and summary['saved'] == 6
+    assert stored[:3] == [0, 0, 2] and stored[-1] == 6
+    expected = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+    assert summary['best_params'] == optimizer.get_best_params(expected, metric='total_return')
+    assert len(repository.recent(100)) == 6
+    repository.close()
+
+@pytest.mark.parametrize('rules', [{'max_drawdown': 3}, {'equity_floor': 0.97}, {'no_trade_bars': 30}])
+def test_early_stopping_stops_both_engines_at_the_same_bar(ohlcv_data, rules):
+    """A tripped rule ends the run with partial metrics, at the same bar in every engine mode"""
+    params = {'short_window': 5, 'long_window': 20}
+    early_stopping = EarlyStopping(**rules)
+    vectorized = optimizer_module._evaluate(params, ohlcv_data, 'MovingAverageCrossover', 150.0, 0.001,
+                                            'vectorized', None, early_stopping)
+    assert vectorized['pruned'] and vectorized['pruned_rule'] == next(iter(rules))
+    assert vectorized['pruned_bar'] < len(ohlcv_data)
+    for options in ({}, {'runonce': False}, {'exactbars': 1}):
+        result = optimizer_module._evaluate(params, ohlcv_data, 'MovingAverageCrossover', 150.0, 0.001,
+                                            'backtrader', options, early_stopping)
+        assert (result['pruned_rule'], result['pruned_bar']) == (vectorized['pruned_rule'], vectorized['pruned_bar'])
+        assert result['final_value'] == pytest.approx(vectorized['final_value'])
+    full = optimizer_module._evaluate(params, ohlcv_data, 'MovingAverageCrossover', 150.0, 0.001, 'backtrader')
+    assert 'pruned' not in full
+
+def test_pruned_runs_are_counted_but_not_saved(optimizer, tmp_path):
+    """Pruned runs are reported, never saved or picked, and cached apart from full runs"""
+    optimizer.result_cache = ResultCache(str(tmp_path / 'cache.db'))
+    optimizer.early_stopping = EarlyStopping(max_drawdown=8)
+    param_ranges = {'short_window': [5, 10, 15], 'long_window': [20, 50, 100]}
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    summary = optimizer.stream_optimization(param_ranges, cash=150.0, engine='vectorized', max_workers=1,
+                                            metric='total_return', repository=repository)
+    assert 0 < summary['pruned'] < summary['evaluated'] == 9
+    assert summary['saved'] == summary['evaluated'] - summary['pruned'] == len(repository.recent(100))
+    assert 'pruned' not in summary['best_result']
+
+    optimizer.early_stopping = None
+    full = optimizer.run_optimization(param_ranges, cash=150.0, engine='vectorized', max_workers=1)
+    assert not any(r.get('pruned') for r in full)
+    repository.close()
+    with pytest.raises(OptimizationError):
+        EarlyStopping(max_drawdown=150)
+
+def test_failed_combination_is_reported(optimizer):
+    """A combination that raises is returned with its error instead of aborting the sweep"""
+    results = optimizer.run_optimization(ParameterSpace({'short_window': [5, 30], 'long_window': [20]}),
+                                         engine='vectorized', max_workers=1)
+    errors = [r for r in results if 'error' in r]
+    assert len(results) == 2
+    assert len(errors) == 1
+    assert errors[0]['params'] == {'short_window': 30, 'long_window': 20}
+
+@pytest.mark.parametrize('method', ['random', 'halving', 'hyperband', 'tpe'])
+def test_adaptive_search_respects_budget(optimizer, method):
+    """Every search method stays within its evaluation budget and finds a good point"""
+    param_ranges = {'short_window': [3, 5, 8, 10, 12, 15], 'long_window': [20, 25, 30, 40, 50, 60]}
+    grid = optimizer.run_optimization(param_ranges, engine='vectorized', max_workers=1)
+    ranked = sorted(r['total_return'] for r in grid)
+
+    search = optimizer.run_search(param_ranges, method=method, metric='total_return', max_evaluations=20,
+                                  engine='vectorized', max_workers=1, seed=42)
+
+    assert search['evaluations'] <= 20
+    assert len(search['results']) == search['evaluations']
+    assert search['best_result']['fidelity'] == 1.0
+    # Better than the median of the full grid with about half the runs
+    assert search['best_result']['total_return'] >= ranked[len(ranked) // 2]
+
+def test_successive_halving_screens_on_short_windows(optimizer):
+    """Halving evaluates most configurations on a fraction of the history"""
+    param_ranges = {'short_window': list(range(2, 12)), 'long_window': list(range(20, 60, 5))}
+    search = optimizer.run_search(param_ranges, method='halving', metric='total_return', max_evaluations=200,
+                                  engine='vectorized', max_workers=1, seed=1, n_configs=27, eta=3)
+    fidelities = [r['fidelity'] for r in search['results']]
+    assert fidelities.count(1.0) == 1
+    assert min(fidelities) == pytest.approx(1 / 27)
+
+def test_search_requires_a_budget(optimizer):
+    with pytest.raises(OptimizationError):
+        optimizer.run_search({'short_window': [5]}, method='random')
+    with pytest.raises(OptimizationError):
+        optimizer.run_search({'short_window': [5]}, method='grid', max_evaluations=5)
+
+def test_search_strategy_requires_search():
+    """A strategy without search cannot be constructed"""
+    class NoSearch(SearchStrategy):
+        name = 'none'
+
+    with pytest.raises(TypeError):
+        NoSearch()
+
+def test_search_space_sampling_is_distinct():
+    import random
+    space = SearchSpace({'a': [1, 2, 3], 'b': [4, 5]})
+    points = space.sample(random.Random(0), 10)
+    assert len(points) == 6
+    assert len({space.key(p) for p in points}) == 6
+    assert SearchBudget(max_evaluations=3).take(5) == 3
+
+def test_parameter_space_enumerates_and_samples_valid_points():
+    """Constraints prune the grid before any run; enumeration stays lazy on a huge space"""
+    import random
+    from itertools import product
+    space = ParameterSpace({
+        'fast': IntRange(2, 20, 2),
+        'slow': LogRange(5, 80, 5, integer=True),
+        'width': FloatRange(1, 2.5, 0.25),
+        'kind': Categorical(['sma', 'ema'])
+    }, constraints=['fast < slow', 'width <= 2'])
+    assert space.values['slow'] == [5, 10, 20, 40, 80]
+    assert space.values['width'] == [1.0, 1.25, 1.5, 1.75, 2.0]
+    brute = [dict(zip(space.names, values)) for values in product(*space.values.values())
+             if values[0] < values[1]]
+    assert space.grid() == brute
+    assert space.size == len(brute) < space.full_size
+    points = space.sample(random.Random(0), 50)
+    assert len({space.key(p) for p in points}) == 50
+    assert all(p['fast'] < p['slow'] for p in points)
+
+    huge = ParameterSpace({'short': range(10 ** 6), 'long': range(10 ** 6)}, ['short >= long'])
+    assert next(iter(huge)) == {'short': 0, 'long': 0}
+    with pytest.raises(OptimizationError):
+        ParameterSpace({'a': [1, 2]}, ['a < b'])
+
+def test_parameter_validator_spaces_skip_invalid_combinations(optimizer):
+    """Float steps work and a sweep over a strategy's space never runs an invalid combination"""
+    assert ParameterValidator.generate_grid_parameters('BollingerBands')['num_std'] == [2.0, 2.5, 3.0]
+    assert ParameterValidator.generate_grid_parameters('BollingerBandsStrategy')['num_std'] == [2.0, 2.5, 3.0]
+    with pytest.raises(ValueError):
+        ParameterValidator.validate_parameters('MACD', {'fast_period': 14, 'slow_period': 14})
+    with pytest.raises(ValueError):
+        ParameterValidator.validate_parameters('RSI', {'oversold': 50, 'overbought': 40})
+    assert ParameterValidator.parameter_space('RSI').size == 6 * 5 * 5
+
+    space = ParameterValidator.parameter_space('MovingAverageCrossover')
+    assert space.full_size == 121
+    assert space.size == sum(1 for s in range(5, 16) for l in range(10, 21) if s < l) == 100
+    # A plain dict picks up the strategy's default constraints
+    grid = ParameterValidator.generate_grid_parameters('MovingAverageCrossover')
+    assert len(list(optimizer.generate_combinations(grid))) == 100
+    assert optimizer.parameter_space({'short_window': [5, 30]}).constraints == []
+    space = ParameterValidator.parameter_space('MovingAverageCrossover',
+                                               {'short_window': {'min': 10, 'max': 30, 'step': 10},
+                                                'long_window': {'min': 20, 'max': 30, 'step': 10}})
+    results = optimizer.run_optimization(space, engine='vectorized', max_workers=1)
+    assert [r['params'] for r in results if 'error' in r] == []
+    assert sorted((r['params']['short_window'], r['params']['long_window']) for r in results) == [
+        (10, 20), (10, 30), (20, 30)]
+
+def test_generate_folds_rolling_and_anchored(ohlcv_data):
+    """Folds tile the history with adjacent, non-overlapping test windows"""
+    rolling = generate_folds(ohlcv_data.index, 200, 50)
+    assert [(f['train_start'], f['test_start'], f['test_stop']) for f in rolling] == [
+        (0, 200, 250), (50, 250, 300), (100, 300, 350), (150, 350, 400)
+    ]
+    anchored = generate_folds(ohlcv_data.index, 200, 50, anchored=True)
+    assert all(f['train_start'] == 0 for f in anchored)
+    by_time = generate_folds(ohlcv_data.index, '200D', '50D')
+    assert [f['test_start'] for f in by_time] == [f['test_start'] for f in rolling]
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_walk_forward_stitches_out_of_sample_equity(optimizer, monkeypatch, workers):
+    """Each fold's best in-sample params are traded on the next window only"""
+    monkeypatch.setattr(ResourceMonitor, 'get_worker_count', staticmethod(lambda max_workers=None: workers))
+    param_ranges = {'short_window': [5, 10], 'long_window': [20, 40]}
+    result = WalkForwardOptimizer(optimizer).run(
+        param_ranges, train_size=200, test_size=50, metric='total_return', engine='vectorized'
+    )
+
+    assert len(result['folds']) == 4
+    assert len(result['equity']) == 200
+    assert result['equity'].index[0] == optimizer.data.index[200]
+    fold_growth = np.prod([np.exp(f['out_of_sample']['total_return']) for f in result['folds']])
+    assert result['metrics']['final_value'] == pytest.approx(100000.0 * fold_growth)
+
+    first = result['folds'][0]
+    train = optimizer.data.loc[first['train_start']:first['train_end']]
+    in_sample = [
+        VectorizedBacktester(train).run('MovingAverageCrossover', params)['metrics']['total_return']
+        for params in optimizer.generate_combinations(param_ranges)
+    ]
+    assert first['in_sample']['total_return'] == pytest.approx(max(in_sample))
+    assert first['train_end'] < first['test_start']
+
+def test_walk_forward_backtrader_returns_with_tz_aware_data(optimizer, monkeypatch):
+    """Backtrader out-of-sample returns do not depend on the index time zone"""
+    monkeypatch.setattr(ResourceMonitor, 'get_worker_count', staticmethod(lambda max_workers=None: 1))
+    param_ranges = {'short_window': [5, 10], 'long_window': [20, 40]}
+    naive = WalkForwardOptimizer(optimizer).run(param_ranges, train_size=200, test_size=100, metric='total_return')
+    optimizer.data = optimizer.data.tz_localize('America/New_York')
+    aware = WalkForwardOptimizer(optimizer).run(param_ranges, train_size=200, test_size=100, metric='total_return')
+    assert naive['metrics']['total_return'] != 0.0
+    assert aware['metrics']['final_value'] == pytest.approx(naive['metrics']['final_value'])
+    np.testing.assert_allclose(aware['equity'].to_numpy(), naive['equity'].to_numpy())
+
+def test_walk_forward_overlapping_test_windows_count_bars_once(optimizer):
+    result = WalkForwardOptimizer(optimizer).run(
+        {'short_window': [5], 'long_window': [20]}, train_size=200, test_size=100, step=50,
+        engine='vectorized', max_workers=1
+    )
+    assert result['equity'].index.is_unique
+    assert len(result['equity']) == 200
+
+def test_walk_forward_annualizes_by_bar_spacing(optimizer):
+    """Out-of-sample metrics of intraday bars are annualized by their spacing, not as daily bars"""
+    optimizer.data.index = pd.date_range('2024-01-02 09:30', periods=len(optimizer.data), freq='5min')
+    result = WalkForwardOptimizer(optimizer).run(
+        {'short_window': [5], 'long_window': [20]}, train_size=200, test_size=100,
+        engine='vectorized', max_workers=1
+    )
+    bars_per_year = periods_per_year(optimizer.data.index)
+    assert bars_per_year == 252 * 78
+    equity = result['equity'].to_numpy()
+    assert result['metrics'] == pytest.approx(compute_metrics(equity, 100000.0, bars_per_year))
+    assert result['metrics']['sharpe_ratio'] != pytest.approx(compute_metrics(equity, 100000.0)['sharpe_ratio'])
+    fold_equity = equity[:100]
+    assert result['folds'][0]['out_of_sample'] == pytest.approx(compute_metrics(fold_equity, 100000.0, bars_per_year))
+
+@pytest.fixture
+def market_db(tmp_path, ohlcv_data):
+    """Local market database with bars for two tickers"""
+    path = str(tmp_path / 'market.db')
+    db = DatabaseManager(path)
+    for ticker, scale in (('AAA', 1.0), ('BBB', 2.0)):
+        db.add_ticker(ticker)
+        db.bulk_insert_historical_data([
+            HistoricalData(ticker_symbol=ticker, timestamp=timestamp.to_pydatetime(),
+                           open=row.open * scale, high=row.high * scale, low=row.low * scale,
+                           close=row.close * scale, volume=int(row.volume))
+            for timestamp, row in ohlcv_data.iterrows()
+        ])
+    db.dispose()
+    return path
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_backtest_over_universe(market_db, tmp_path, monkeypatch, workers):
+    """One row per ticker; missing tickers are reported, not fatal"""
+    monkeypatch.setattr(ResourceMonitor, 'get_worker_count', staticmethod(lambda max_workers=None: workers))
+    batch = BatchBacktester('MovingAverageCrossover', {'short_window': 5, 'long_window': 20},
+                            datetime(2019, 1, 1), datetime(2022, 1, 1), tickers=['BBB', 'AAA', 'ZZZ'],
+                            database_path=market_db)
+    streamed = []
+    summary = batch.run(callback=streamed.append)
+
+    assert summary['ticker'].tolist() == ['AAA', 'BBB', 'ZZZ']
+    assert len(streamed) == 3
+    assert summary.loc[0, 'bars'] == 400
+    assert summary.loc[0, 'trades'] > 0
+    assert summary.loc[:1, 'error'].isna().all()
+    assert 'No stored data' in summary.loc[2, 'error']
+
+    repository = ResultsRepository(str(tmp_path / 'results.db'))
+    assert batch.save_results(repository) == 2
+    assert batch.save_results(repository) == 0
+    saved = repository.top('final_value', ticker='AAA')
+    assert len(saved) == 1
+    assert saved.loc[0, 'final_value'] == pytest.approx(summary.loc[0, 'final_value'])
+    assert saved.loc[0, 'strategy_params'] == {'short_window': 5, 'long_window': 20}
+    repository.close()
+
+def test_batch_sharpe_is_annualized_by_bar_frequency(market_db, tmp_path):
+    """Intraday bars are annualized with their own bars per year, not 252"""
+    assert periods_per_year(pd.date_range('2020-01-01', periods=10, freq='D')) == 252
+    assert periods_per_year(generate_ohlcv(500, '5Min').index) == pytest.approx(252 * 78)
+    assert periods_per_year(pd.date_range('2020-01-03', periods=10, freq='W-FRI')) == pytest.approx(365.25 / 7)
+
+    data = generate_ohlcv(2000, '5Min', seed=1)
+    path = str(tmp_path / 'intraday.db')
+    db = DatabaseManager(path)
+    db.add_ticker('AAA')
+    db.bulk_insert_historical_data([
+        HistoricalData(ticker_symbol='AAA', timestamp=timestamp.to_pydatetime(), open=row.open, high=row.high,
+                       low=row.low, close=row.close, volume=int(row.volume))
+        for timestamp, row in data.iterrows()
+    ])
+    db.dispose()
+    summary = BatchBacktester('MovingAverageCrossover', {}, datetime(2019, 1, 1), datetime(2022, 1, 1),
+                              tickers=['AAA'], database_path=path).run(max_workers=1)
+    expected = VectorizedBacktester(data, periods_per_year=252 * 78).run('MovingAverageCrossover')['metrics']
+    assert summary.loc[0, 'sharpe_ratio'] == pytest.approx(expected['sharpe_ratio'])
+
+def test_vectorized_engine_infers_periods_per_year():
+    """Without periods_per_year the engine, and sweeps through it, annualize by the bar spacing"""
+    data = generate_ohlcv(500, '5Min', seed=1)
+    assert VectorizedBacktester(data).periods_per_year == 252 * 78
+    assert VectorizedBacktester(data.reset_index(drop=True)).periods_per_year == 252
+    expected = VectorizedBacktester(data, periods_per_year=252 * 78).run('MovingAverageCrossover')['metrics']
+    result = optimizer_module._evaluate({}, data, 'MovingAverageCrossover', BacktestConfig.INITIAL_CASH,
+                                        BacktestConfig.DEFAULT_COMMISSION, 'vectorized')
+    assert result['sharpe_ratio'] == pytest.approx(expected['sharpe_ratio'])
+    assert result['sharpe_ratio'] != pytest.approx(
+        VectorizedBacktester(data, periods_per_year=252).run('MovingAverageCrossover')['metrics']['sharpe_ratio'])
+
+def test_portfolio_backtest_shares_one_cash_pool(ohlcv_data):
+    """Sleeves fill where the vectorized engine does and strategy equity adds up to the portfolio"""
+    second = generate_ohlcv(400, seed=2).iloc[5:]
+    strategies = {
+        'ma': {'strategy_name': 'MovingAverageCrossover', 'params': {'short_window': 5, 'long_window': 20},
+               'tickers': ['AAA', 'BBB']},
+        'rsi': {'strategy_name': 'RSI', 'tickers': ['BBB']}
+    }
+    backtester = PortfolioBacktester(strategies, data={'AAA': ohlcv_data, 'BBB': second}, cash=100000.0,
+                                     allocations={'ma': 20000.0, 'rsi': 10000.0})
+    results = backtester.run()
+    assert results['allocations'] == {'ma': 20000.0, 'rsi': 10000.0}
+    assert len(results['equity']) == len(ohlcv_data.index.union(second.index))
+    trades = results['trades']
+    rsi = trades[trades['strategy_id'] == 'rsi']
+    assert list(rsi['datetime']) == list(VectorizedBacktester(second).run('RSI')['trades']['datetime'])
+    unallocated = 100000.0 - 30000.0
+    assert np.allclose(results['strategy_equity'].sum(axis=1) + unallocated, results['equity'])
+    # The manager's allocation moves with every trade: it ends as the strategy's cash
+    flows = -(rsi['size'] * rsi['price'] + rsi['commission']).sum()
+    assert backtester.manager.get_strategy_allocation('rsi') == pytest.approx(10000.0 + flows)
+    assert results['metrics']['strategies']['rsi']['trades'] == len(rsi)
+
+    # Too little cash for the default allocations: they are scaled down and cash never goes negative
+    scarce = PortfolioBacktester(strategies, data={'AAA': ohlcv_data, 'BBB': second}, cash=2000.0).run()
+    assert scarce['allocations']['ma'] == scarce['allocations']['rsi'] <= 1000.0
+    flows = scarce['trades'].sort_values('datetime', kind='stable')
+    assert (2000.0 - (flows['size'] * flows['price'] + flows['commission']).cumsum()).min() >= 0
+    assert scarce['metrics']['portfolio']['trades'] == len(scarce['trades']) > 0
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
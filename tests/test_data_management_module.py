@@ -13,6 +13,14 @@ from components.data_management_module.data_access_layer import db_manager, Tick
 from components.data_management_module.config import config
 from components.data_management_module.alpaca_api import AlpacaAPIClient
 from components.data_management_module.real_time_data import RealTimeDataStreamer
+from components.data_management_module.adjustments import apply_adjustments
+from components.data_management_module.data_access_layer import DatabaseManager, storage_pragmas
+from components.data_management_module.maintenance import MaintenanceScheduler
+from components.data_management_module.snapshot import export_snapshot, import_snapshot, SnapshotError
+import shutil
+import sqlite3
+import tempfile
+import threading
 from sqlalchemy import inspect
 
 class TestDataManagementModule(unittest.TestCase):
@@ -279,5 +287,274 @@ class TestDataManagementModule(unittest.TestCase):
         execution_time = end_time - start_time
         self.assertLess(execution_time, 30)  # Should complete within 30 seconds
 
+class TestCorporateActionAdjustments(unittest.TestCase):
+    """Read-time split/dividend adjustment of raw bars"""
+
+    def setUp(self):
+        dates = pd.date_range('2024-01-02 09:30', periods=6, freq='D', tz='America/New_York')
+        self.raw = pd.DataFrame({
+            'open': [400.0, 404.0, 408.0, 102.0, 103.0, 104.0],
+            'high': [401.0, 405.0, 409.0, 103.0, 104.0, 105.0],
+            'low': [399.0, 403.0, 407.0, 101.0, 102.0, 103.0],
+            'close': [400.0, 404.0, 408.0, 102.0, 103.0, 104.0],
+            'volume': [100, 100, 100, 400, 400, 400]
+        }, index=dates)
+        self.split = (datetime(2024, 1, 5), 'split', 4.0)
+
+    def test_raw_view_is_unchanged(self):
+        result = apply_adjustments(self.raw, [self.split], mode='raw')
+        pd.testing.assert_frame_equal(result, self.raw)
+
+    def test_split_adjusts_bars_before_ex_date_only(self):
+        result = apply_adjustments(self.raw, [self.split], mode='split')
+        np.testing.assert_allclose(result['close'], [100.0, 101.0, 102.0, 102.0, 103.0, 104.0])
+        np.testing.assert_allclose(result['volume'], [400, 400, 400, 400, 400, 400])
+        # Stored data is never modified
+        self.assertEqual(self.raw['close'].iloc[0], 400.0)
+
+    def test_dividend_uses_previous_close(self):
+        dividend = (datetime(2024, 1, 6), 'dividend', 1.02)
+        result = apply_adjustments(self.raw, [self.split, dividend], mode='all')
+        factor = 1 - 1.02 / 102.0
+        np.testing.assert_allclose(result['close'].iloc[:3], np.array([100.0, 101.0, 102.0]) * factor)
+        np.testing.assert_allclose(result['close'].iloc[3], 102.0 * factor)
+        np.testing.assert_allclose(result['close'].iloc[4:], [103.0, 104.0])
+
+        splits_only = apply_adjustments(self.raw, [self.split, dividend], mode='split')
+        np.testing.assert_allclose(splits_only['close'].iloc[3], 102.0)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            apply_adjustments(self.raw, [self.split], mode='adjusted')
+
+
+class TestSnapshots(unittest.TestCase):
+    """Arrow IPC snapshot export/import round trip"""
+
+    def setUp(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, 'source.db')
+        self.target = os.path.join(self.temp_dir, 'target.db')
+        self.snapshot_dir = os.path.join(self.temp_dir, 'snapshot')
+
+        conn = sqlite3.connect(self.source)
+        conn.execute("CREATE TABLE tickers (symbol VARCHAR PRIMARY KEY, last_updated DATETIME, added_date DATETIME)")
+        conn.execute(
+            "CREATE TABLE historical_data (id INTEGER PRIMARY KEY, ticker_symbol VARCHAR, timestamp DATETIME NOT NULL, "
+            "open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume INTEGER, UNIQUE (ticker_symbol, timestamp))"
+        )
+        conn.executemany("INSERT INTO tickers (symbol) VALUES (?)", [('AAPL',), ('MSFT',)])
+        rows = [
+            (ticker, f"2024-01-02 09:{30 + i:02d}:00.000000", 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 1000 + i)
+            for ticker in ('AAPL', 'MSFT') for i in range(20)
+        ]
+        conn.executemany(
+            "INSERT INTO historical_data (ticker_symbol, timestamp, open, high, low, close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _dump(self, path):
+        conn = sqlite3.connect(path)
+        rows = conn.execute(
+            "SELECT ticker_symbol, timestamp, open, high, low, close, volume FROM historical_data "
+            "ORDER BY ticker_symbol, timestamp"
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def test_round_trip(self):
+        manifest = export_snapshot(self.source, self.snapshot_dir)
+        self.assertEqual(manifest['tickers']['AAPL']['rows'], 20)
+        self.assertIn('tickers', manifest['tables'])
+
+        counts = import_snapshot(self.snapshot_dir, self.target)
+        self.assertEqual(counts, {'AAPL': 20, 'MSFT': 20})
+        self.assertEqual(self._dump(self.target), self._dump(self.source))
+
+        # Importing again merges instead of duplicating
+        import_snapshot(self.snapshot_dir, self.target)
+        self.assertEqual(len(self._dump(self.target)), 40)
+
+    def test_checksum_mismatch(self):
+        manifest = export_snapshot(self.source, self.snapshot_dir, tickers=['AAPL'])
+        with open(os.path.join(self.snapshot_dir, manifest['tickers']['AAPL']['file']), 'ab') as f:
+            f.write(b'corrupt')
+        with self.assertRaises(SnapshotError):
+            import_snapshot(self.snapshot_dir, self.target)
+
+
+class TestDatabaseMaintenance(unittest.TestCase):
+    """WAL checkpoints and bounded incremental vacuum"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = config.config['DEFAULT']['database_path']
+        config.config['DEFAULT']['database_path'] = os.path.join(self.temp_dir, 'maintenance.db')
+        self.db = DatabaseManager()
+
+    def tearDown(self):
+        self.db.dispose()
+        config.config['DEFAULT']['database_path'] = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fill_and_delete(self, rows=5000):
+        start = datetime(2024, 1, 2, 9, 30)
+        records = [
+            HistoricalData(ticker_symbol='AAPL', timestamp=start + timedelta(minutes=i),
+                           open=100.0, high=101.0, low=99.0, close=100.5, volume=1000)
+            for i in range(rows)
+        ]
+        self.db.bulk_insert_historical_data(records)
+        with self.db.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM historical_data")
+
+    def test_new_database_uses_incremental_vacuum(self):
+        self.assertEqual(self.db.auto_vacuum_mode(), 2)
+
+    def test_incremental_vacuum_is_bounded(self):
+        self._fill_and_delete()
+        self.db.wal_checkpoint('TRUNCATE')
+        first = self.db.incremental_vacuum(5)
+        self.assertEqual(first, 5)
+        self.assertGreater(self.db.incremental_vacuum(100000), 0)
+        self.assertEqual(self.db.incremental_vacuum(100000), 0)
+
+    def _legacy_database(self):
+        """A manager on a database created without incremental auto-vacuum"""
+        self.db.dispose()
+        path = os.path.join(self.temp_dir, 'legacy.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE legacy (id INTEGER)')
+        conn.close()
+        config.config['DEFAULT']['database_path'] = path
+        self.db = DatabaseManager()
+        self.assertEqual(self.db.auto_vacuum_mode(), 0)
+
+    def test_scheduler_leaves_legacy_database_unconverted_by_default(self):
+        self._legacy_database()
+        self._fill_and_delete()
+        self.db.wal_checkpoint('TRUNCATE')
+        free = self.db.freelist_count()
+        scheduler = MaintenanceScheduler(self.db)
+        scheduler._run_vacuum()
+        scheduler._run_vacuum()
+
+        self.assertEqual(self.db.auto_vacuum_mode(), 0)
+        self.assertEqual(self.db.freelist_count(), free)
+        self.assertEqual(scheduler.get_metrics()['last_run']['vacuum']['mode'], 'unavailable')
+
+    def test_scheduler_converts_legacy_database_when_enabled(self):
+        self._legacy_database()
+        self._fill_and_delete()
+        self.db.wal_checkpoint('TRUNCATE')
+        self.assertGreater(self.db.freelist_count(), 0)
+        scheduler = MaintenanceScheduler(self.db, settings={'convert_incremental_vacuum': 'true'})
+        scheduler._run_vacuum()
+
+        self.assertEqual(self.db.auto_vacuum_mode(), 2)
+        self.assertEqual(self.db.freelist_count(), 0)
+        last = scheduler.get_metrics()['last_run']['vacuum']
+        self.assertEqual(last['mode'], 'convert')
+        self.assertGreater(last['pages'], 0)
+
+    def test_cleanup_does_not_convert_legacy_database(self):
+        self._legacy_database()
+        start = datetime(2020, 1, 2, 9, 30)
+        self.db.bulk_insert_historical_data([
+            HistoricalData(ticker_symbol='AAPL', timestamp=start + timedelta(minutes=i),
+                           open=100.0, high=101.0, low=99.0, close=100.5, volume=1000)
+            for i in range(5000)
+        ])
+        self.db.cleanup_old_data(days_to_keep=30)
+        self.assertEqual(self.db.auto_vacuum_mode(), 0)
+        self.assertTrue(self.db.enable_incremental_vacuum())
+        self.assertEqual(self.db.auto_vacuum_mode(), 2)
+        self.assertEqual(self.db.freelist_count(), 0)
+
+    def test_scheduler_records_metrics(self):
+        self._fill_and_delete(500)
+        scheduler = MaintenanceScheduler(self.db, settings={'checkpoint_truncate_wal_mb': 0})
+        scheduler.run_pending(force=True)
+
+        metrics = scheduler.get_metrics()
+        self.assertEqual(metrics['totals']['checkpoints'], 1)
+        self.assertEqual(metrics['totals']['truncates'], 1)
+        self.assertEqual(metrics['totals']['errors'], 0)
+        self.assertEqual(metrics['last_run']['checkpoint']['mode'], 'TRUNCATE')
+        self.assertIsNotNone(metrics['max_checkpoint_latency'])
+        self.assertEqual(set(metrics['last_run']), {'checkpoint', 'optimize', 'analyze', 'vacuum'})
+
+
+class TestStorageProfile(unittest.TestCase):
+    """Connection PRAGMAs, read-only engine and per-thread sessions"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = config.config['DEFAULT']['database_path']
+        config.config['DEFAULT']['database_path'] = os.path.join(self.temp_dir, 'storage.db')
+        self.db = DatabaseManager()
+
+    def tearDown(self):
+        self.db.dispose()
+        config.config['DEFAULT']['database_path'] = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pragmas_applied_to_pooled_connections(self):
+        for engine in (self.db.engine, self.db.read_engine):
+            with engine.connect() as conn:
+                self.assertEqual(conn.exec_driver_sql('PRAGMA synchronous').scalar(), 1)  # NORMAL
+                self.assertEqual(conn.exec_driver_sql('PRAGMA temp_store').scalar(), 2)   # MEMORY
+                self.assertEqual(conn.exec_driver_sql('PRAGMA cache_size').scalar(), -65536)
+                self.assertEqual(conn.exec_driver_sql('PRAGMA busy_timeout').scalar(), 15000)
+                self.assertEqual(conn.exec_driver_sql('PRAGMA journal_mode').scalar(), 'wal')
+
+    def test_profile_overrides(self):
+        self.assertEqual(storage_pragmas('durable')['synchronous'], 'FULL')
+        config.config['storage']['synchronous'] = 'EXTRA'
+        try:
+            self.assertEqual(storage_pragmas('balanced')['synchronous'], 'EXTRA')
+        finally:
+            config.config.remove_option('storage', 'synchronous')
+        with self.assertRaises(ValueError):
+            storage_pragmas('turbo')
+
+    def test_read_engine_is_read_only(self):
+        self.db.add_ticker('AAPL')
+        with self.db.read_engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql('SELECT COUNT(*) FROM tickers').scalar(), 1)
+            with self.assertRaises(Exception):
+                conn.exec_driver_sql("INSERT INTO tickers (symbol) VALUES ('MSFT')")
+
+    def test_read_only_manager_opens_no_write_engine(self):
+        self.db.add_ticker('AAPL')
+        reader = DatabaseManager(read_only=True)
+        try:
+            self.assertIsNone(reader.engine)
+            self.assertEqual(reader.database_path, self.db.database_path)
+            self.assertEqual(reader.get_historical_frame('AAPL', datetime(2020, 1, 1), datetime(2021, 1, 1)).shape[0], 0)
+            with self.assertRaises(Exception):
+                reader.add_ticker('MSFT')
+        finally:
+            reader.dispose()
+
+    def test_sessions_are_thread_scoped(self):
+        main_session = self.db.Session()
+        self.assertIs(self.db.Session(), main_session)
+        other = []
+        worker = threading.Thread(target=lambda: other.append(self.db.Session()))
+        worker.start()
+        worker.join()
+        self.assertIsNot(other[0], main_session)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,6 +14,7 @@ from components.logging_monitoring_module.monitor import HealthMonitor
 from components.logging_monitoring_module.alerts import send_alert
 from components.logging_monitoring_module.config import MonitoringConfig, LoggingConfig
 from components.logging_monitoring_module.logging_config import setup_logging
+from components.logging_monitoring_module import async_logging
 
 class TestLoggingAndMonitoringModule(unittest.TestCase):
     def setUp(self):
@@ -159,5 +160,70 @@ class TestLoggingAndMonitoringModule(unittest.TestCase):
         except (PermissionError, OSError) as e:
             print(f"Cleanup failed: {e}")
 
+class TestAsyncLogging(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.log_file = os.path.join(self.test_dir, 'async_test.log')
+
+    def tearDown(self):
+        async_logging.stop_listener()
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+
+    def _read_log(self):
+        async_logging.flush()
+        with open(self.log_file, 'r') as f:
+            return f.read()
+
+    def test_repeated_setup_does_not_duplicate_handlers(self):
+        """Constructing a component twice must not write every record twice"""
+        for _ in range(3):
+            logger = async_logging.get_module_logger('async_test', self.log_file, console=False)
+        queue_handlers = [h for h in logger.handlers if isinstance(h, async_logging.DeferredQueueHandler)]
+        self.assertEqual(len(queue_handlers), 1)
+        self.assertFalse(logger.propagate)
+
+        logger.info("written %s", "once")
+        self.assertEqual(self._read_log().count("written once"), 1)
+
+    def test_lazy_formatting_happens_on_listener(self):
+        """Arguments are formatted by the listener, once, and never for filtered records"""
+        logger = async_logging.get_module_logger('async_test', self.log_file, console=False)
+        argument = MagicMock()
+        argument.__str__.return_value = 'argument'
+        logger.debug("hidden %s", argument)
+        argument.__str__.assert_not_called()
+
+        # Holding the file sink's lock keeps the listener from writing the record
+        sink = next(iter(async_logging._sinks.values()))
+        sink.acquire()
+        try:
+            logger.info("shown %s", argument)
+            argument.__str__.assert_not_called()
+        finally:
+            sink.release()
+        self.assertIn("shown argument", self._read_log())
+        argument.__str__.assert_called_once()
+
+    def test_sampled_and_rate_limited_channels(self):
+        async_logging.get_module_logger('async_test', self.log_file, console=False)
+        sampled = async_logging.get_debug_channel('async_test.sampled', sample_every=10, level=logging.DEBUG)
+        limited = async_logging.get_debug_channel('async_test.limited', max_per_second=1 / 60, level=logging.DEBUG)
+        for i in range(30):
+            sampled.debug("sampled %d", i)
+            limited.debug("limited %d", i)
+
+        contents = self._read_log()
+        self.assertEqual(contents.count("DEBUG - sampled"), 3)
+        self.assertEqual(contents.count("DEBUG - limited"), 1)
+
+    def test_debug_channel_disabled_by_default(self):
+        with patch.object(async_logging.LoggingConfig, 'DEBUG_CHANNELS', False):
+            channel = async_logging.get_debug_channel('async_test.quiet')
+        self.assertFalse(channel.isEnabledFor(logging.DEBUG))
+        self.assertTrue(channel.isEnabledFor(logging.WARNING))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -15,9 +15,15 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from components.strategy_management_module.strategy_manager import StrategyManager
+from components.strategy_management_module.strategies.strategy_base import StrategyBase
 from components.strategy_management_module.strategies.moving_average_crossover import MovingAverageCrossoverStrategy
 from components.strategy_management_module.strategies.rsi_strategy import RSIStrategy
 from components.strategy_management_module.strategies.macd_strategy import MACDStrategy
+from components.strategy_management_module.strategies.bollinger_bands_strategy import BollingerBandsStrategy
+from components.strategy_management_module.strategies.momentum_stratey import MomentumStrategy
+from components.strategy_management_module.indicator_cache import IndicatorCache, fingerprint, indicator_cache
+from components.strategy_management_module import indicators
+import numpy as np
 
 class TestStrategyManagementModule(unittest.TestCase):
     def setUp(self):
@@ -92,6 +98,97 @@ class TestStrategyManagementModule(unittest.TestCase):
                 self.assertTrue('signal' in signals.columns)
                 self.assertTrue('positions' in signals.columns)
 
+    def test_indicator_cache_reuse_and_eviction(self):
+        """Test that cached arrays are reused and evicted by size."""
+        cache = IndicatorCache(max_bytes=2 * 800)
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            return [float(value)] * 100
+
+        cache.get_or_compute(('a',), lambda: compute(1))
+        cache.get_or_compute(('b',), lambda: compute(2))
+        self.assertEqual(cache.get_or_compute(('a',), lambda: compute(3))[0], 1.0)
+        cache.get_or_compute(('c',), lambda: compute(4))  # evicts 'b', the least recently used
+
+        self.assertEqual(calls, [1, 2, 4])
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['bytes'], 2 * 800)
+        cache.get_or_compute(('b',), lambda: compute(5))
+        self.assertEqual(calls, [1, 2, 4, 5])
+        with self.assertRaises(ValueError):
+            cache.get_or_compute(('a',), lambda: compute(6))[0] = 0.0
+
+    def test_strategies_share_cached_indicators(self):
+        """Test that strategy instances over the same data reuse indicators."""
+        self.assertEqual(fingerprint(self.test_data['close']),
+                         fingerprint(self.test_data.copy()['close']))
+        indicator_cache.clear()
+        first = MovingAverageCrossoverStrategy({'short_window': 5, 'long_window': 10})
+        second = MovingAverageCrossoverStrategy({'short_window': 5, 'long_window': 20})
+        first.generate_signals(self.test_data)
+        signals = second.generate_signals(self.test_data)
+
+        self.assertEqual(indicator_cache.stats()['hits'], 1)
+        expected = self.test_data['close'].rolling(window=20, min_periods=1).mean()
+        self.assertTrue((signals['long_mavg'] == expected).all())
+
+    def test_streaming_indicators_match_pandas(self):
+        """Test that streaming indicators reproduce the pandas batch values."""
+        close = pd.Series(100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.02, 500))))
+        delta = close.diff()
+        avg_gain = delta.where(delta > 0, 0).fillna(0).rolling(14, min_periods=1).mean()
+        avg_loss = (-delta.where(delta < 0, 0)).fillna(0).rolling(14, min_periods=1).mean()
+        expected = {
+            'mean': (indicators.RollingMean(20), close.rolling(20).mean()),
+            'std': (indicators.RollingStd(20), close.rolling(20).std()),
+            'ema': (indicators.EMA(12), close.ewm(span=12, adjust=False).mean()),
+            'momentum': (indicators.Momentum(10), close.pct_change(periods=10)),
+            'rsi': (indicators.RSI(14), 100 - (100 / (1 + avg_gain / avg_loss)))
+        }
+        for name, (indicator, batch) in expected.items():
+            with self.subTest(indicator=name):
+                streamed = [indicator.update(value) for value in close]
+                np.testing.assert_array_equal(streamed, batch.to_numpy())
+
+    def test_on_bar_matches_generate_signals(self):
+        """Test that the incremental path gives the batch signals."""
+        close = 100 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.02, 300)))
+        data = pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1000},
+                            index=pd.date_range('2023-01-02', periods=300, freq='5min'))
+        strategies = [
+            MovingAverageCrossoverStrategy({'short_window': 5, 'long_window': 20}),
+            RSIStrategy({'period': 14, 'overbought': 55, 'oversold': 45}),
+            MACDStrategy(),
+            BollingerBandsStrategy(),
+            MomentumStrategy()
+        ]
+        for strategy in strategies:
+            with self.subTest(strategy=type(strategy).__name__):
+                expected = strategy.generate_signals(data)['signal'].to_numpy()
+                self.assertEqual(strategy.warm_up(data.iloc[:100]), expected[99])
+                streamed = [strategy.on_bar(bar) for _, bar in data.iloc[100:].iterrows()]
+                np.testing.assert_array_equal(streamed, expected[100:])
+                self.assertTrue(np.abs(expected).sum() > 0)
+
+    def test_incremental_methods_are_required(self):
+        """Test that subclasses without on_bar/update cannot be constructed."""
+        class BatchOnly(StrategyBase):
+            def generate_signals(self, data):
+                return data
+
+            def validate_params(self):
+                pass
+
+        class NoUpdate(indicators.StreamingIndicator):
+            pass
+
+        with self.assertRaises(TypeError):
+            BatchOnly({})
+        with self.assertRaises(TypeError):
+            NoUpdate()
+
     def test_strategy_persistence(self):
         """Test saving and loading of strategy configurations."""
         # Add a strategy
@@ -0,0 +1,62 @@
+# throughput_command.py
+import argparse
+import logging
+import os
+import sys
+
+from components.backtesting_module.config import BacktestConfig
+from components.backtesting_module.exceptions import BacktestError
+from components.backtesting_module.synthetic_data import TIMEFRAMES
+from components.backtesting_module.throughput import ENGINES, compare, load_results, run_suite, save_results
+
+
+def main():
+    """Measure strategy throughput on synthetic data and check it against a baseline"""
+    parser = argparse.ArgumentParser(description="Strategy throughput benchmarks")
+    parser.add_argument('--timeframes', nargs='+', choices=list(TIMEFRAMES), default=list(TIMEFRAMES))
+    parser.add_argument('--bars', type=int, default=BacktestConfig.THROUGHPUT_BARS, help="Bars per timeframe")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--strategies', nargs='*', help="Strategies to measure (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=BacktestConfig.THROUGHPUT_RESULTS_PATH)
+    parser.add_argument('--baseline', default=BacktestConfig.THROUGHPUT_BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=BacktestConfig.THROUGHPUT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        results = run_suite(args.timeframes, args.bars, args.engines, args.strategies, args.repeat, args.seed)
+    except BacktestError as e:
+        print(f"Throughput benchmark failed: {e}")
+        return 1
+    save_results(results, args.output)
+
+    print(f"{'engine':<12}{'strategy':<24}{'timeframe':<10}{'bars/s':>14}{'peak MB':>10}")
+    for entry in results:
+        print(f"{entry['engine']:<12}{entry['strategy']:<24}{entry['timeframe']:<10}"
+              f"{entry['bars_per_sec']:>14,.0f}{entry['peak_memory_mb']:>10.1f}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['engine']} {regression['strategy']} {regression['timeframe']} "
+              f"{regression['metric']}: {regression['baseline']:.1f} -> {regression['current']:.1f} "
+              f"({regression['change']:+.0%})")
+    if regressions:
+        return 1
+    print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())